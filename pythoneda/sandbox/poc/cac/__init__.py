@@ -21,21 +21,80 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 __path__ = __import__("pkgutil").extend_path(__path__, __name__)
 
-from .dependency_import import DependencyImport
-from .python_import import PythonImport
-from .python_import_find import PythonImportFind
-from .method_parameter import MethodParameter
-from .method_def import MethodDef
-from .method_binding_criteria import MethodBindingCriteria
-from .python_method_def import PythonMethodDef
-from .default_method_binding_criteria import DefaultMethodBindingCriteria
-from .empty_body_python_method_binding_criteria import (
-    EmptyBodyPythonMethodBindingCriteria,
-)
-from .empty_body_python_method import EmptyBodyPythonMethod
-from .pythoneda_sandbox_poc_cac_sample_py import PythonedaSandboxPocCacSamplePy
-from .sample import Sample
-from .class_artifact import ClassArtifact
+import importlib
+from typing import Any, Dict, List
+
+# Exported names, and the modules declaring them. Modules get imported on first
+# access (PEP 562), so importing the package doesn't load stringtemplate3,
+# pythoneda.shared.git or any other dependency not needed yet.
+_exports: Dict[str, str] = {
+    "Instrumentation": ".instrumentation",
+    "DependencyImport": ".dependency_import",
+    "PythonImport": ".python_import",
+    "PythonImportPool": ".python_import_pool",
+    "ImportSet": ".import_set",
+    "AstIndexEntry": ".ast_index_entry",
+    "ModuleAstIndex": ".module_ast_index",
+    "PythonImportFind": ".python_import_find",
+    "PackageClassIndex": ".package_class_index",
+    "PersistentAstIndexCache": ".persistent_ast_index_cache",
+    "SourceCache": ".source_cache",
+    "TemplateGroupCache": ".template_group_cache",
+    "TemplateWriter": ".template_writer",
+    "CompiledTemplateGroup": ".compiled_template_group",
+    "TemplateCompiler": ".template_compiler",
+    "TemplateRegistry": ".template_registry",
+    "MethodParameter": ".method_parameter",
+    "MethodDef": ".method_def",
+    "MethodBindingCriteria": ".method_binding_criteria",
+    "PythonMethodDef": ".python_method_def",
+    "MethodImplementationRegistry": ".method_implementation_registry",
+    "DefaultMethodBindingCriteria": ".default_method_binding_criteria",
+    "EmptyBodyPythonMethodBindingCriteria": (
+        ".empty_body_python_method_binding_criteria"
+    ),
+    "EmptyBodyPythonMethod": ".empty_body_python_method",
+    "PythonedaSandboxPocCacSamplePy": ".pythoneda_sandbox_poc_cac_sample_py",
+    "Sample": ".sample",
+    "ClassArtifact": ".class_artifact",
+    "ClassArtifactDescription": ".class_artifact_description",
+    "ParallelArtifactExtraction": ".parallel_artifact_extraction",
+    "ArtifactAstBuilder": ".artifact_ast_builder",
+    "GeneratedArtifactFinder": ".generated_artifact_finder",
+    "ArtifactEmitter": ".artifact_emitter",
+    "ArtifactPipeline": ".artifact_pipeline",
+    "SyntheticDomainGenerator": ".synthetic_domain_generator",
+    "ArtifactBenchmark": ".artifact_benchmark",
+    "ImportTimeBenchmark": ".import_time_benchmark",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Imports the module declaring given name, on first access.
+    :param name: The name.
+    :type name: str
+    :return: The exported value.
+    :rtype: Any
+    """
+    module_name = _exports.get(name, None)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    result = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = result
+
+    return result
+
+
+def __dir__() -> List[str]:
+    """
+    Lists the attributes of the package, including the not-yet-imported ones.
+    :return: Such names.
+    :rtype: List[str]
+    """
+    return sorted(set(globals()) | set(__all__))
 
 
 # vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
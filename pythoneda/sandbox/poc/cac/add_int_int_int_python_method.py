@@ -20,9 +20,11 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 from .add_int_int_int_python_method_def import AddIntIntIntPythonMethodDef
+from .dependency_import import DependencyImport
 from .method_def import MethodDef
 from .python_method import PythonMethod
 from pythoneda.shared import primary_key_attribute
+from typing import List
 
 
 class AddIntIntIntPythonMethod(PythonMethod):
@@ -54,6 +56,15 @@ class AddIntIntIntPythonMethod(PythonMethod):
         """
         return "return x + y"
 
+    @property
+    def imports(self) -> List[DependencyImport]:
+        """
+        Retrieves the dependencies of the method.
+        :return: The dependencies.
+        :rtype: List[pythoneda.sandbox.poc.cac.DependencyImport]
+        """
+        return []
+
 
 # vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
 # Local Variables:
@@ -0,0 +1,502 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/artifact_ast_builder.py
+
+This file declares the ArtifactAstBuilder class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import ast
+import importlib.util
+from .instrumentation import Instrumentation
+from .method_def import MethodDef
+from pythoneda.shared import BaseObject
+from .python_method import PythonMethod
+from .source_cache import SourceCache
+import sys
+import textwrap
+from types import CodeType
+from typing import Any, List
+
+
+class ArtifactAstBuilder(BaseObject):
+    """
+    Builds the module of a ClassArtifact as a syntax tree, instead of text.
+
+    Methods read from .py files reuse the nodes already parsed by the
+    SourceCache, so building a tree doesn't parse the module again. Only the
+    bodies of methods without a source file are parsed.
+
+    Class name: ArtifactAstBuilder
+
+    Responsibilities:
+        - Build the module docstring, the imports and the class declaration.
+        - Reuse the already-parsed declaration of each method.
+        - Turn the tree into source code, or compile it directly.
+
+    Collaborators:
+        - pythoneda.sandbox.poc.cac.ClassArtifact
+        - pythoneda.sandbox.poc.cac.OfficialPythonMethod
+        - pythoneda.sandbox.poc.cac.SourceCache
+    """
+
+    def __init__(
+        self, artifact, sourceCache: SourceCache = None, packageName: str = None
+    ):
+        """
+        Creates a new ArtifactAstBuilder instance.
+        :param artifact: The artifact.
+        :type artifact: pythoneda.sandbox.poc.cac.ClassArtifact
+        :param sourceCache: The cache to find the source of method definitions in.
+        :type sourceCache: pythoneda.sandbox.poc.cac.SourceCache
+        :param packageName: The package the module is imported from, if known. If
+        it's not the package of the class, relative imports are made absolute.
+        :type packageName: str
+        """
+        super().__init__()
+        self._artifact = artifact
+        self._source_cache = sourceCache if sourceCache is not None else SourceCache()
+        self._package_name = packageName
+
+    @property
+    def artifact(self):
+        """
+        Retrieves the artifact.
+        :return: Such artifact.
+        :rtype: pythoneda.sandbox.poc.cac.ClassArtifact
+        """
+        return self._artifact
+
+    @property
+    def package_name(self) -> str:
+        """
+        Retrieves the package the module is imported from.
+        :return: Such package, or None if unknown.
+        :rtype: str
+        """
+        return self._package_name
+
+    @property
+    def relative_imports_base(self) -> str:
+        """
+        Retrieves the package relative imports have to be resolved against, when
+        the module is imported from a package other than the one of the class.
+        :return: The package of the class, or None if relative imports are kept.
+        :rtype: str
+        """
+        if self.package_name is None or self.artifact.module_name is None:
+            return None
+        module = sys.modules.get(self.artifact.module_name, None)
+        result = getattr(module, "__package__", None)
+        if result is None:
+            result = self.artifact.module_name.rpartition(".")[0]
+        if result == self.package_name:
+            return None
+
+        return result
+
+    def module(self) -> ast.Module:
+        """
+        Builds the module declaring the class. Method nodes are shared with the
+        trees they come from, so the result must not be modified in place.
+        :return: The module, with locations filled in.
+        :rtype: ast.Module
+        """
+        with Instrumentation.timed("ast.build"):
+            artifact = self.artifact
+            body = [self.__class__._docstring_of(self.module_docstring)]
+            body.extend(
+                self.__class__.import_nodes_of(
+                    artifact.imports, self.relative_imports_base
+                )
+            )
+            body.append(self.class_node())
+
+            return ast.fix_missing_locations(ast.Module(body=body, type_ignores=[]))
+
+    def class_node(self) -> ast.ClassDef:
+        """
+        Builds the class declaration.
+        :return: Such declaration.
+        :rtype: ast.ClassDef
+        """
+        artifact = self.artifact
+        body = [self.__class__._docstring_of(self.class_docstring)]
+        methods = list(artifact.methods)
+        if artifact.constructor:
+            methods.insert(0, artifact.constructor)
+        base = self.relative_imports_base
+        for method in methods:
+            node = self.__class__.method_node_of(method, self._source_cache)
+            if base is not None:
+                node = self.__class__._with_absolute_imports(node, base)
+            body.append(node)
+
+        return ast.ClassDef(
+            name=artifact.name,
+            bases=[ast.Name(id=name, ctx=ast.Load()) for name in artifact.parent_names],
+            keywords=[],
+            body=body,
+            decorator_list=[],
+        )
+
+    @property
+    def module_docstring(self) -> str:
+        """
+        Builds the module docstring, as the template does.
+        :return: Such docstring.
+        :rtype: str
+        """
+        artifact = self.artifact
+        return (
+            f"\n{artifact.relative_file_path}\n\n{artifact.file_description}"
+            f"\n\n{artifact.copyright_preamble}\n"
+        )
+
+    @property
+    def class_docstring(self) -> str:
+        """
+        Builds the class docstring, as the template does.
+        :return: Such docstring.
+        :rtype: str
+        """
+        artifact = self.artifact
+        responsibilities = "\n        - ".join(
+            self.__class__._as_list(artifact.class_responsibilities)
+        )
+        collaborators = "\n        ".join(
+            f"- {c}" for c in self.__class__._as_list(artifact.class_collaborators)
+        )
+        return (
+            f"\n    {artifact.class_description}\n\n    Class name: {artifact.name}"
+            f"\n\n    Responsibilities:\n        - {responsibilities}"
+            f"\n\n    Collaborators:\n        {collaborators or '- None'}\n    "
+        )
+
+    def unparse(self) -> str:
+        """
+        Generates the source code of the module. Comments are not preserved.
+        :return: Such code.
+        :rtype: str
+        """
+        tree = self.module()
+        with Instrumentation.timed("ast.unparse"):
+            return ast.unparse(tree) + "\n"
+
+    def compile(self, filename: str = None) -> CodeType:
+        """
+        Compiles the module, without generating its source code.
+        :param filename: The file name for tracebacks. Defaults to the file of the
+        artifact, since reused method nodes keep their original line numbers.
+        :type filename: str
+        :return: The code object, ready to `exec`.
+        :rtype: types.CodeType
+        """
+        tree = self.module()
+        if filename is None:
+            filename = self.artifact.relative_file_path or "<artifact>"
+        with Instrumentation.timed("ast.compile"):
+            return compile(tree, filename, "exec")
+
+    @classmethod
+    def import_nodes_of(
+        cls, dependencies: List, relativeImportsBase: str = None
+    ) -> List[ast.stmt]:
+        """
+        Builds the statements for given imports. Guarded imports are kept under
+        their condition, in a single `if` for each one.
+        :param dependencies: The imports.
+        :type dependencies: List[pythoneda.sandbox.poc.cac.PythonImport]
+        :param relativeImportsBase: The package to resolve relative imports against,
+        to make them absolute. If omitted, they're kept relative.
+        :type relativeImportsBase: str
+        :return: Such statements.
+        :rtype: List[ast.stmt]
+        """
+        result = []
+        guarded = {}
+        for dependency in dependencies:
+            node = cls.import_node_of(dependency, relativeImportsBase)
+            guard = getattr(dependency, "guard", None)
+            if guard is None:
+                result.append(node)
+            elif guard in guarded:
+                guarded[guard].body.append(node)
+            else:
+                guarded[guard] = ast.If(
+                    test=ast.parse(guard, mode="eval").body, body=[node], orelse=[]
+                )
+                result.append(guarded[guard])
+
+        return result
+
+    @classmethod
+    def import_node_of(cls, dependency, relativeImportsBase: str = None) -> ast.stmt:
+        """
+        Builds the statement for given import, regardless of its guard.
+        :param dependency: The import.
+        :type dependency: pythoneda.sandbox.poc.cac.PythonImport
+        :param relativeImportsBase: The package to resolve relative imports against,
+        to make them absolute. If omitted, they're kept relative.
+        :type relativeImportsBase: str
+        :return: Either an `import` or a `from ... import` statement.
+        :rtype: Union[ast.Import, ast.ImportFrom]
+        """
+        asset = getattr(dependency, "asset", None)
+        if asset:
+            result = ast.ImportFrom(
+                module=dependency.package or None,
+                names=[ast.alias(name=asset)],
+                level=getattr(dependency, "level", 0),
+            )
+            if relativeImportsBase is not None:
+                cls._make_absolute(result, relativeImportsBase)
+            return result
+
+        return ast.Import(names=[ast.alias(name=dependency.package)])
+
+    @classmethod
+    def _make_absolute(cls, node: ast.ImportFrom, base: str):
+        """
+        Makes given relative import absolute, in place.
+        :param node: The import.
+        :type node: ast.ImportFrom
+        :param base: The package to resolve it against.
+        :type base: str
+        """
+        if node.level:
+            node.module = importlib.util.resolve_name(
+                "." * node.level + (node.module or ""), base
+            )
+            node.level = 0
+
+    @classmethod
+    def _with_absolute_imports(cls, node: ast.AST, base: str) -> ast.AST:
+        """
+        Retrieves given declaration with its relative imports made absolute.
+        Nodes are shared with the trees they come from, so they're copied first.
+        :param node: The declaration.
+        :type node: ast.AST
+        :param base: The package to resolve the imports against.
+        :type base: str
+        :return: The same declaration, if it has no relative imports; or a copy.
+        :rtype: ast.AST
+        """
+        if not any(
+            isinstance(n, ast.ImportFrom) and n.level for n in ast.walk(node)
+        ):
+            return node
+
+        import copy
+
+        result = copy.deepcopy(node)
+        for child in ast.walk(result):
+            if isinstance(child, ast.ImportFrom):
+                cls._make_absolute(child, base)
+
+        return result
+
+    @classmethod
+    def method_node_of(
+        cls, method: PythonMethod, sourceCache: SourceCache = None
+    ) -> ast.stmt:
+        """
+        Builds the declaration of given method. Already-parsed declarations are
+        reused; otherwise, the body is parsed, and wrapped in a function built
+        from the method definition unless it declares the function itself.
+        :param method: The method.
+        :type method: pythoneda.sandbox.poc.cac.PythonMethod
+        :param sourceCache: The cache to find the source of the definitions in.
+        :type sourceCache: pythoneda.sandbox.poc.cac.SourceCache
+        :return: Such declaration.
+        :rtype: Union[ast.FunctionDef, ast.AsyncFunctionDef]
+        """
+        result = getattr(method, "node", None)
+        if result is None:
+            with Instrumentation.timed("ast.parse"):
+                body = ast.parse(textwrap.dedent(method.body)).body
+            if len(body) == 1 and isinstance(
+                body[0], (ast.FunctionDef, ast.AsyncFunctionDef)
+            ):
+                result = body[0]
+            else:
+                result = cls.function_node_of(method.method_def, body, sourceCache)
+
+        return result
+
+    @classmethod
+    def function_node_of(
+        cls,
+        methodDef: MethodDef,
+        body: List[ast.stmt],
+        sourceCache: SourceCache = None,
+    ) -> ast.FunctionDef:
+        """
+        Builds the declaration of a method, from its definition. If the definition
+        comes from a function with source code, its signature is taken verbatim
+        from the source, so annotations read exactly as they were written.
+        :param methodDef: The method definition.
+        :type methodDef: pythoneda.sandbox.poc.cac.MethodDef
+        :param body: The statements of the method.
+        :type body: List[ast.stmt]
+        :param sourceCache: The cache to find the source of the definition in.
+        :type sourceCache: pythoneda.sandbox.poc.cac.SourceCache
+        :return: Such declaration, with locations filled in.
+        :rtype: ast.FunctionDef
+        """
+        if methodDef.doc:
+            body = [cls._docstring_of(methodDef.doc)] + list(body)
+
+        source = cls._source_node_of(methodDef, sourceCache)
+        if source is None:
+            arguments = cls._arguments_of(methodDef)
+            returns = cls._expression_of(methodDef.return_type)
+            decorators = []
+        else:
+            arguments = source.args
+            returns = source.returns
+            decorators = source.decorator_list
+
+        result = ast.FunctionDef(
+            name=methodDef.name,
+            args=arguments,
+            body=body or [ast.Pass()],
+            decorator_list=decorators,
+            returns=returns,
+        )
+
+        return ast.fix_missing_locations(result)
+
+    @classmethod
+    def _source_node_of(
+        cls, methodDef: MethodDef, sourceCache: SourceCache = None
+    ) -> ast.AST:
+        """
+        Retrieves the parsed declaration of the function a definition comes from.
+        :param methodDef: The method definition.
+        :type methodDef: pythoneda.sandbox.poc.cac.MethodDef
+        :param sourceCache: The cache to find the source in.
+        :type sourceCache: pythoneda.sandbox.poc.cac.SourceCache
+        :return: Such declaration, or None if there's no source.
+        :rtype: Union[ast.FunctionDef, ast.AsyncFunctionDef]
+        """
+        function = methodDef.method
+        if isinstance(function, property):
+            function = function.fget
+        if isinstance(function, (classmethod, staticmethod)):
+            function = function.__func__
+        if not hasattr(function, "__code__"):
+            return None
+
+        if sourceCache is None:
+            sourceCache = SourceCache()
+        try:
+            return sourceCache.function_node_of(function)
+        except (OSError, TypeError):
+            return None
+
+    @classmethod
+    def _arguments_of(cls, methodDef: MethodDef) -> ast.arguments:
+        """
+        Builds the arguments of a method, from the parameters of its definition.
+        :param methodDef: The method definition.
+        :type methodDef: pythoneda.sandbox.poc.cac.MethodDef
+        :return: Such arguments, after `self`.
+        :rtype: ast.arguments
+        """
+        arguments = [ast.arg(arg="self")]
+        defaults = []
+        for parameter in methodDef.parameters:
+            arguments.append(
+                ast.arg(
+                    arg=parameter.name,
+                    annotation=cls._expression_of(parameter.parameter_type),
+                )
+            )
+            if parameter.default_value is not None:
+                defaults.append(cls._expression_of(parameter.default_value))
+            elif defaults:
+                # defaults apply to the last parameters
+                raise ValueError(
+                    f"Parameter {parameter.name} of {methodDef.name} follows "
+                    "a parameter with a default value"
+                )
+
+        return ast.arguments(
+            posonlyargs=[],
+            args=arguments,
+            kwonlyargs=[],
+            kw_defaults=[],
+            defaults=defaults,
+        )
+
+    @classmethod
+    def _expression_of(cls, value: Any) -> ast.expr:
+        """
+        Builds the expression for given annotation or default value.
+        :param value: The value, either as text or as an annotation object.
+        :type value: Any
+        :return: Such expression, or None if there's no value.
+        :rtype: ast.expr
+        """
+        import inspect
+
+        if value is None or value is inspect.Signature.empty:
+            return None
+        if isinstance(value, type):
+            value = value.__name__
+        elif not isinstance(value, str):
+            # i.e. typing.List[str] is written as List[str]
+            value = inspect.formatannotation(value)
+
+        return ast.parse(value, mode="eval").body
+
+    @classmethod
+    def _docstring_of(cls, text: str) -> ast.Expr:
+        """
+        Builds a docstring statement.
+        :param text: The docstring.
+        :type text: str
+        :return: Such statement.
+        :rtype: ast.Expr
+        """
+        return ast.Expr(value=ast.Constant(value=text))
+
+    @classmethod
+    def _as_list(cls, value: Any) -> List[str]:
+        """
+        Normalizes a metadata entry that can be either a single value or a list.
+        :param value: The entry.
+        :type value: Any
+        :return: The entries.
+        :rtype: List[str]
+        """
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [value]
+
+        return list(value)
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,316 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/artifact_benchmark.py
+
+This file declares the ArtifactBenchmark class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .artifact_metadata import ArtifactMetadata
+from .class_artifact import ClassArtifact
+from .domain_artifact import DomainArtifact
+from .instrumentation import Instrumentation
+from .method_parameter import MethodParameter
+from .python_import_find import PythonImportFind
+from .python_method_def import PythonMethodDef
+from pythoneda.shared import BaseObject
+from .synthetic_domain_generator import SyntheticDomainGenerator
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+
+class ArtifactBenchmark(BaseObject):
+    """
+    Times artifact extraction and rendering over synthetic packages.
+
+    Class name: ArtifactBenchmark
+
+    Responsibilities:
+        - Generate synthetic packages of given sizes, with one class per module.
+        - Time ClassArtifact.for_class, ClassArtifact.content, PythonMethodDef.content,
+          PythonImportFind and DomainArtifact.find_classes over them.
+        - Report the results as JSON.
+
+    Collaborators:
+        - pythoneda.sandbox.poc.cac.ClassArtifact
+        - pythoneda.sandbox.poc.cac.DomainArtifact
+        - pythoneda.sandbox.poc.cac.PythonImportFind
+        - pythoneda.sandbox.poc.cac.PythonMethodDef
+        - pythoneda.sandbox.poc.cac.SyntheticDomainGenerator
+    """
+
+    def __init__(self, sizes: List[int] = None, repeat: int = 3, folder: str = None):
+        """
+        Creates a new ArtifactBenchmark instance.
+        :param sizes: The number of classes of each synthetic package.
+        :type sizes: List[int]
+        :param repeat: How many times each benchmark runs. The best time is reported.
+        :type repeat: int
+        :param folder: The folder to generate the packages in. Defaults to a
+        temporary one, removed afterwards.
+        :type folder: str
+        """
+        super().__init__()
+        self._sizes = sizes if sizes else [10, 100, 1000]
+        self._repeat = repeat
+        self._folder = folder
+        self._results = []
+
+    @property
+    def sizes(self) -> List[int]:
+        """
+        Retrieves the number of classes of each synthetic package.
+        :return: Such numbers.
+        :rtype: List[int]
+        """
+        return self._sizes
+
+    @property
+    def repeat(self) -> int:
+        """
+        Retrieves how many times each benchmark runs.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._repeat
+
+    @property
+    def results(self) -> List[Dict]:
+        """
+        Retrieves the results of the last run.
+        :return: One entry for each benchmark and size.
+        :rtype: List[Dict]
+        """
+        return self._results
+
+    def _time(
+        self,
+        name: str,
+        size: int,
+        fn: Callable[[Any], int],
+        setup: Callable[[], Any] = lambda: None,
+    ):
+        """
+        Times given function, keeping the best of several runs.
+        :param name: The benchmark name.
+        :type name: str
+        :param size: The size of the package.
+        :type size: int
+        :param fn: The function to time. It receives what setup returns, and
+        returns the number of items it processed.
+        :type fn: Callable[[Any], int]
+        :param setup: A function to prepare each run, which is not timed.
+        :type setup: Callable[[], Any]
+        """
+        timings = []
+        items = 0
+        for _ in range(self.repeat):
+            state = setup()
+            start = time.perf_counter()
+            items = fn(state)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        self._results.append(
+            {
+                "benchmark": name,
+                "size": size,
+                "items": items,
+                "repeat": self.repeat,
+                "best": best,
+                "mean": sum(timings) / len(timings),
+                "per_item": best / items if items else None,
+            }
+        )
+
+    @classmethod
+    def _find_classes(cls, domain: DomainArtifact) -> int:
+        """
+        Runs DomainArtifact.find_classes.
+        :param domain: The domain.
+        :type domain: pythoneda.sandbox.poc.cac.DomainArtifact
+        :return: The number of classes found.
+        :rtype: int
+        """
+        import asyncio
+
+        return len(asyncio.run(domain.find_classes()))
+
+    def _run_size(self, folder: str, size: int):
+        """
+        Runs all benchmarks over a synthetic package of given size.
+        :param folder: The folder to generate the package in.
+        :type folder: str
+        :param size: The number of classes.
+        :type size: int
+        """
+        import importlib
+        import inspect
+
+        generator = SyntheticDomainGenerator(f"poccac_benchmark_{size}", size)
+        generator.generate(folder)
+        package_name = generator.package_name
+        targets = [
+            getattr(importlib.import_module(module_name), class_name)
+            for module_name, class_name in generator.classes
+        ]
+        sources = [inspect.getsource(inspect.getmodule(t)) for t in targets]
+        method_name = generator.method_name_of(0)
+
+        self._time(
+            "ClassArtifact.for_class",
+            size,
+            lambda _: len([ClassArtifact.for_class(t) for t in targets]),
+        )
+        self._time(
+            "ClassArtifact.content",
+            size,
+            lambda artifacts: len([a.content for a in artifacts]),
+            lambda: [ClassArtifact.for_class(t) for t in targets],
+        )
+        method_defs = [
+            PythonMethodDef(
+                method_name,
+                "int",
+                "Performs operation #0.",
+                [MethodParameter("count", "int", "How many times.")],
+                "The result.",
+            )
+            for _ in targets
+        ]
+        self._time(
+            "PythonMethodDef.content",
+            size,
+            lambda _: len([d.content for d in method_defs]),
+        )
+        self._time(
+            "PythonImportFind",
+            size,
+            lambda _: len([PythonImportFind(s, method_name).imports for s in sources]),
+        )
+        # in memory, so the cold runs don't reuse the index on disk
+        metadata = {"package_name": package_name, "class_index_file": ""}
+        self._time(
+            "DomainArtifact.find_classes (cold)",
+            size,
+            self.__class__._find_classes,
+            lambda: DomainArtifact(package_name, ArtifactMetadata.from_dict(metadata)),
+        )
+        domain = DomainArtifact(package_name, ArtifactMetadata.from_dict(metadata))
+        self.__class__._find_classes(domain)
+        self._time(
+            "DomainArtifact.find_classes (warm)",
+            size,
+            lambda _: self.__class__._find_classes(domain),
+        )
+
+    def run(self) -> List[Dict]:
+        """
+        Runs all benchmarks, for every size.
+        :return: The results.
+        :rtype: List[Dict]
+        """
+        import shutil
+        import tempfile
+
+        self._results = []
+        folder = self._folder
+        if folder is None:
+            folder = tempfile.mkdtemp(prefix="poccac-benchmark-")
+        sys.path.insert(0, folder)
+        try:
+            for size in self.sizes:
+                self._run_size(folder, size)
+        finally:
+            sys.path.remove(folder)
+            for name in [m for m in sys.modules if m.startswith("poccac_benchmark_")]:
+                del sys.modules[name]
+            if self._folder is None:
+                shutil.rmtree(folder, ignore_errors=True)
+
+        return self._results
+
+    def to_json(self, instrumentation: bool = False) -> str:
+        """
+        Serializes the results of the last run.
+        :param instrumentation: Whether to include the instrumentation summary.
+        :type instrumentation: bool
+        :return: The JSON text.
+        :rtype: str
+        """
+        import json
+        import platform
+
+        report = {
+            "python": platform.python_version(),
+            "timestamp": time.time(),
+            "results": self._results,
+        }
+        if instrumentation:
+            report["instrumentation"] = Instrumentation.summary()
+
+        return json.dumps(report, indent=2)
+
+    @classmethod
+    def main(cls, args: List[str] = None) -> int:
+        """
+        Runs the benchmarks from the command line, printing the results as JSON.
+        :param args: The command-line arguments.
+        :type args: List[str]
+        :return: The exit status.
+        :rtype: int
+        """
+        import argparse
+
+        parser = argparse.ArgumentParser(description=cls.__doc__.strip().split("\n")[0])
+        parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--output", help="The file to write the results to")
+        parser.add_argument(
+            "--instrument",
+            action="store_true",
+            help="Include the instrumentation counters and timers",
+        )
+        options = parser.parse_args(args)
+
+        benchmark = cls(options.sizes, options.repeat)
+        if options.instrument:
+            with Instrumentation.run():
+                benchmark.run()
+        else:
+            benchmark.run()
+        report = benchmark.to_json(options.instrument)
+        if options.output:
+            with open(options.output, "w") as file:
+                file.write(report)
+        else:
+            print(report)
+
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(ArtifactBenchmark.main())
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
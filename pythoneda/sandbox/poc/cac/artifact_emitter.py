@@ -0,0 +1,232 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/artifact_emitter.py
+
+This file declares the ArtifactEmitter class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import hashlib
+import os
+from pythoneda.shared import BaseObject
+
+
+class ArtifactEmitter(BaseObject):
+    """
+    Writes rendered artifacts to disk, but only when their content changed.
+
+    Class name: ArtifactEmitter
+
+    Responsibilities:
+        - Compare the hash of the rendered content with the file on disk.
+        - Leave unchanged files untouched, so their mtime is preserved.
+        - Write changed files atomically.
+        - Count how many files were written and skipped.
+
+    Collaborators:
+        - pythoneda.sandbox.poc.cac.ClassArtifact
+    """
+
+    def __init__(self, outputFolder: str = None):
+        """
+        Creates a new ArtifactEmitter instance.
+        :param outputFolder: The folder relative paths are resolved against.
+        Defaults to the current folder.
+        :type outputFolder: str
+        """
+        super().__init__()
+        self._output_folder = outputFolder if outputFolder else os.curdir
+        self._written = 0
+        self._skipped = 0
+
+    @property
+    def output_folder(self) -> str:
+        """
+        Retrieves the folder relative paths are resolved against.
+        :return: Such folder.
+        :rtype: str
+        """
+        return self._output_folder
+
+    @property
+    def written(self) -> int:
+        """
+        Retrieves how many files were written.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._written
+
+    @property
+    def skipped(self) -> int:
+        """
+        Retrieves how many files were left untouched, since they didn't change.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._skipped
+
+    def reset_counters(self):
+        """
+        Resets the written and skipped counters.
+        """
+        self._written = 0
+        self._skipped = 0
+
+    @classmethod
+    def digest_of(cls, data: bytes) -> str:
+        """
+        Hashes given data.
+        :param data: The data.
+        :type data: bytes
+        :return: The hex digest.
+        :rtype: str
+        """
+        return hashlib.sha256(data).hexdigest()
+
+    @classmethod
+    def file_digest_of(cls, path: str) -> str:
+        """
+        Hashes the contents of given file, reading it in chunks.
+        :param path: The file path.
+        :type path: str
+        :return: The hex digest.
+        :rtype: str
+        """
+        result = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(65536), b""):
+                result.update(chunk)
+
+        return result.hexdigest()
+
+    @classmethod
+    def is_up_to_date(cls, path: str, data: bytes) -> bool:
+        """
+        Checks whether given file already contains given data.
+        Files with a different size are not even read.
+        :param path: The file path.
+        :type path: str
+        :param data: The data.
+        :type data: bytes
+        :return: True in such case.
+        :rtype: bool
+        """
+        try:
+            if os.stat(path).st_size != len(data):
+                return False
+            return cls.file_digest_of(path) == cls.digest_of(data)
+        except FileNotFoundError:
+            return False
+
+    @classmethod
+    def write_atomically(cls, path: str, data: bytes):
+        """
+        Writes given data to a temporary file next to the target, and then moves it
+        into place, so readers never see a half-written file. The file keeps the
+        mode of the target, or gets the default one for new files.
+        :param path: The file path.
+        :type path: str
+        :param data: The data.
+        :type data: bytes
+        """
+        import secrets
+
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        while True:
+            temp_file = os.path.join(
+                folder, f".{os.path.basename(path)}.{secrets.token_hex(4)}.tmp"
+            )
+            try:
+                # the kernel applies the umask to new files, as open() does
+                descriptor = os.open(
+                    temp_file,
+                    os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0),
+                    0o666,
+                )
+                break
+            except FileExistsError:
+                continue
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            if os.path.exists(path):
+                os.chmod(temp_file, os.stat(path).st_mode)
+            os.replace(temp_file, path)
+        except BaseException:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
+
+    @classmethod
+    def output_path_of(cls, artifact) -> str:
+        """
+        Retrieves the path of the file for given artifact, relative to the output
+        folder. Classes go to their own file, next to the module declaring them.
+        :param artifact: The artifact.
+        :type artifact: pythoneda.sandbox.poc.cac.ClassArtifact
+        :return: Such path.
+        :rtype: str
+        """
+        return os.path.join(
+            *artifact.module_name.split(".")[:-1],
+            cls.camel_to_snake(artifact.name) + ".py",
+        )
+
+    def emit(self, relativePath: str, content: str) -> bool:
+        """
+        Writes given content, unless the file already has it.
+        :param relativePath: The file path, relative to the output folder.
+        :type relativePath: str
+        :param content: The content.
+        :type content: str
+        :return: True if the file was written.
+        :rtype: bool
+        """
+        normalized = os.path.normpath(relativePath)
+        if os.path.isabs(normalized) or normalized.split(os.sep)[0] == os.pardir:
+            raise ValueError(f"Not relative to the output folder: {relativePath}")
+        path = os.path.join(self.output_folder, normalized)
+        data = content.encode("utf-8")
+        if self.__class__.is_up_to_date(path, data):
+            self._skipped += 1
+            return False
+
+        self.__class__.write_atomically(path, data)
+        self._written += 1
+        return True
+
+    def emit_artifact(self, artifact) -> bool:
+        """
+        Writes the content of given artifact to its output path, within the output
+        folder, unless the file already has it.
+        :param artifact: The artifact.
+        :type artifact: pythoneda.sandbox.poc.cac.ClassArtifact
+        :return: True if the file was written.
+        :rtype: bool
+        """
+        return self.emit(self.__class__.output_path_of(artifact), artifact.content)
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
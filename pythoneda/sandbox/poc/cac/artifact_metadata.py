@@ -31,6 +31,7 @@ class ArtifactMetadata(BaseObject):
 
     Responsibilities:
         - Provide metadata.
+        - Remember derived values until an entry is set.
 
     Collaborators:
         - None
@@ -44,6 +45,8 @@ class ArtifactMetadata(BaseObject):
         """
         super().__init__()
         self._metadata = metadata
+        self._derived: Dict[Any, Any] = {}
+        self._version = 0
 
     @classmethod
     def from_dict(cls, metadata: Dict[str, str]) -> "ArtifactMetadata":
@@ -69,10 +72,88 @@ class ArtifactMetadata(BaseObject):
         result = self._metadata.get(key, None)
         if result is None:
             result = defaultValueFn()
-            self._metadata[key] = result
 
         return result
 
+    def derived(self, key: Any, valueFn: Callable[[], Any]) -> Any:
+        """
+        Retrieves a value derived from the metadata, computing it only the first time.
+        Derived values are kept apart from the entries, and discarded every time an
+        entry is set.
+        :param key: The key of the derived value.
+        :type key: Any
+        :param valueFn: A function to compute the value.
+        :type valueFn: Callable[[],Any]
+        :return: The value.
+        :rtype: Any
+        """
+        if key in self._derived:
+            return self._derived[key]
+
+        result = valueFn()
+        self._derived[key] = result
+        return result
+
+    def get_str(self, key: str, defaultValueFn: Callable[[], Any]) -> str:
+        """
+        Retrieves a metadata entry as text.
+        :param key: The entry key.
+        :type key: str
+        :param defaultValueFn: A function to retrieve the default value.
+        :type defaultValue: Callable[[str],Any]
+        :return: The entry value, or None if there's none.
+        :rtype: str
+        """
+        return self.__class__._to_str(self.get(key, defaultValueFn))
+
+    def get_int(self, key: str, defaultValueFn: Callable[[], Any]) -> int:
+        """
+        Retrieves a metadata entry as a number.
+        :param key: The entry key.
+        :type key: str
+        :param defaultValueFn: A function to retrieve the default value.
+        :type defaultValue: Callable[[str],Any]
+        :return: The entry value, or the default if it's not a number.
+        :rtype: int
+        """
+        value = self._metadata.get(key, None)
+        result = self.__class__._to_int(value)
+        if result is None:
+            result = self.__class__._to_int(defaultValueFn())
+
+        return result
+
+    @classmethod
+    def _to_str(cls, value: Any) -> str:
+        """
+        Converts given value to text.
+        :param value: The value.
+        :type value: Any
+        :return: The text, or None if the value is None.
+        :rtype: str
+        """
+        if value is None:
+            return None
+
+        return str(value)
+
+    @classmethod
+    def _to_int(cls, value: Any) -> int:
+        """
+        Converts given value to a number.
+        :param value: The value.
+        :type value: Any
+        :return: The number, or None if the value is None or not a number.
+        :rtype: int
+        """
+        if value is None:
+            return None
+
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
     def set(self, key: str, value: Any):
         """
         Stores a metadata entry under given key.
@@ -82,6 +163,17 @@ class ArtifactMetadata(BaseObject):
         :type value: Any
         """
         self._metadata[key] = value
+        self._derived.clear()
+        self._version += 1
+
+    @property
+    def version(self) -> int:
+        """
+        Retrieves the version, which changes every time an entry is set.
+        :return: Such version.
+        :rtype: int
+        """
+        return self._version
 
     def _current_year(self) -> int:
         """
@@ -100,7 +192,9 @@ class ArtifactMetadata(BaseObject):
         :return: Such information.
         :rtype: int
         """
-        return self.get("start_year", self._current_year)
+        return self.derived(
+            "start_year", lambda: self.get_int("start_year", self._current_year)
+        )
 
     @property
     def author(self) -> str:
@@ -109,7 +203,7 @@ class ArtifactMetadata(BaseObject):
         :return: Such information.
         :rtype: str
         """
-        return self.get("author", lambda: "[unknown author]")
+        return self.get_str("author", lambda: "[unknown author]")
 
     @property
     def package_name(self) -> str:
@@ -118,7 +212,7 @@ class ArtifactMetadata(BaseObject):
         :return: Such information.
         :rtype: str
         """
-        return self.get("package_name", lambda: None)
+        return self.get_str("package_name", lambda: None)
 
     @property
     def github_token(self) -> str:
@@ -127,7 +221,7 @@ class ArtifactMetadata(BaseObject):
         :return: Such information.
         :rtype: str
         """
-        return self.get("github_token", lambda: None)
+        return self.get_str("github_token", lambda: None)
 
     @property
     def ref_url(self) -> str:
@@ -136,7 +230,7 @@ class ArtifactMetadata(BaseObject):
         :return: Such information.
         :rtype: str
         """
-        return self.get("ref_url", lambda: "[unknown url]")
+        return self.get_str("ref_url", lambda: "[unknown url]")
 
     @classmethod
     def extract_github_organization_from(self, url: str) -> str:
@@ -171,9 +265,12 @@ class ArtifactMetadata(BaseObject):
         :return: Such information.
         :rtype: str
         """
-        return self.get(
+        return self.derived(
             "github_organization",
-            lambda: self.__class__.extract_github_organization_from(self.ref_url),
+            lambda: self.get_str(
+                "github_organization",
+                lambda: self.__class__.extract_github_organization_from(self.ref_url),
+            ),
         )
 
     @property
@@ -183,11 +280,12 @@ class ArtifactMetadata(BaseObject):
         :return: Such information.
         :rtype: str
         """
-        from pythoneda.shared.git import GitRepo
-
-        return self.get(
+        return self.derived(
             "github_name",
-            lambda: self.__class__.extract_github_name_from(self.ref_url),
+            lambda: self.get_str(
+                "github_name",
+                lambda: self.__class__.extract_github_name_from(self.ref_url),
+            ),
         )
 
     @property
@@ -197,9 +295,20 @@ class ArtifactMetadata(BaseObject):
         :return: Such content.
         :rtype: str
         """
-        return self.get(
+        return self.derived(
             "copyright_preamble",
-            lambda: f"""Copyright (C) {self.start_year}-today {self.author}'s {self.ref_url}
+            lambda: self.get_str(
+                "copyright_preamble", self._default_copyright_preamble
+            ),
+        )
+
+    def _default_copyright_preamble(self) -> str:
+        """
+        Builds the default copyright preamble.
+        :return: Such content.
+        :rtype: str
+        """
+        return f"""Copyright (C) {self.start_year}-today {self.author}'s {self.ref_url}
 
 This program is free software: you can redistribute it and/or modify
 it under the terms of the GNU General Public License as published by
@@ -212,8 +321,7 @@ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
 GNU General Public License for more details.
 
 You should have received a copy of the GNU General Public License
-along with this program.  If not, see https://www.gnu.org/licenses.""",
-        )
+along with this program.  If not, see https://www.gnu.org/licenses."""
 
     @property
     def copyright_preamble_for_st(self) -> str:
@@ -222,7 +330,10 @@ along with this program.  If not, see https://www.gnu.org/licenses.""",
         :return: Such content.
         :rtype: str
         """
-        return "\n// ".join(self.copyright_preamble.split("\n"))
+        return self.derived(
+            "copyright_preamble_for_st",
+            lambda: "\n// ".join(self.copyright_preamble.split("\n")),
+        )
 
 
 # vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
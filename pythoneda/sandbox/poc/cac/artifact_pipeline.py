@@ -0,0 +1,239 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/artifact_pipeline.py
+
+This file declares the ArtifactPipeline class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .artifact_emitter import ArtifactEmitter
+from .class_artifact import ClassArtifact
+from .instrumentation import Instrumentation
+from .package_class_index import PackageClassIndex
+from .source_cache import SourceCache
+from pythoneda.shared import BaseObject
+from typing import Dict, Iterable, Iterator, Tuple
+
+
+class ArtifactPipeline(BaseObject):
+    """
+    Generates the files of a whole package, one class at a time.
+
+    Each stage is a generator pulling items from the previous one, so nothing is
+    discovered, built or rendered until the writer asks for the next file. Only one
+    artifact, and the sources of one module, are alive at any time. Modules or
+    classes that fail are reported, and skipped.
+
+    Class name: ArtifactPipeline
+
+    Responsibilities:
+        - Discover the classes of a package.
+        - Build the artifact of each class.
+        - Render each artifact.
+        - Write each rendered file, if it changed.
+
+    Collaborators:
+        - pythoneda.sandbox.poc.cac.ArtifactEmitter
+        - pythoneda.sandbox.poc.cac.ClassArtifact
+        - pythoneda.sandbox.poc.cac.PackageClassIndex
+        - pythoneda.sandbox.poc.cac.SourceCache
+    """
+
+    def __init__(
+        self,
+        outputFolder: str,
+        classIndex: PackageClassIndex = None,
+        emitter: ArtifactEmitter = None,
+    ):
+        """
+        Creates a new ArtifactPipeline instance.
+        :param outputFolder: The folder to write the files to.
+        :type outputFolder: str
+        :param classIndex: The index to discover classes with.
+        :type classIndex: pythoneda.sandbox.poc.cac.PackageClassIndex
+        :param emitter: The emitter to write files with.
+        :type emitter: pythoneda.sandbox.poc.cac.ArtifactEmitter
+        """
+        super().__init__()
+        self._output_folder = outputFolder
+        if classIndex is None:
+            classIndex = PackageClassIndex()
+        self._class_index = classIndex
+        if emitter is None:
+            emitter = ArtifactEmitter(outputFolder)
+        self._emitter = emitter
+        self._errors: Dict[str, str] = {}
+
+    @property
+    def output_folder(self) -> str:
+        """
+        Retrieves the folder to write the files to.
+        :return: Such folder.
+        :rtype: str
+        """
+        return self._output_folder
+
+    @property
+    def class_index(self) -> PackageClassIndex:
+        """
+        Retrieves the index to discover classes with.
+        :return: Such index.
+        :rtype: pythoneda.sandbox.poc.cac.PackageClassIndex
+        """
+        return self._class_index
+
+    @property
+    def emitter(self) -> ArtifactEmitter:
+        """
+        Retrieves the emitter to write files with.
+        :return: Such emitter.
+        :rtype: pythoneda.sandbox.poc.cac.ArtifactEmitter
+        """
+        return self._emitter
+
+    @property
+    def errors(self) -> Dict[str, str]:
+        """
+        Retrieves the errors found since the last run.
+        :return: The error message, by module or class name.
+        :rtype: Dict[str, str]
+        """
+        return self._errors
+
+    def _report(self, name: str, error: Exception):
+        """
+        Reports an error building or rendering a module or class.
+        :param name: The module or class name.
+        :type name: str
+        :param error: The error.
+        :type error: Exception
+        """
+        message = f"{error.__class__.__name__}: {error}"
+        print(f"Error extracting {name}: {message}")
+        self._errors[name] = message
+
+    @classmethod
+    def output_path_of(cls, artifact: ClassArtifact) -> str:
+        """
+        Retrieves the path of the file for given artifact, relative to the output
+        folder. Classes go to their own file, next to the module declaring them.
+        :param artifact: The artifact.
+        :type artifact: pythoneda.sandbox.poc.cac.ClassArtifact
+        :return: Such path.
+        :rtype: str
+        """
+        return ArtifactEmitter.output_path_of(artifact)
+
+    def discover(self, packageName: str) -> Iterator[Tuple[str, str]]:
+        """
+        Discovers the classes of given package, without importing it.
+        :param packageName: The package name.
+        :type packageName: str
+        :return: The (module name, class name) tuples, grouped by module.
+        :rtype: Iterator[Tuple[str, str]]
+        """
+        yield from sorted(self.class_index.classes_of(packageName))
+
+    def build(self, classes: Iterable[Tuple[str, str]]) -> Iterator[ClassArtifact]:
+        """
+        Builds the artifacts of given classes. Each module is read and parsed once,
+        as long as its classes come together. Failures are reported in `errors`.
+        :param classes: The (module name, class name) tuples.
+        :type classes: Iterable[Tuple[str, str]]
+        :return: The artifacts.
+        :rtype: Iterator[pythoneda.sandbox.poc.cac.ClassArtifact]
+        """
+        import importlib
+
+        current_module = None
+        module = None
+        source_cache = None
+        for module_name, class_name in classes:
+            if module_name != current_module:
+                current_module = module_name
+                # sources of previous modules are no longer needed
+                source_cache = SourceCache()
+                try:
+                    with Instrumentation.timed("importlib.import_module"):
+                        module = importlib.import_module(module_name)
+                except Exception as e:
+                    self._report(module_name, e)
+                    module = None
+            if module is None:
+                continue
+            try:
+                target = getattr(module, class_name, None)
+                if not isinstance(target, type) or target.__module__ != module_name:
+                    continue
+                artifact = ClassArtifact.for_class(target, source_cache)
+            except Exception as e:
+                self._report(f"{module_name}.{class_name}", e)
+                continue
+            yield artifact
+
+    def render(self, artifacts: Iterable[ClassArtifact]) -> Iterator[Tuple[str, str]]:
+        """
+        Renders given artifacts. Failures are reported in `errors`.
+        :param artifacts: The artifacts.
+        :type artifacts: Iterable[pythoneda.sandbox.poc.cac.ClassArtifact]
+        :return: The (relative path, content) tuples.
+        :rtype: Iterator[Tuple[str, str]]
+        """
+        for artifact in artifacts:
+            try:
+                content = artifact.content
+            except Exception as e:
+                self._report(f"{artifact.module_name}.{artifact.name}", e)
+                continue
+            yield self.__class__.output_path_of(artifact), content
+
+    def write(self, files: Iterable[Tuple[str, str]]) -> Iterator[str]:
+        """
+        Writes given files into the output folder. Files whose content didn't
+        change are left untouched.
+        :param files: The (relative path, content) tuples.
+        :type files: Iterable[Tuple[str, str]]
+        :return: The relative paths of the written files.
+        :rtype: Iterator[str]
+        """
+        for relative_path, content in files:
+            if self.emitter.emit(relative_path, content):
+                yield relative_path
+
+    def run(self, packageName: str) -> int:
+        """
+        Generates the files of given package.
+        :param packageName: The package name.
+        :type packageName: str
+        :return: The number of files written. Check the emitter for the skipped ones.
+        :rtype: int
+        """
+        result = 0
+        self._errors = {}
+        for _ in self.write(self.render(self.build(self.discover(packageName)))):
+            result += 1
+
+        return result
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
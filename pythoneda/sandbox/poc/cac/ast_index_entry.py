@@ -0,0 +1,160 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/ast_index_entry.py
+
+This file declares the AstIndexEntry class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import ast
+from pythoneda.shared import BaseObject
+from typing import List, Tuple
+
+
+class AstIndexEntry(BaseObject):
+    """
+    A class or function declaration within a ModuleAstIndex.
+
+    Class name: AstIndexEntry
+
+    Responsibilities:
+        - Know the line span of a declaration.
+        - Know the imports declared locally in it.
+        - Provide its source code.
+
+    Collaborators:
+        - pythoneda.sandbox.poc.cac.ModuleAstIndex
+    """
+
+    def __init__(
+        self,
+        qualname: str,
+        node: ast.AST,
+        firstLine: int,
+        lastLine: int,
+        lines: List[str],
+        name: str = None,
+        isClass: bool = None,
+    ):
+        """
+        Creates a new AstIndexEntry instance.
+        :param qualname: The qualified name of the declaration.
+        :type qualname: str
+        :param node: The declaration node.
+        :type node: Union[ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef]
+        :param firstLine: The first line, including decorators.
+        :type firstLine: int
+        :param lastLine: The last line.
+        :type lastLine: int
+        :param lines: The lines of the module, shared by all entries.
+        :type lines: List[str]
+        :param name: The name, if there's no node.
+        :type name: str
+        :param isClass: Whether it declares a class, if there's no node.
+        :type isClass: bool
+        """
+        super().__init__()
+        self._qualname = qualname
+        self._node = node
+        self._name = node.name if node is not None else name
+        self._is_class = isinstance(node, ast.ClassDef) if node is not None else isClass
+        self._first_line = firstLine
+        self._last_line = lastLine
+        self._lines = lines
+        self._imports = []
+
+    @property
+    def qualname(self) -> str:
+        """
+        Retrieves the qualified name.
+        :return: Such name.
+        :rtype: str
+        """
+        return self._qualname
+
+    @property
+    def name(self) -> str:
+        """
+        Retrieves the name.
+        :return: Such name.
+        :rtype: str
+        """
+        return self._name
+
+    @property
+    def node(self) -> ast.AST:
+        """
+        Retrieves the declaration node.
+        :return: Such node, or None if the entry was restored without parsing.
+        :rtype: Union[ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef]
+        """
+        return self._node
+
+    @property
+    def is_class(self) -> bool:
+        """
+        Checks whether the entry declares a class.
+        :return: True in such case.
+        :rtype: bool
+        """
+        return self._is_class
+
+    @property
+    def first_line(self) -> int:
+        """
+        Retrieves the first line, including decorators.
+        :return: Such line number.
+        :rtype: int
+        """
+        return self._first_line
+
+    @property
+    def last_line(self) -> int:
+        """
+        Retrieves the last line.
+        :return: Such line number.
+        :rtype: int
+        """
+        return self._last_line
+
+    @property
+    def imports(self) -> List[Tuple[str, str]]:
+        """
+        Retrieves the imports declared directly in this entry, as (package, asset)
+        tuples. Imports in nested functions belong to those.
+        :return: Such imports.
+        :rtype: List[Tuple[str, str]]
+        """
+        return self._imports
+
+    @property
+    def source(self) -> str:
+        """
+        Retrieves the source code of the declaration.
+        :return: Such code.
+        :rtype: str
+        """
+        return "".join(self._lines[self._first_line - 1 : self._last_line])
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -19,23 +19,25 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
-from io import StringIO
 from .artifact_metadata import ArtifactMetadata
 from .default_method_binding_criteria import DefaultMethodBindingCriteria
 from .dependency_import import DependencyImport
 from .empty_body_python_method import EmptyBodyPythonMethod
+from .import_set import ImportSet
+from .instrumentation import Instrumentation
 from .method_binding_criteria import MethodBindingCriteria
 from .method_def import MethodDef
 from .method_parameter import MethodParameter
 from .official_python_method import OfficialPythonMethod
 import os
 from .python_import import PythonImport
-from .python_import_find import PythonImportFind
 from .python_method_def import PythonMethodDef
 from .python_method import PythonMethod
 from pythoneda.shared import BaseObject
-from stringtemplate3 import StringTemplateGroup
-from typing import Dict, List, Type
+from .source_cache import SourceCache
+from .template_registry import TemplateRegistry
+from types import ModuleType
+from typing import Dict, List, TextIO, Type
 
 
 class ClassArtifact(BaseObject):
@@ -86,6 +88,9 @@ class ClassArtifact(BaseObject):
         self._metadata = metadata
         self._method_binding_criteria = methodBindingCriteria
         self._target = target
+        self._version = 0
+        self._content = None
+        self._content_version = None
 
     @classmethod
     def has_explicit_constructor(cls, target) -> bool:
@@ -99,25 +104,35 @@ class ClassArtifact(BaseObject):
         import inspect
 
         # Retrieve the __init__ method of the class, if it exists
-        init_method = getattr(cls, "__init__", None)
+        init_method = getattr(target, "__init__", None)
 
         if not init_method:
             return False
 
         # Check if the __init__ method is defined within the class itself
-        return inspect.getmodule(init_method) == inspect.getmodule(cls)
+        return "__init__" in target.__dict__ and inspect.getmodule(
+            init_method
+        ) == inspect.getmodule(target)
 
     @classmethod
-    def for_class(cls, target: Type) -> "ClassArtifact":
+    def for_class(
+        cls, target: Type, sourceCache: SourceCache = None
+    ) -> "ClassArtifact":
         """
         Creates a new instance for given target.
         :param target: The target class.
         :type target: Type
+        :param sourceCache: The cache of already parsed modules, if any.
+        :type sourceCache: pythoneda.sandbox.poc.cac.SourceCache
+        :return: The new instance.
+        :rtype: pythoneda.sandbox.poc.cac.ClassArtifact
         """
         import inspect
 
+        if sourceCache is None:
+            sourceCache = SourceCache()
         source_file = inspect.getfile(target)
-        class_imports = cls.class_imports_of(target)
+        class_imports = cls.class_imports_of(target, sourceCache)
         metadata = ArtifactMetadata.from_dict(
             {
                 "relative_file_path": source_file,
@@ -128,8 +143,8 @@ class ClassArtifact(BaseObject):
                 "class_description": "Models the Sample abstraction.",
                 "class_responsibilities": "Represent the Sample abstraction.",
                 "class_collaborators": "None",
-                "source": inspect.getsource(target),
-                "module_source": inspect.getsource(inspect.getmodule(target)),
+                "source": sourceCache.class_source_of(target),
+                "module_source": sourceCache.source_of(inspect.getmodule(target)),
                 "class_imports": class_imports,
             }
         )
@@ -138,7 +153,10 @@ class ClassArtifact(BaseObject):
 
         if cls.has_explicit_constructor(target):
             constructor = OfficialPythonMethod(
-                MethodDef.from_method(target.__init__), target.__init__, target
+                MethodDef.from_method(target.__init__),
+                target.__init__,
+                target,
+                sourceCache,
             )
 
         methods = list(target.__dict__.items())
@@ -154,7 +172,7 @@ class ClassArtifact(BaseObject):
             target.__bases__,
             constructor,
             [
-                OfficialPythonMethod(MethodDef.from_method(m), m, target)
+                OfficialPythonMethod(MethodDef.from_method(m), m, target, sourceCache)
                 for m in methods
             ],
             metadata,
@@ -162,6 +180,66 @@ class ClassArtifact(BaseObject):
             target,
         )
 
+    @classmethod
+    def for_module(
+        cls, module: ModuleType, sourceCache: SourceCache = None
+    ) -> List["ClassArtifact"]:
+        """
+        Creates new instances for all classes declared in given module.
+        The module is read and parsed only once.
+        :param module: The module.
+        :type module: types.ModuleType
+        :param sourceCache: The cache of already parsed modules, if any.
+        :type sourceCache: pythoneda.sandbox.poc.cac.SourceCache
+        :return: The new instances, in declaration order.
+        :rtype: List[pythoneda.sandbox.poc.cac.ClassArtifact]
+        """
+        if sourceCache is None:
+            sourceCache = SourceCache()
+
+        result = []
+        for entry in sourceCache.index_of(module).classes:
+            target = getattr(module, entry.name, None)
+            if (
+                isinstance(target, type)
+                and target.__module__ == module.__name__
+                and target.__qualname__ == entry.qualname
+            ):
+                result.append(cls.for_class(target, sourceCache))
+
+        return result
+
+    @classmethod
+    def for_package(
+        cls, package: ModuleType, sourceCache: SourceCache = None
+    ) -> List["ClassArtifact"]:
+        """
+        Creates new instances for all classes declared in given package and its
+        submodules, recursively. Each module is read and parsed only once.
+        :param package: The package.
+        :type package: types.ModuleType
+        :param sourceCache: The cache of already parsed modules, if any.
+        :type sourceCache: pythoneda.sandbox.poc.cac.SourceCache
+        :return: The new instances.
+        :rtype: List[pythoneda.sandbox.poc.cac.ClassArtifact]
+        """
+        import importlib
+        import pkgutil
+
+        if sourceCache is None:
+            sourceCache = SourceCache()
+
+        result = cls.for_module(package, sourceCache)
+        if hasattr(package, "__path__"):
+            for _, module_name, _ in pkgutil.walk_packages(
+                package.__path__, f"{package.__name__}."
+            ):
+                with Instrumentation.timed("importlib.import_module"):
+                    module = importlib.import_module(module_name)
+                result.extend(cls.for_module(module, sourceCache))
+
+        return result
+
     @property
     def name(self) -> str:
         """
@@ -180,6 +258,15 @@ class ClassArtifact(BaseObject):
         """
         return self._parents
 
+    @property
+    def parent_names(self) -> List[str]:
+        """
+        Retrieves the names of the class parents.
+        :return: Such names.
+        :rtype: List[str]
+        """
+        return [parent.__name__ for parent in self._parents]
+
     @property
     def constructor(self) -> PythonMethod:
         """
@@ -225,6 +312,21 @@ class ClassArtifact(BaseObject):
         """
         return self._target
 
+    @property
+    def version(self) -> tuple:
+        """
+        Retrieves the version of the artifact, including its metadata's.
+        :return: Such version.
+        :rtype: tuple
+        """
+        return (self._version, self.metadata.version)
+
+    def _increment_version(self):
+        """
+        Signals the artifact has changed, so any rendered content is stale.
+        """
+        self._version += 1
+
     @property
     def module_name(self) -> str:
         """
@@ -240,6 +342,19 @@ class ClassArtifact(BaseObject):
 
         return result
 
+    @property
+    def generated_module_name(self) -> str:
+        """
+        Retrieves the name of the module generated for the class: the module of the
+        class within the same package, named after the class.
+        :return: Such name.
+        :rtype: str
+        """
+        return ".".join(
+            self.module_name.split(".")[:-1]
+            + [self.__class__.camel_to_snake(self.name)]
+        )
+
     @property
     def start_year(self) -> int:
         """
@@ -276,13 +391,11 @@ class ClassArtifact(BaseObject):
         """
         result = self.metadata.get("relative_file_path", lambda: None)
         if result is None:
-            module_name = self.metadata.get("module_name", None)
+            module_name = self.metadata.get("module_name", lambda: None)
             if module_name:
-                result = (
-                    os.path.sep.join(module_name.split("."))
-                    + os.path.sep
-                    + self.__class__.camel_to_snake(name)
-                    + ".py"
+                result = os.path.join(
+                    *module_name.split(".")[:-1],
+                    self.__class__.camel_to_snake(self.name) + ".py",
                 )
             self.metadata.set("relative_file_path", result)
 
@@ -296,7 +409,7 @@ class ClassArtifact(BaseObject):
         :rtype: str
         """
         return self.metadata.get(
-            "file_description", f"This file defines the {self.name} class."
+            "file_description", lambda: f"This file defines the {self.name} class."
         )
 
     @property
@@ -353,6 +466,16 @@ class ClassArtifact(BaseObject):
         """
         return self.metadata.get("class_imports", lambda: [])
 
+    @property
+    def imports(self) -> List[PythonImport]:
+        """
+        Retrieves the imports to render: the class imports, without duplicates.
+        They're interned, so they must not be renamed; use class_imports for that.
+        :return: Such imports.
+        :rtype: List[pythoneda.sandbox.poc.cac.python_import.PythonImport]
+        """
+        return ImportSet(self.class_imports).to_list()
+
     @property
     def method_imports(self) -> List[PythonImport]:
         """
@@ -383,29 +506,21 @@ class ClassArtifact(BaseObject):
         :return: Such template.
         :rtype: str
         """
-        return f'''
+        return '''
 //
-// This file defines the template for {self.metadata["relative_file_path"]}
+// This file defines the template for class artifacts.
 //
-// {self.copyright_preamble_for_st}
+// Per-artifact values, such as the relative file path or the copyright
+// preamble, are provided as attributes, so the compiled group is shared
+// among all classes. The editor_preamble, imports, collaborators, parents
+// and editor_settings templates are provided by the Common group.
 //
 group Artifact;
 
-// editor preamble template
-editor_preamble() ::= <<
-# vim: set fileencoding=utf-8
->>
-
-// imports template
-// - deps: The dependencies.
-imports(deps) ::= <<
-<deps: {{ dep |<import(dep=dep)>}}; separator="\\n">
->>
-
 // class template
 // - inst: The Sample instance.
 class(inst) ::= <<
-class <inst.name>(<parents(parents=inst.parents)>):
+class <inst.name>(<parents(parents=inst.parent_names)>):
     """
     <inst.class_description>
 
@@ -425,36 +540,10 @@ class <inst.name>(<parents(parents=inst.parents)>):
 <methods(methods=inst.methods)><endif>
 >>
 
-collaborators(collaborators) ::= <<
-<if(collaborators)><collaborators: {{ collaborator |- <collaborator>}}; separator="\\n"><else>- None<endif>
->>
-
-// parents template
-// - inst: The Sample instance.
-parents(parents) ::= <<
-<parents: {{ parent |<parent.__name__>}}; separator=", ">
->>
-
-import(dep) ::= <<
-from <dep.package> import <dep.asset>
->>
-
-// editor settings template
-editor_settings() ::= <<
-# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
-# Local Variables:
-# mode: python
-# python-indent-offset: 4
-# tab-width: 4
-# indent-tabs-mode: nil
-# fill-column: 79
-# End:
->>
-
 // methods template
 // - methods: The methods.
 methods(methods) ::= <<
-<methods: {{ method |<method.body>}}; separator="\n\n" >
+<methods: { method |<method.body>}; separator="\n\n" >
 >>
 
 //  root template
@@ -469,7 +558,7 @@ root(inst) ::= <<
 
 <inst.copyright_preamble>
 """
-<if(inst.class_imports)><imports(inst.class_imports)>
+<if(inst.imports)><imports(inst.imports)>
 
 <endif>
 
@@ -483,17 +572,32 @@ root(inst) ::= <<
     @property
     def content(self) -> str:
         """
-        Generates the file content.
+        Generates the file content. It's rendered again only if the artifact
+        has changed since the last time.
         :return: Such content.
         :rtype: str
         """
-        # Create a group from the string content
-        group = StringTemplateGroup(name="Artifact", file=StringIO(self.template))
+        if self._content is None or self._content_version != self.version:
+            with Instrumentation.timed("template.render"):
+                self._content = TemplateRegistry.render(
+                    "Artifact", self.template, inst=self
+                )
+            # rendering can store derived metadata, so check the version afterwards
+            self._content_version = self.version
 
-        root_template = group.getInstanceOf("root")
-        root_template["inst"] = self
+        return self._content
 
-        return str(root_template)
+    def render_to(self, stream: TextIO):
+        """
+        Writes the file content to given stream as it gets rendered.
+        :param stream: The stream to write to.
+        :type stream: TextIO
+        """
+        if self._content is not None and self._content_version == self.version:
+            stream.write(self._content)
+        else:
+            with Instrumentation.timed("template.render"):
+                TemplateRegistry.render_to(stream, "Artifact", self.template, inst=self)
 
     async def rename_imports(
         self,
@@ -501,9 +605,10 @@ root(inst) ::= <<
         newPackage: str,
         oldAsset: str = None,
         newAsset: str = None,
+        maxConcurrency: int = None,
     ) -> None:
         """
-        Renames the matching imports.
+        Renames the matching imports, concurrently.
         :param oldPackage: The old package.
         :type oldPackage: str
         :param newPackage: The new package.
@@ -512,11 +617,18 @@ root(inst) ::= <<
         :type oldAsset: str
         :param newAsset: The new asset.
         :type newAsset: str
-        """
-        aux = self.class_imports
-        aux.extend(self.method_imports)
-        for imp in aux:
-            await imp.rename(oldPackage, newPackage, oldAsset, newAsset)
+        :param maxConcurrency: The maximum number of renames in progress at any time.
+        :type maxConcurrency: int
+        """
+        await PythonImport.rename_all(
+            self.class_imports + self.method_imports,
+            oldPackage,
+            newPackage,
+            oldAsset,
+            newAsset,
+            maxConcurrency,
+        )
+        self._increment_version()
         if any(parent.__name__ == oldAsset for parent in self.parents):
             import importlib
 
@@ -535,35 +647,204 @@ root(inst) ::= <<
 
     async def rename(self, newName: str) -> None:
         """
-        Renames the class.
+        Renames the class. If the target class is available, the renamed class is
+        built directly from its namespace, unless some of its methods capture the
+        class in ways that cannot be rebound. Otherwise, the renamed module is built
+        as a syntax tree and compiled, without generating its source code.
         :param newName: The new name.
         :type newName: str
         """
         self._name = newName
-        import types
+        self._increment_version()
+        renamed = None
+        if self.target is not None:
+            renamed = self.__class__.renamed_class(self.target, newName)
+        if renamed is None:
+            import inspect
+            import types
+            from .artifact_ast_builder import ArtifactAstBuilder
+
+            new_module = types.ModuleType(self.generated_module_name)
+            if self.target is not None:
+                # decorators and helpers of the original module remain available
+                original = inspect.getmodule(self.target)
+                if original is not None:
+                    new_module.__dict__.update(
+                        (key, value)
+                        for key, value in vars(original).items()
+                        if not (key.startswith("__") and key.endswith("__"))
+                    )
+                    # relative imports resolve against the original package
+                    new_module.__package__ = original.__package__
+            exec(ArtifactAstBuilder(self).compile(), new_module.__dict__)
+            renamed = getattr(new_module, newName)
+        self._target = renamed
 
-        new_module = types.ModuleType(
-            self.module_name.split(".")[:-1],
-            ".",
-            self.__class__.camel_to_snake(newName),
+    @classmethod
+    def renamed_class(cls, target: Type, newName: str) -> Type:
+        """
+        Builds a copy of given class under a new name, without compiling anything.
+        Functions using the class cell (i.e. zero-argument `super()`) are rebound
+        to the new class. That's not possible for functions capturing the class
+        otherwise, for example within decorator wrappers.
+        :param target: The class to copy.
+        :type target: Type
+        :param newName: The new name.
+        :type newName: str
+        :return: The renamed class, or None if it cannot be built this way.
+        :rtype: Type
+        """
+        namespace = {
+            key: value
+            for key, value in target.__dict__.items()
+            if key not in ("__dict__", "__weakref__")
+        }
+        if any(cls._captures_class(value, target) for value in namespace.values()):
+            return None
+        slots = namespace.get("__slots__", ())
+        for slot in [slots] if isinstance(slots, str) else slots:
+            namespace.pop(slot, None)
+        namespace["__qualname__"] = (
+            target.__qualname__[: -len(target.__name__)] + newName
         )
-        #        print(self.content)
-        exec(self.content, new_module.__dict__)
-        self._target = getattr(new_module, newName)
+
+        result = type(target)(newName, target.__bases__, namespace)
+        for key, value in namespace.items():
+            rebound = cls._rebound(value, result)
+            if rebound is not value:
+                setattr(result, key, rebound)
+
+        return result
+
+    @classmethod
+    def _captures_class(cls, value, target: Type) -> bool:
+        """
+        Checks whether given class attribute captures the class other than through
+        its own class cell, which _rebound takes care of.
+        :param value: The class attribute.
+        :type value: Any
+        :param target: The class.
+        :type target: Type
+        :return: True in such case.
+        :rtype: bool
+        """
+        import types
+
+        if isinstance(value, (classmethod, staticmethod)):
+            return cls._captures_class(value.__func__, target)
+
+        if isinstance(value, property):
+            return any(
+                cls._captures_class(f, target)
+                for f in (value.fget, value.fset, value.fdel)
+                if f
+            )
+
+        if not isinstance(value, types.FunctionType):
+            return False
+
+        pending = [getattr(value, "__wrapped__", None)]
+        for name, cell in zip(value.__code__.co_freevars, value.__closure__ or ()):
+            if name != "__class__":
+                pending.append(cls._contents_of(cell))
+        seen = set()
+        while pending:
+            current = pending.pop()
+            if current is target:
+                return True
+            if not isinstance(current, types.FunctionType) or id(current) in seen:
+                continue
+            seen.add(id(current))
+            pending.append(getattr(current, "__wrapped__", None))
+            pending.extend(cls._contents_of(c) for c in current.__closure__ or ())
+
+        return False
 
     @classmethod
-    def class_imports_of(cls, target: Type) -> List[DependencyImport]:
+    def _contents_of(cls, cell):
+        """
+        Retrieves the contents of given closure cell.
+        :param cell: The cell.
+        :type cell: types.CellType
+        :return: Its contents, or None if it's empty.
+        :rtype: Any
+        """
+        try:
+            return cell.cell_contents
+        except ValueError:
+            return None
+
+    @classmethod
+    def _rebound(cls, value, newClass: Type):
+        """
+        Rebinds the class cell of given class attribute, if it uses it.
+        :param value: The class attribute.
+        :type value: Any
+        :param newClass: The class to bind to.
+        :type newClass: Type
+        :return: The rebound attribute, or the same one if it doesn't use the cell.
+        :rtype: Any
+        """
+        import types
+
+        if isinstance(value, types.FunctionType):
+            result = value
+            if "__class__" in value.__code__.co_freevars:
+                closure = tuple(
+                    types.CellType(newClass) if name == "__class__" else cell
+                    for name, cell in zip(
+                        value.__code__.co_freevars, value.__closure__
+                    )
+                )
+                result = types.FunctionType(
+                    value.__code__,
+                    value.__globals__,
+                    value.__name__,
+                    value.__defaults__,
+                    closure,
+                )
+                result.__kwdefaults__ = value.__kwdefaults__
+                result.__doc__ = value.__doc__
+                result.__annotations__ = value.__annotations__
+                result.__module__ = value.__module__
+                result.__dict__.update(value.__dict__)
+                result.__qualname__ = f"{newClass.__qualname__}.{value.__name__}"
+            return result
+
+        if isinstance(value, (classmethod, staticmethod)):
+            function = cls._rebound(value.__func__, newClass)
+            if function is value.__func__:
+                return value
+            return type(value)(function)
+
+        if isinstance(value, property):
+            accessors = (value.fget, value.fset, value.fdel)
+            rebound = tuple(cls._rebound(f, newClass) if f else f for f in accessors)
+            if rebound == accessors:
+                return value
+            return property(*rebound, value.__doc__)
+
+        return value
+
+    @classmethod
+    def class_imports_of(
+        cls, target: Type, sourceCache: SourceCache = None
+    ) -> List[DependencyImport]:
         """
         Retrieves the imports of the class.
         :param target: The target class.
         :type target: Type
+        :param sourceCache: The cache of already parsed modules, if any.
+        :type sourceCache: pythoneda.sandbox.poc.cac.SourceCache
         :return: The imports.
         :rtype: List[pythoneda.sandbox.poc.cac.DependencyImport]
         """
         import inspect
 
-        module = inspect.getmodule(target)
-        return PythonImportFind(inspect.getsource(module)).imports
+        if sourceCache is None:
+            sourceCache = SourceCache()
+
+        return sourceCache.imports_of(inspect.getmodule(target))
 
 
 # vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
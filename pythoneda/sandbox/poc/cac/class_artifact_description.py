@@ -0,0 +1,184 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/class_artifact_description.py
+
+This file declares the ClassArtifactDescription class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .python_import import PythonImport
+from pythoneda.shared import BaseObject
+from typing import List, Tuple
+
+
+class ClassArtifactDescription(BaseObject):
+    """
+    A picklable description of a ClassArtifact, without references to live classes.
+
+    Class name: ClassArtifactDescription
+
+    Responsibilities:
+        - Carry the extracted information of a class between processes.
+
+    Collaborators:
+        - pythoneda.sandbox.poc.cac.ClassArtifact
+    """
+
+    def __init__(
+        self,
+        moduleName: str,
+        name: str,
+        parents: List[str],
+        relativeFilePath: str,
+        source: str,
+        classImports: List[Tuple[str, str, int, str]],
+        methodNames: List[str],
+        content: str = None,
+    ):
+        """
+        Creates a new ClassArtifactDescription instance.
+        :param moduleName: The name of the module declaring the class.
+        :type moduleName: str
+        :param name: The class name.
+        :type name: str
+        :param parents: The qualified names of the parent classes.
+        :type parents: List[str]
+        :param relativeFilePath: The file the class is declared in.
+        :type relativeFilePath: str
+        :param source: The source code of the class.
+        :type source: str
+        :param classImports: The (package, asset, level, guard) imports of the class.
+        :type classImports: List[Tuple[str, str, int, str]]
+        :param methodNames: The names of the methods.
+        :type methodNames: List[str]
+        :param content: The rendered content, if any.
+        :type content: str
+        """
+        super().__init__()
+        self._module_name = moduleName
+        self._name = name
+        self._parents = parents
+        self._relative_file_path = relativeFilePath
+        self._source = source
+        self._class_imports = classImports
+        self._method_names = methodNames
+        self._content = content
+
+    @classmethod
+    def from_artifact(
+        cls, artifact, render: bool = True
+    ) -> "ClassArtifactDescription":
+        """
+        Describes given artifact.
+        :param artifact: The artifact.
+        :type artifact: pythoneda.sandbox.poc.cac.ClassArtifact
+        :param render: Whether to include the rendered content.
+        :type render: bool
+        :return: The description.
+        :rtype: pythoneda.sandbox.poc.cac.ClassArtifactDescription
+        """
+        return cls(
+            artifact.module_name,
+            artifact.name,
+            [f"{p.__module__}.{p.__qualname__}" for p in artifact.parents],
+            artifact.relative_file_path,
+            artifact.metadata.get("source", lambda: None),
+            [i.key for i in artifact.class_imports],
+            [m.method_def.name for m in artifact.methods],
+            artifact.content if render else None,
+        )
+
+    @property
+    def module_name(self) -> str:
+        """
+        Retrieves the name of the module declaring the class.
+        :return: Such name.
+        :rtype: str
+        """
+        return self._module_name
+
+    @property
+    def name(self) -> str:
+        """
+        Retrieves the class name.
+        :return: Such name.
+        :rtype: str
+        """
+        return self._name
+
+    @property
+    def parents(self) -> List[str]:
+        """
+        Retrieves the qualified names of the parent classes.
+        :return: Such names.
+        :rtype: List[str]
+        """
+        return self._parents
+
+    @property
+    def relative_file_path(self) -> str:
+        """
+        Retrieves the file the class is declared in.
+        :return: Such path.
+        :rtype: str
+        """
+        return self._relative_file_path
+
+    @property
+    def source(self) -> str:
+        """
+        Retrieves the source code of the class.
+        :return: Such code.
+        :rtype: str
+        """
+        return self._source
+
+    @property
+    def class_imports(self) -> List[PythonImport]:
+        """
+        Retrieves the imports of the class.
+        :return: New instances for such imports.
+        :rtype: List[pythoneda.sandbox.poc.cac.PythonImport]
+        """
+        return [PythonImport(*spec) for spec in self._class_imports]
+
+    @property
+    def method_names(self) -> List[str]:
+        """
+        Retrieves the names of the methods.
+        :return: Such names.
+        :rtype: List[str]
+        """
+        return self._method_names
+
+    @property
+    def content(self) -> str:
+        """
+        Retrieves the rendered content, if it was requested.
+        :return: Such content.
+        :rtype: str
+        """
+        return self._content
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,179 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/compiled_template_group.py
+
+This file declares the CompiledTemplateGroup class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythoneda.shared import BaseObject
+from .template_writer import TemplateWriter
+from typing import Any, Callable, Dict, List, TextIO
+
+
+class CompiledTemplateGroup(BaseObject):
+    """
+    A template group compiled into plain Python functions.
+
+    Class name: CompiledTemplateGroup
+
+    Responsibilities:
+        - Keep the compiled function of each template, and the generated source.
+        - Render a template, either to a string or to a stream.
+
+    Collaborators:
+        - pythoneda.sandbox.poc.cac.TemplateCompiler
+        - pythoneda.sandbox.poc.cac.TemplateWriter
+    """
+
+    def __init__(
+        self,
+        name: str,
+        functions: Dict[str, Callable[..., None]],
+        arguments: Dict[str, List[str]],
+        source: str,
+        superGroup: "CompiledTemplateGroup" = None,
+    ):
+        """
+        Creates a new CompiledTemplateGroup instance.
+        :param name: The group name.
+        :type name: str
+        :param functions: The compiled templates, by name. Each one takes the
+        writer, and the template attributes as keyword arguments (see variable_name).
+        :type functions: Dict[str, Callable[..., None]]
+        :param arguments: The formal arguments of each template.
+        :type arguments: Dict[str, List[str]]
+        :param source: The generated Python source.
+        :type source: str
+        :param superGroup: The group missing templates were taken from, if any.
+        :type superGroup: pythoneda.sandbox.poc.cac.CompiledTemplateGroup
+        """
+        super().__init__()
+        self._name = name
+        self._functions = functions
+        self._arguments = arguments
+        self._source = source
+        self._super_group = superGroup
+
+    @property
+    def name(self) -> str:
+        """
+        Retrieves the group name.
+        :return: Such name.
+        :rtype: str
+        """
+        return self._name
+
+    @property
+    def functions(self) -> Dict[str, Callable[..., None]]:
+        """
+        Retrieves the compiled templates, including the inherited ones.
+        :return: Such functions, by template name.
+        :rtype: Dict[str, Callable[..., None]]
+        """
+        return self._functions
+
+    @property
+    def arguments(self) -> Dict[str, List[str]]:
+        """
+        Retrieves the formal arguments of each template, including the inherited ones.
+        :return: Such arguments, by template name.
+        :rtype: Dict[str, List[str]]
+        """
+        return self._arguments
+
+    @property
+    def source(self) -> str:
+        """
+        Retrieves the generated Python source.
+        :return: Such source.
+        :rtype: str
+        """
+        return self._source
+
+    @property
+    def super_group(self) -> "CompiledTemplateGroup":
+        """
+        Retrieves the group missing templates were taken from.
+        :return: Such group, or None.
+        :rtype: pythoneda.sandbox.poc.cac.CompiledTemplateGroup
+        """
+        return self._super_group
+
+    @classmethod
+    def variable_name(cls, attribute: str) -> str:
+        """
+        Builds the name of the parameter receiving an attribute in the compiled
+        templates, so that it doesn't clash with Python keywords or builtins.
+        :param attribute: The attribute name.
+        :type attribute: str
+        :return: The parameter name.
+        :rtype: str
+        """
+        return "a_" + attribute.replace("/", "__")
+
+    def render(self, templateName: str = "root", **attributes: Any) -> str:
+        """
+        Renders a template.
+        :param templateName: The template name.
+        :type templateName: str
+        :param attributes: The template attributes.
+        :type attributes: Dict[str, Any]
+        :return: The rendered text.
+        :rtype: str
+        """
+        writer = TemplateWriter()
+        self.write_to(writer, templateName, **attributes)
+
+        return str(writer)
+
+    def render_to(self, stream: TextIO, templateName: str = "root", **attributes):
+        """
+        Renders a template to given stream, as it goes.
+        :param stream: The stream to write to.
+        :type stream: TextIO
+        :param templateName: The template name.
+        :type templateName: str
+        :param attributes: The template attributes.
+        :type attributes: Dict[str, Any]
+        """
+        self.write_to(TemplateWriter(stream), templateName, **attributes)
+
+    def write_to(self, writer: TemplateWriter, templateName: str, **attributes):
+        """
+        Renders a template to given writer.
+        :param writer: The writer.
+        :type writer: pythoneda.sandbox.poc.cac.TemplateWriter
+        :param templateName: The template name.
+        :type templateName: str
+        :param attributes: The template attributes.
+        :type attributes: Dict[str, Any]
+        """
+        function = self._functions.get(templateName, None)
+        if function is None:
+            raise KeyError(f"No template {templateName} in group {self.name}")
+        cls = self.__class__
+        function(writer, **{cls.variable_name(k): v for k, v in attributes.items()})
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
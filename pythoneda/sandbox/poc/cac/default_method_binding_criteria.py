@@ -22,6 +22,7 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 from .method_binding_criteria import MethodBindingCriteria
 from .method_def import MethodDef
 from .python_method import PythonMethod
+from typing import Hashable
 
 
 class DefaultMethodBindingCriteria(MethodBindingCriteria):
@@ -53,6 +54,25 @@ class DefaultMethodBindingCriteria(MethodBindingCriteria):
         """
         return method.method_def == methodDef
 
+    def index_key(self) -> Hashable:
+        """
+        Retrieves the key under which the index built with method_key is kept.
+        :return: The class, since the keys don't depend on the instance.
+        :rtype: Hashable
+        """
+        return self.__class__
+
+    def definition_key(self, methodDef: MethodDef) -> Hashable:
+        """
+        Retrieves the key under which the implementations of given definition
+        are indexed.
+        :param methodDef: The method definition.
+        :type methodDef: pythoneda.sandbox.poc.cac.MethodDef
+        :return: Its name and return type, the attributes compared by is_satisfied_by.
+        :rtype: Hashable
+        """
+        return (methodDef.name, methodDef.return_type)
+
 
 # vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
 # Local Variables:
@@ -20,8 +20,11 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 from .artifact_metadata import ArtifactMetadata
+from .class_artifact_description import ClassArtifactDescription
+from .package_class_index import PackageClassIndex
+from .parallel_artifact_extraction import ParallelArtifactExtraction
 from pythoneda.shared import BaseObject
-from typing import Tuple
+from typing import List, Set, Tuple
 
 
 class DomainArtifact(BaseObject):
@@ -36,6 +39,7 @@ class DomainArtifact(BaseObject):
     Collaborators:
         - pythoneda.sandbox.poc.cac.ArtifactMetadata
         - pythoneda.sandbox.poc.cac.ClassArtifact
+        - pythoneda.sandbox.poc.cac.PackageClassIndex
     """
 
     def __init__(self, name: str, metadata: ArtifactMetadata = None):
@@ -49,6 +53,7 @@ class DomainArtifact(BaseObject):
         super().__init__()
         self._name = name
         self._metadata = metadata
+        self._class_index = None
 
     @property
     def name(self) -> str:
@@ -163,39 +168,58 @@ class DomainArtifact(BaseObject):
             self.github_organization, self.github_name, newName
         )
 
-    async def find_classes(self) -> Tuple[str, str]:
+    @property
+    def class_index(self) -> PackageClassIndex:
+        """
+        Retrieves the index of the classes in the domain package.
+        It's persisted to the `class_index_file` in the metadata, or else to
+        PackageClassIndex.default_index_file, so later processes parse only the
+        modules that changed. An empty `class_index_file` keeps it in memory.
+        :return: Such index.
+        :rtype: pythoneda.sandbox.poc.cac.PackageClassIndex
+        """
+        if self._class_index is None:
+            self._class_index = PackageClassIndex(
+                self.metadata.get(
+                    "class_index_file",
+                    lambda: PackageClassIndex.default_index_file(
+                        self.metadata.package_name
+                    ),
+                )
+            )
+
+        return self._class_index
+
+    async def find_classes(self) -> Set[Tuple[str, str]]:
         """
         Recursively enumerates all classes defined in the domain package.
-        :return: Such classes.
-        :rtype: Tuple[str, str]
-        """
-        import pkgutil
-        import inspect
-        import importlib
-
-        result = set()
-
-        def inspect_module(module):
-            for name, obj in inspect.getmembers(module, inspect.isclass):
-                # Ensure the class is defined in this module (compare __module__ attribute)
-                if obj.__module__ == module.__name__:
-                    result.add((module.__name__, name))
-
-            # Recursively search for submodules
-            if hasattr(module, "__path__"):  # Check if module is a package
-                for _, submod_name, _ in pkgutil.walk_packages(module.__path__):
-                    try:
-                        submod = importlib.import_module(
-                            f"{module.__name__}.{submod_name}"
-                        )
-                        inspect_module(submod)
-                    except ImportError as e:
-                        print(f"Error importing module: {e}")
-
-        package = importlib.import_module(self.metadata.package)
-        inspect_module(self.metadata.package)
-
-        return result
+        Modules are parsed, not imported, and only when they changed since the
+        last scan.
+        :return: The (module name, class name) tuples.
+        :rtype: Set[Tuple[str, str]]
+        """
+        return self.class_index.classes_of(self.metadata.package_name)
+
+    async def extract_classes(
+        self, maxWorkers: int = None, render: bool = True
+    ) -> List[ClassArtifactDescription]:
+        """
+        Extracts all classes defined in the domain package, spreading its modules
+        across worker processes.
+        :param maxWorkers: The maximum number of worker processes. Defaults to the number of CPUs.
+        :type maxWorkers: int
+        :param render: Whether to render the content of each class.
+        :type render: bool
+        :return: The descriptions of such classes.
+        :rtype: List[pythoneda.sandbox.poc.cac.ClassArtifactDescription]
+        """
+        import asyncio
+
+        return await asyncio.get_running_loop().run_in_executor(
+            None,
+            ParallelArtifactExtraction(maxWorkers, render).extract,
+            self.metadata.package_name,
+        )
 
 
 # vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
@@ -19,9 +19,11 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+from .dependency_import import DependencyImport
 from .python_method import PythonMethod
 from .python_method_def import PythonMethodDef
 from pythoneda.shared import primary_key_attribute
+from typing import List
 
 
 class EmptyBodyPythonMethod(PythonMethod):
@@ -55,6 +57,15 @@ class EmptyBodyPythonMethod(PythonMethod):
         """
         return "pass"
 
+    @property
+    def imports(self) -> List[DependencyImport]:
+        """
+        Retrieves the dependencies of the method.
+        :return: The dependencies.
+        :rtype: List[pythoneda.sandbox.poc.cac.DependencyImport]
+        """
+        return []
+
 
 # vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
 # Local Variables:
@@ -23,6 +23,7 @@ from .empty_body_python_method import EmptyBodyPythonMethod
 from .method_binding_criteria import MethodBindingCriteria
 from .python_method_def import PythonMethodDef
 from .python_method import PythonMethod
+from typing import Hashable
 
 
 class EmptyBodyPythonMethodBindingCriteria(MethodBindingCriteria):
@@ -56,6 +57,35 @@ class EmptyBodyPythonMethodBindingCriteria(MethodBindingCriteria):
         """
         return isinstance(method, EmptyBodyPythonMethod)
 
+    def index_key(self) -> Hashable:
+        """
+        Retrieves the key under which the index built with method_key is kept.
+        :return: The class, since the keys don't depend on the instance.
+        :rtype: Hashable
+        """
+        return self.__class__
+
+    def definition_key(self, methodDef: PythonMethodDef) -> Hashable:
+        """
+        Retrieves the key under which the implementations of given definition
+        are indexed.
+        :param methodDef: The method definition.
+        :type methodDef: pythoneda.sandbox.poc.cac.PythonMethodDef
+        :return: The same key for any definition.
+        :rtype: Hashable
+        """
+        return True
+
+    def method_key(self, method: PythonMethod) -> Hashable:
+        """
+        Retrieves the key under which given implementation is indexed.
+        :param method: The method implementation.
+        :type method: pythoneda.sandbox.poc.cac.PythonMethod
+        :return: Whether it's an empty-body implementation.
+        :rtype: Hashable
+        """
+        return isinstance(method, EmptyBodyPythonMethod)
+
 
 # vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
 # Local Variables:
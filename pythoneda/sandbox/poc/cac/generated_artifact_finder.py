@@ -0,0 +1,367 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/generated_artifact_finder.py
+
+This file declares the GeneratedArtifactFinder class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import ast
+import importlib.abc
+import importlib.util
+from .instrumentation import Instrumentation
+from pythoneda.shared import BaseObject
+import sys
+from types import CodeType, ModuleType
+from typing import Dict, List, Union
+
+
+class GeneratedArtifactFinder(
+    BaseObject, importlib.abc.MetaPathFinder, importlib.abc.Loader
+):
+    """
+    Import hook serving generated modules from memory.
+
+    Once installed in `sys.meta_path`, the modules added to it can be imported
+    like any other, without writing them to disk. Their code objects are
+    compiled on first import, and reused when the modules are reloaded, until
+    they are replaced.
+
+    Class name: GeneratedArtifactFinder
+
+    Responsibilities:
+        - Keep the source, or syntax tree, of generated modules, by module name.
+        - Find and load such modules, and the packages containing them.
+        - Compile each module only once.
+
+    Collaborators:
+        - pythoneda.sandbox.poc.cac.ArtifactAstBuilder
+        - pythoneda.sandbox.poc.cac.ClassArtifact
+    """
+
+    def __init__(self):
+        """
+        Creates a new GeneratedArtifactFinder instance.
+        """
+        super().__init__()
+        self._modules: Dict[str, Union[str, ast.Module]] = {}
+        self._packages: Dict[str, bool] = {}
+        self._codes: Dict[str, CodeType] = {}
+        # the number of generated modules within each package
+        self._parent_packages: Dict[str, int] = {}
+        self._real_packages: Dict[str, bool] = {}
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def module_names(self) -> List[str]:
+        """
+        Retrieves the names of the modules served.
+        :return: Such names.
+        :rtype: List[str]
+        """
+        return list(self._modules)
+
+    def add_source(self, moduleName: str, source: str, isPackage: bool = False):
+        """
+        Adds a module, or replaces it, from its source code.
+        :param moduleName: The module name.
+        :type moduleName: str
+        :param source: The source code.
+        :type source: str
+        :param isPackage: Whether the module is a package.
+        :type isPackage: bool
+        """
+        self._add(moduleName, source, isPackage)
+
+    def add_tree(self, moduleName: str, tree: ast.Module, isPackage: bool = False):
+        """
+        Adds a module, or replaces it, from its syntax tree.
+        :param moduleName: The module name.
+        :type moduleName: str
+        :param tree: The syntax tree, with locations.
+        :type tree: ast.Module
+        :param isPackage: Whether the module is a package.
+        :type isPackage: bool
+        """
+        self._add(moduleName, tree, isPackage)
+
+    def add_artifact(self, artifact, moduleName: str = None) -> str:
+        """
+        Adds the module generated for given artifact, or replaces it. If it's not
+        added to the package of the class, its relative imports are made absolute.
+        :param artifact: The artifact.
+        :type artifact: pythoneda.sandbox.poc.cac.ClassArtifact
+        :param moduleName: The module name. Defaults to the module generated for
+        the class.
+        :type moduleName: str
+        :return: The module name.
+        :rtype: str
+        """
+        from .artifact_ast_builder import ArtifactAstBuilder
+
+        result = moduleName if moduleName else artifact.generated_module_name
+        builder = ArtifactAstBuilder(artifact, packageName=result.rpartition(".")[0])
+        self.add_tree(result, builder.module())
+
+        return result
+
+    def _add(self, moduleName: str, module: Union[str, ast.Module], isPackage: bool):
+        """
+        Adds a module, discarding its compiled code, if any.
+        :param moduleName: The module name.
+        :type moduleName: str
+        :param module: The source code or the syntax tree.
+        :type module: Union[str, ast.Module]
+        :param isPackage: Whether the module is a package.
+        :type isPackage: bool
+        """
+        if moduleName not in self._modules:
+            for package in self.__class__._parents_of(moduleName):
+                self._parent_packages[package] = (
+                    self._parent_packages.get(package, 0) + 1
+                )
+        self._modules[moduleName] = module
+        self._packages[moduleName] = isPackage
+        self._codes.pop(moduleName, None)
+
+    def remove(self, moduleName: str):
+        """
+        Removes a module. Already-imported modules are not affected.
+        :param moduleName: The module name.
+        :type moduleName: str
+        """
+        if moduleName in self._modules:
+            for package in self.__class__._parents_of(moduleName):
+                count = self._parent_packages[package] - 1
+                if count:
+                    self._parent_packages[package] = count
+                else:
+                    del self._parent_packages[package]
+        self._modules.pop(moduleName, None)
+        self._packages.pop(moduleName, None)
+        self._codes.pop(moduleName, None)
+
+    def install(self):
+        """
+        Installs the finder in `sys.meta_path`, ahead of the default ones, so
+        generated modules take precedence over the ones on disk.
+        """
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        """
+        Removes the finder from `sys.meta_path`.
+        """
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    @classmethod
+    def _parents_of(cls, moduleName: str) -> List[str]:
+        """
+        Retrieves the packages containing given module, i.e. `a` and `a.b` for `a.b.c`.
+        :param moduleName: The module name.
+        :type moduleName: str
+        :return: Such packages.
+        :rtype: List[str]
+        """
+        parts = moduleName.split(".")
+        return [".".join(parts[:i]) for i in range(1, len(parts))]
+
+    def _is_parent_package(self, name: str) -> bool:
+        """
+        Checks whether given name is the package of some generated module.
+        :param name: The name.
+        :type name: str
+        :return: True in such case.
+        :rtype: bool
+        """
+        return name in self._parent_packages
+
+    def _is_real_package(self, name: str, path, target: ModuleType) -> bool:
+        """
+        Checks whether given package can be imported by other finders. The answer
+        is cached until `invalidate_caches` is called.
+        :param name: The package name.
+        :type name: str
+        :param path: The search path of the parent package, if any.
+        :type path: List[str]
+        :param target: The module being reloaded, if any.
+        :type target: types.ModuleType
+        :return: True in such case.
+        :rtype: bool
+        """
+        result = self._real_packages.get(name, None)
+        if result is None:
+            result = any(
+                finder.find_spec(name, path, target) is not None
+                for finder in sys.meta_path
+                if finder is not self and hasattr(finder, "find_spec")
+            )
+            self._real_packages[name] = result
+
+        return result
+
+    def _is_synthetic_package(self, name: str) -> bool:
+        """
+        Checks whether given name is provided as an empty package: it contains
+        generated modules, but it's not generated itself.
+        :param name: The name.
+        :type name: str
+        :return: True in such case.
+        :rtype: bool
+        """
+        return name not in self._modules and self._is_parent_package(name)
+
+    def invalidate_caches(self):
+        """
+        Forgets which packages can be imported by other finders.
+        """
+        self._real_packages.clear()
+
+    def find_spec(self, fullname: str, path=None, target: ModuleType = None):
+        """
+        Finds the spec of generated modules. Packages containing generated modules
+        are provided as empty packages, unless they can be imported otherwise.
+        Such packages are worked out from the generated module names on each
+        lookup, so they're gone once their modules are removed.
+        :param fullname: The module name.
+        :type fullname: str
+        :param path: The search path of the parent package, if any.
+        :type path: List[str]
+        :param target: The module being reloaded, if any.
+        :type target: types.ModuleType
+        :return: The spec, or None if the module is not generated.
+        :rtype: importlib.machinery.ModuleSpec
+        """
+        result = None
+        if fullname in self._modules:
+            result = importlib.util.spec_from_loader(
+                fullname,
+                self,
+                origin=f"<generated {fullname}>",
+                is_package=self._packages[fullname],
+            )
+        elif self._is_parent_package(fullname) and not self._is_real_package(
+            fullname, path, target
+        ):
+            result = importlib.util.spec_from_loader(
+                fullname, self, origin=f"<generated {fullname}>", is_package=True
+            )
+
+        return result
+
+    def create_module(self, spec) -> ModuleType:
+        """
+        Uses the default module creation.
+        :param spec: The module spec.
+        :type spec: importlib.machinery.ModuleSpec
+        :return: None, to use the default.
+        :rtype: types.ModuleType
+        """
+        return None
+
+    def exec_module(self, module: ModuleType):
+        """
+        Executes the code of a generated module.
+        :param module: The module.
+        :type module: types.ModuleType
+        """
+        if not self._is_synthetic_package(module.__name__):
+            exec(self.get_code(module.__name__), module.__dict__)
+
+    def get_code(self, fullname: str) -> CodeType:
+        """
+        Retrieves the code of a generated module, compiling it on first use.
+        :param fullname: The module name.
+        :type fullname: str
+        :return: Such code.
+        :rtype: types.CodeType
+        """
+        if self._is_synthetic_package(fullname):
+            return compile("", f"<generated {fullname}>", "exec")
+
+        result = self._codes.get(fullname, None)
+        if result is None:
+            self._misses += 1
+            with Instrumentation.timed("import.compile"):
+                result = compile(
+                    self._modules[fullname], f"<generated {fullname}>", "exec"
+                )
+            self._codes[fullname] = result
+        else:
+            self._hits += 1
+
+        return result
+
+    def get_source(self, fullname: str) -> str:
+        """
+        Retrieves the source code of a generated module. Modules added as syntax
+        trees are unparsed, so their line numbers don't match their code.
+        :param fullname: The module name.
+        :type fullname: str
+        :return: Such source code.
+        :rtype: str
+        """
+        if self._is_synthetic_package(fullname):
+            return ""
+
+        result = self._modules[fullname]
+        if isinstance(result, ast.Module):
+            result = ast.unparse(result)
+
+        return result
+
+    def is_package(self, fullname: str) -> bool:
+        """
+        Checks whether a generated module is a package. Packages containing
+        generated modules are always packages.
+        :param fullname: The module name.
+        :type fullname: str
+        :return: True in such case.
+        :rtype: bool
+        """
+        if fullname in self._packages:
+            return self._packages[fullname]
+
+        return self._is_parent_package(fullname)
+
+    def hits(self) -> int:
+        """
+        Retrieves how many times an already-compiled module was reused.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._hits
+
+    def misses(self) -> int:
+        """
+        Retrieves how many times a module had to be compiled.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._misses
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
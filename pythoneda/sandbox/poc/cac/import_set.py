@@ -0,0 +1,131 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/import_set.py
+
+This file declares the ImportSet class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .dependency_import import DependencyImport
+from .python_import import PythonImport
+from .python_import_pool import PythonImportPool
+from pythoneda.shared import BaseObject
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class ImportSet(BaseObject):
+    """
+    Ordered set of imports, without duplicates.
+
+    Class name: ImportSet
+
+    Responsibilities:
+        - Keep each distinct (package, asset, level, guard) only once, in first-seen
+          order.
+        - Hold interned imports, shared with other sets.
+
+    Collaborators:
+        - pythoneda.sandbox.poc.cac.PythonImport
+        - pythoneda.sandbox.poc.cac.PythonImportPool
+    """
+
+    def __init__(self, imports: Iterable[DependencyImport] = None):
+        """
+        Creates a new ImportSet instance.
+        :param imports: The initial imports, if any.
+        :type imports: Iterable[pythoneda.sandbox.poc.cac.DependencyImport]
+        """
+        super().__init__()
+        self._imports: Dict[Tuple[str, str, int, str], PythonImport] = {}
+        if imports:
+            self.update(imports)
+
+    @classmethod
+    def key_of(cls, dependency: DependencyImport) -> Tuple[str, str, int, str]:
+        """
+        Retrieves the key of given import.
+        :param dependency: The import.
+        :type dependency: pythoneda.sandbox.poc.cac.DependencyImport
+        :return: Its (package, asset, level, guard) tuple.
+        :rtype: Tuple[str, str, int, str]
+        """
+        if isinstance(dependency, PythonImport):
+            return dependency.key
+
+        return (dependency.package, None, 0, None)
+
+    def add(self, dependency: DependencyImport):
+        """
+        Adds an import, unless an equivalent one is already there.
+        :param dependency: The import.
+        :type dependency: pythoneda.sandbox.poc.cac.DependencyImport
+        """
+        key = self.__class__.key_of(dependency)
+        if key not in self._imports:
+            self._imports[key] = PythonImportPool.intern(*key)
+
+    def update(self, imports: Iterable[DependencyImport]):
+        """
+        Adds several imports.
+        :param imports: The imports.
+        :type imports: Iterable[pythoneda.sandbox.poc.cac.DependencyImport]
+        """
+        for dependency in imports:
+            self.add(dependency)
+
+    def to_list(self) -> List[PythonImport]:
+        """
+        Retrieves the imports, in first-seen order.
+        :return: Such imports.
+        :rtype: List[pythoneda.sandbox.poc.cac.PythonImport]
+        """
+        return list(self._imports.values())
+
+    def __contains__(self, dependency: DependencyImport) -> bool:
+        """
+        Checks whether an equivalent import is already in the set.
+        :param dependency: The import.
+        :type dependency: pythoneda.sandbox.poc.cac.DependencyImport
+        :return: True in such case.
+        :rtype: bool
+        """
+        return self.__class__.key_of(dependency) in self._imports
+
+    def __iter__(self) -> Iterator[PythonImport]:
+        """
+        Iterates over the imports, in first-seen order.
+        :return: An iterator.
+        :rtype: Iterator[pythoneda.sandbox.poc.cac.PythonImport]
+        """
+        return iter(self._imports.values())
+
+    def __len__(self) -> int:
+        """
+        Retrieves the number of distinct imports.
+        :return: Such number.
+        :rtype: int
+        """
+        return len(self._imports)
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
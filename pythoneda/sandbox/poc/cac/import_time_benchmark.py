@@ -0,0 +1,248 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/import_time_benchmark.py
+
+This file declares the ImportTimeBenchmark class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+from pythoneda.shared import BaseObject
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+
+class ImportTimeBenchmark(BaseObject):
+    """
+    Measures the cold-start cost of an import statement, using `python -X importtime`.
+
+    Class name: ImportTimeBenchmark
+
+    Responsibilities:
+        - Run an import statement in a fresh interpreter, several times.
+        - Tell apart the modules it imports from the ones the interpreter loads anyway.
+        - Check the cost stays within a budget, and no forbidden module gets imported.
+
+    Collaborators:
+        - None
+    """
+
+    def __init__(
+        self,
+        statement: str = "import pythoneda.sandbox.poc.cac",
+        repeat: int = 3,
+        budgetMs: float = None,
+        forbidden: List[str] = None,
+    ):
+        """
+        Creates a new ImportTimeBenchmark instance.
+        :param statement: The import statement to measure.
+        :type statement: str
+        :param repeat: How many times the statement runs. The best time is reported.
+        :type repeat: int
+        :param budgetMs: The maximum cumulative import time, in milliseconds, if any.
+        :type budgetMs: float
+        :param forbidden: The modules the statement must not import.
+        :type forbidden: List[str]
+        """
+        super().__init__()
+        self._statement = statement
+        self._repeat = repeat
+        self._budget_ms = budgetMs
+        self._forbidden = (
+            forbidden
+            if forbidden is not None
+            else ["stringtemplate3", "pythoneda.shared.git"]
+        )
+
+    @property
+    def statement(self) -> str:
+        """
+        Retrieves the import statement to measure.
+        :return: Such statement.
+        :rtype: str
+        """
+        return self._statement
+
+    @property
+    def repeat(self) -> int:
+        """
+        Retrieves how many times the statement runs.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._repeat
+
+    @property
+    def budget_ms(self) -> float:
+        """
+        Retrieves the maximum cumulative import time, in milliseconds.
+        :return: Such time, or None if there's no budget.
+        :rtype: float
+        """
+        return self._budget_ms
+
+    @property
+    def forbidden(self) -> List[str]:
+        """
+        Retrieves the modules the statement must not import.
+        :return: Such module names.
+        :rtype: List[str]
+        """
+        return self._forbidden
+
+    @classmethod
+    def parse(cls, output: str) -> List[Tuple[str, int, int, int]]:
+        """
+        Parses the output of `python -X importtime`.
+        :param output: The output (written by Python to stderr).
+        :type output: str
+        :return: The (module, depth, self, cumulative) tuples, in microseconds.
+        :rtype: List[Tuple[str, int, int, int]]
+        """
+        result = []
+        for line in output.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            fields = line[len("import time:") :].split("|")
+            if len(fields) != 3 or not fields[0].strip().isdigit():
+                continue
+            name = fields[2][1:]
+            module = name.lstrip(" ")
+            result.append(
+                (
+                    module,
+                    (len(name) - len(module)) // 2,
+                    int(fields[0]),
+                    int(fields[1]),
+                )
+            )
+
+        return result
+
+    @classmethod
+    def importtime_of(cls, statement: str) -> List[Tuple[str, int, int, int]]:
+        """
+        Runs given statement in a fresh interpreter, sharing our module search path.
+        :param statement: The statement.
+        :type statement: str
+        :return: The (module, depth, self, cumulative) tuples, in microseconds.
+        :rtype: List[Tuple[str, int, int, int]]
+        """
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(p for p in sys.path if p)
+        env.pop("POCCAC_INSTRUMENTATION", None)
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", statement],
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+        if process.returncode != 0:
+            raise RuntimeError(
+                f"{statement!r} failed ({process.returncode}): {process.stderr}"
+            )
+
+        return cls.parse(process.stderr)
+
+    def run(self) -> Dict:
+        """
+        Measures the statement, discounting the modules loaded by an empty one.
+        :return: The best cumulative time, in milliseconds, the imported modules,
+        the forbidden ones among them, and whether the budget was met.
+        :rtype: Dict
+        """
+        baseline = {entry[0] for entry in self.__class__.importtime_of("pass")}
+        timings = []
+        modules = []
+        for _ in range(self.repeat):
+            entries = [
+                entry
+                for entry in self.__class__.importtime_of(self.statement)
+                if entry[0] not in baseline
+            ]
+            timings.append(
+                sum(cumulative for _, depth, _, cumulative in entries if depth == 0)
+            )
+            modules = [entry[0] for entry in entries]
+        best_ms = min(timings) / 1000
+        forbidden = sorted(
+            {
+                module
+                for module in modules
+                for name in self.forbidden
+                if module == name or module.startswith(f"{name}.")
+            }
+        )
+
+        return {
+            "statement": self.statement,
+            "repeat": self.repeat,
+            "best_ms": best_ms,
+            "modules": modules,
+            "forbidden": forbidden,
+            "budget_ms": self.budget_ms,
+            "within_budget": not forbidden
+            and (self.budget_ms is None or best_ms <= self.budget_ms),
+        }
+
+    @classmethod
+    def main(cls, args: List[str] = None) -> int:
+        """
+        Runs the benchmark from the command line, printing the results as JSON.
+        :param args: The command-line arguments.
+        :type args: List[str]
+        :return: 0 if the import stays within budget; 1 otherwise.
+        :rtype: int
+        """
+        import argparse
+        import json
+
+        parser = argparse.ArgumentParser(description=cls.__doc__.strip().split("\n")[0])
+        parser.add_argument("--statement", default="import pythoneda.sandbox.poc.cac")
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument(
+            "--budget-ms", type=float, help="The maximum cumulative import time"
+        )
+        parser.add_argument(
+            "--forbid",
+            nargs="*",
+            default=None,
+            help="The modules the statement must not import",
+        )
+        options = parser.parse_args(args)
+
+        report = cls(
+            options.statement, options.repeat, options.budget_ms, options.forbid
+        ).run()
+        print(json.dumps(report, indent=2))
+
+        return 0 if report["within_budget"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(ImportTimeBenchmark.main())
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
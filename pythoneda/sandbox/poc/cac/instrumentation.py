@@ -0,0 +1,200 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/instrumentation.py
+
+This file declares the Instrumentation class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import contextlib
+import os
+from pythoneda.shared import BaseObject
+import time
+from typing import ContextManager, Dict, List
+
+
+class Instrumentation(BaseObject):
+    """
+    Process-wide counters and timers around the hot paths.
+
+    It's disabled by default, unless the POCCAC_INSTRUMENTATION environment variable
+    is set. While disabled, `count` returns right away and `timed` hands out a shared
+    no-op context manager.
+
+    Class name: Instrumentation
+
+    Responsibilities:
+        - Count events and accumulate the time spent in named sections, without
+          counting nested sections twice.
+        - Summarize them for a run.
+
+    Collaborators:
+        - None
+    """
+
+    enabled: bool = os.environ.get("POCCAC_INSTRUMENTATION", "") not in ("", "0")
+
+    _counters: Dict[str, int] = {}
+
+    _timers: Dict[str, List[float]] = {}
+
+    # the timings in progress, as [name, seconds spent in nested timings]
+    _active: List[List] = []
+
+    _disabled = contextlib.nullcontext()
+
+    def __init__(self):
+        """
+        Creates a new Instrumentation instance.
+        """
+        super().__init__()
+
+    @classmethod
+    def enable(cls):
+        """
+        Starts collecting counters and timers.
+        """
+        cls.enabled = True
+
+    @classmethod
+    def disable(cls):
+        """
+        Stops collecting counters and timers. Collected values are kept.
+        """
+        cls.enabled = False
+
+    @classmethod
+    def reset(cls):
+        """
+        Discards all collected values.
+        """
+        cls._counters.clear()
+        cls._timers.clear()
+        cls._active.clear()
+
+    @classmethod
+    def count(cls, name: str, amount: int = 1):
+        """
+        Increments a counter, if enabled.
+        :param name: The counter name.
+        :type name: str
+        :param amount: The increment.
+        :type amount: int
+        """
+        if cls.enabled:
+            cls._counters[name] = cls._counters.get(name, 0) + amount
+
+    @classmethod
+    def timed(cls, name: str) -> ContextManager:
+        """
+        Retrieves a context manager timing the code within, if enabled.
+        :param name: The timer name.
+        :type name: str
+        :return: Such context manager.
+        :rtype: ContextManager
+        """
+        if not cls.enabled:
+            return cls._disabled
+
+        return cls._timing(name)
+
+    @classmethod
+    @contextlib.contextmanager
+    def _timing(cls, name: str):
+        """
+        Times the code within. Its total time is accumulated only if it's not nested
+        in another timing with the same name, and its self time excludes the time
+        spent in nested timings.
+        :param name: The timer name.
+        :type name: str
+        """
+        nested = any(frame[0] == name for frame in cls._active)
+        frame = [name, 0.0]
+        cls._active.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if cls._active and cls._active[-1] is frame:
+                cls._active.pop()
+            if cls._active:
+                cls._active[-1][1] += elapsed
+            timer = cls._timers.get(name, None)
+            if timer is None:
+                timer = [0, 0.0, 0.0]
+                cls._timers[name] = timer
+            timer[0] += 1
+            if not nested:
+                timer[1] += elapsed
+            timer[2] += elapsed - frame[1]
+
+    @classmethod
+    @contextlib.contextmanager
+    def run(cls):
+        """
+        Collects counters and timers for the code within, starting from scratch.
+        The summary remains available afterwards.
+        """
+        previous = cls.enabled
+        cls.reset()
+        cls.enable()
+        try:
+            yield cls
+        finally:
+            cls.enabled = previous
+
+    @classmethod
+    def summary(cls) -> Dict:
+        """
+        Summarizes the collected values.
+        :return: The counters, and the calls, total, self and mean seconds of each
+        timer.
+        :rtype: Dict
+        """
+        return {
+            "counters": dict(cls._counters),
+            "timers": {
+                name: {
+                    "calls": calls,
+                    "total": total,
+                    "self": own,
+                    "mean": total / calls,
+                }
+                for name, (calls, total, own) in cls._timers.items()
+            },
+        }
+
+    @classmethod
+    def to_json(cls) -> str:
+        """
+        Serializes the summary.
+        :return: The JSON text.
+        :rtype: str
+        """
+        import json
+
+        return json.dumps(cls.summary(), indent=2, sort_keys=True)
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -20,6 +20,7 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 from pythoneda.shared import BaseObject
+from typing import Hashable
 
 
 class MethodBindingCriteria(BaseObject):
@@ -41,6 +42,40 @@ class MethodBindingCriteria(BaseObject):
         """
         super().__init__()
 
+    def definition_key(self, methodDef) -> Hashable:
+        """
+        Retrieves the key under which the implementations of given definition
+        are indexed. Criteria returning None are resolved by checking every
+        implementation. Otherwise, only the implementations whose method_key
+        matches are checked, so both keys must be consistent with is_satisfied_by.
+        :param methodDef: The method definition.
+        :type methodDef: pythoneda.sandbox.poc.cac.MethodDef
+        :return: Such key, or None if the criteria cannot be indexed.
+        :rtype: Hashable
+        """
+        return None
+
+    def index_key(self) -> Hashable:
+        """
+        Retrieves the key under which the index built with method_key is kept.
+        Criteria sharing it share the index, so it must change whenever method_key
+        would. By default, each instance gets its own index; stateless criteria
+        can return their class, so all their instances share one.
+        :return: Such key.
+        :rtype: Hashable
+        """
+        return self
+
+    def method_key(self, method) -> Hashable:
+        """
+        Retrieves the key under which given implementation is indexed.
+        :param method: The method implementation.
+        :type method: pythoneda.sandbox.poc.cac.PythonMethod
+        :return: Such key.
+        :rtype: Hashable
+        """
+        return self.definition_key(method.method_def)
+
 
 # vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
 # Local Variables:
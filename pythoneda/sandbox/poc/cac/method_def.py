@@ -98,6 +98,7 @@ class MethodDef(ValueObject):
             actual_method.__name__,
             signature.return_annotation,
             method.__doc__,
+            [],
             "[no return doc]",
             method,
         )
@@ -0,0 +1,145 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/method_implementation_registry.py
+
+This file declares the MethodImplementationRegistry class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .instrumentation import Instrumentation
+from .method_binding_criteria import MethodBindingCriteria
+from .method_def import MethodDef
+from .python_method import PythonMethod
+from pythoneda.shared import BaseObject
+from typing import Dict, Hashable, List
+
+
+class MethodImplementationRegistry(BaseObject):
+    """
+    The available method implementations, indexed for each binding criteria.
+
+    Class name: MethodImplementationRegistry
+
+    Responsibilities:
+        - Keep the available method implementations.
+        - Resolve the implementation of a method definition, according to some criteria.
+
+    Collaborators:
+        - pythoneda.sandbox.poc.cac.MethodBindingCriteria
+        - pythoneda.sandbox.poc.cac.PythonMethod
+    """
+
+    def __init__(self, methods: List[PythonMethod] = None):
+        """
+        Creates a new MethodImplementationRegistry instance.
+        :param methods: The available implementations.
+        :type methods: List[pythoneda.sandbox.poc.cac.PythonMethod]
+        """
+        super().__init__()
+        self._methods = list(methods) if methods else []
+        self._indexes: Dict[Hashable, Dict[Hashable, List[PythonMethod]]] = {}
+        self._version = 0
+
+    @property
+    def methods(self) -> List[PythonMethod]:
+        """
+        Retrieves the available implementations.
+        :return: Such implementations.
+        :rtype: List[pythoneda.sandbox.poc.cac.PythonMethod]
+        """
+        return self._methods
+
+    @property
+    def version(self) -> int:
+        """
+        Retrieves the version, which changes every time an implementation is registered.
+        :return: Such version.
+        :rtype: int
+        """
+        return self._version
+
+    def register(self, method: PythonMethod):
+        """
+        Adds an implementation.
+        :param method: The implementation.
+        :type method: pythoneda.sandbox.poc.cac.PythonMethod
+        """
+        self._methods.append(method)
+        self._indexes.clear()
+        self._version += 1
+
+    def _index_for(
+        self, criteria: MethodBindingCriteria
+    ) -> Dict[Hashable, List[PythonMethod]]:
+        """
+        Retrieves the index of the implementations for given criteria,
+        building it on first use. Indexes are shared by all criteria with the same
+        index_key.
+        :param criteria: The criteria.
+        :type criteria: pythoneda.sandbox.poc.cac.MethodBindingCriteria
+        :return: The implementations, indexed by the criteria's method_key.
+        :rtype: Dict[Hashable, List[pythoneda.sandbox.poc.cac.PythonMethod]]
+        """
+        index_key = criteria.index_key()
+        result = self._indexes.get(index_key, None)
+        if result is None:
+            result = {}
+            for method in self._methods:
+                result.setdefault(criteria.method_key(method), []).append(method)
+            self._indexes[index_key] = result
+
+        return result
+
+    def resolve(
+        self, methodDef: MethodDef, criteria: MethodBindingCriteria
+    ) -> PythonMethod:
+        """
+        Resolves the implementation of given definition.
+        :param methodDef: The method definition.
+        :type methodDef: pythoneda.sandbox.poc.cac.MethodDef
+        :param criteria: The binding criteria.
+        :type criteria: pythoneda.sandbox.poc.cac.MethodBindingCriteria
+        :return: The first matching implementation, or None.
+        :rtype: pythoneda.sandbox.poc.cac.PythonMethod
+        """
+        result = None
+
+        key = criteria.definition_key(methodDef)
+        if key is None:
+            candidates = self._methods
+        else:
+            candidates = self._index_for(criteria).get(key, [])
+
+        checks = 0
+        with Instrumentation.timed("binding.is_satisfied_by"):
+            for method in candidates:
+                checks += 1
+                if criteria.is_satisfied_by(methodDef, method):
+                    result = method
+                    break
+        Instrumentation.count("binding.is_satisfied_by", checks)
+
+        return result
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
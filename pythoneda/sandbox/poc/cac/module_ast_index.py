@@ -0,0 +1,437 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/module_ast_index.py
+
+This file declares the ModuleAstIndex class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import ast
+import io
+from .ast_index_entry import AstIndexEntry
+from .instrumentation import Instrumentation
+from .python_import import PythonImport
+from pythoneda.shared import BaseObject
+from typing import Any, Dict, List, Tuple
+
+
+class ModuleAstIndex(ast.NodeVisitor, BaseObject):
+    """
+    Index of the declarations and imports of a module, built in a single pass.
+
+    Class name: ModuleAstIndex
+
+    Responsibilities:
+        - Walk the syntax tree of a module only once.
+        - Record the line span and local imports of each class and function.
+        - Record the level of relative imports, and the condition of guarded ones.
+        - Answer import and source queries without walking the tree again.
+
+    Collaborators:
+        - pythoneda.sandbox.poc.cac.AstIndexEntry
+        - pythoneda.sandbox.poc.cac.PythonImport
+    """
+
+    def __init__(self, source: str, tree: ast.AST = None, state: Any = None):
+        """
+        Creates a new ModuleAstIndex instance.
+        :param source: The source code.
+        :type source: str
+        :param tree: The already-parsed source code, if available.
+        :type tree: ast.AST
+        :param state: The state of a previous index of the same source, if
+        available. In such case, the source is parsed only if the tree is needed.
+        :type state: Any
+        """
+        super().__init__()
+        self._source = source
+        # ast counts only \n, \r\n and \r as line breaks; str.splitlines doesn't
+        self._lines = io.StringIO(source, newline="").readlines()
+        self._tree = tree
+        if state is None:
+            self._index()
+        else:
+            self._restore(state)
+
+    def _reset(self):
+        """
+        Discards the indexed information.
+        """
+        self._entries: Dict[str, List[AstIndexEntry]] = {}
+        self._classes: List[AstIndexEntry] = []
+        self._imports: List[Tuple[str, str, int, str]] = []
+        self._module_imports: List[Tuple[str, str, int, str]] = []
+        self._function_imports: Dict[str, List[Tuple[str, str, int, str]]] = {}
+        self._method_imports: Dict[
+            Tuple[str, str], List[Tuple[str, str, int, str]]
+        ] = {}
+        self._scopes: List[AstIndexEntry] = []
+        self._guards: List[ast.expr] = []
+
+    def _index(self):
+        """
+        Indexes the syntax tree, parsing the source code if needed.
+        """
+        if self._tree is None:
+            with Instrumentation.timed("ast.parse"):
+                self._tree = ast.parse(self._source)
+        self._reset()
+        self.visit(self._tree)
+
+    @property
+    def state(self) -> Any:
+        """
+        Retrieves the indexed information, as plain values suitable for `marshal`.
+        :return: Such information.
+        :rtype: Any
+        """
+        return {
+            "entries": [
+                (
+                    e.qualname,
+                    e.name,
+                    e.is_class,
+                    e.first_line,
+                    e.last_line,
+                    list(e.imports),
+                )
+                for entries in self._entries.values()
+                for e in entries
+            ],
+            "classes": [(e.qualname, e.first_line) for e in self._classes],
+            "imports": list(self._imports),
+            "module_imports": list(self._module_imports),
+            "function_imports": dict(self._function_imports),
+            "method_imports": dict(self._method_imports),
+        }
+
+    def _restore(self, state: Any):
+        """
+        Restores the information of a previous index, without parsing.
+        :param state: Such information.
+        :type state: Any
+        """
+        self._reset()
+        for spec in state["entries"]:
+            qualname, name, is_class, first_line, last_line, imports = spec
+            entry = AstIndexEntry(
+                qualname, None, first_line, last_line, self._lines, name, is_class
+            )
+            entry.imports.extend(tuple(spec) for spec in imports)
+            self._entries.setdefault(qualname, []).append(entry)
+        self._classes = [self.entry(*spec) for spec in state["classes"]]
+        self._imports = [tuple(spec) for spec in state["imports"]]
+        self._module_imports = [tuple(spec) for spec in state["module_imports"]]
+        self._function_imports = {
+            name: [tuple(spec) for spec in specs]
+            for name, specs in state["function_imports"].items()
+        }
+        self._method_imports = {
+            tuple(key): [tuple(spec) for spec in specs]
+            for key, specs in state["method_imports"].items()
+        }
+
+    @property
+    def source(self) -> str:
+        """
+        Retrieves the source code.
+        :return: Such code.
+        :rtype: str
+        """
+        return self._source
+
+    @property
+    def lines(self) -> List[str]:
+        """
+        Retrieves the source lines, including line endings.
+        :return: Such lines.
+        :rtype: List[str]
+        """
+        return self._lines
+
+    @property
+    def tree(self) -> ast.AST:
+        """
+        Retrieves the syntax tree. If the index was restored, the source is parsed
+        now, and the entries get their nodes.
+        :return: Such tree.
+        :rtype: ast.AST
+        """
+        if self._tree is None:
+            self._index()
+
+        return self._tree
+
+    @property
+    def classes(self) -> List[AstIndexEntry]:
+        """
+        Retrieves the top-level classes, in declaration order.
+        :return: Such entries.
+        :rtype: List[pythoneda.sandbox.poc.cac.AstIndexEntry]
+        """
+        return self._classes
+
+    @property
+    def imports(self) -> List[PythonImport]:
+        """
+        Retrieves all imports in the module, wherever they are declared.
+        :return: New instances for such imports.
+        :rtype: List[pythoneda.sandbox.poc.cac.PythonImport]
+        """
+        return self.__class__._to_imports(self._imports)
+
+    @property
+    def module_imports(self) -> List[PythonImport]:
+        """
+        Retrieves the imports declared at module level, including those under an
+        `if` (i.e. TYPE_CHECKING), but not those within classes or functions.
+        :return: New instances for such imports.
+        :rtype: List[pythoneda.sandbox.poc.cac.PythonImport]
+        """
+        return self.__class__._to_imports(self._module_imports)
+
+    def imports_of_function(self, name: str) -> List[PythonImport]:
+        """
+        Retrieves the imports declared in any function with given name.
+        :param name: The function name.
+        :type name: str
+        :return: New instances for such imports.
+        :rtype: List[pythoneda.sandbox.poc.cac.PythonImport]
+        """
+        return self.__class__._to_imports(self._function_imports.get(name, []))
+
+    def imports_of_method(
+        self, classQualname: str, methodName: str
+    ) -> List[PythonImport]:
+        """
+        Retrieves the imports declared in the methods with given name within a class.
+        :param classQualname: The qualified name of the class.
+        :type classQualname: str
+        :param methodName: The method name.
+        :type methodName: str
+        :return: New instances for such imports.
+        :rtype: List[pythoneda.sandbox.poc.cac.PythonImport]
+        """
+        return self.__class__._to_imports(
+            self._method_imports.get((classQualname, methodName), [])
+        )
+
+    def entry(self, qualname: str, firstLine: int = None) -> AstIndexEntry:
+        """
+        Retrieves the entry for given qualified name.
+        :param qualname: The qualified name, i.e. `Class.method`.
+        :type qualname: str
+        :param firstLine: The first line of the declaration, including decorators,
+        to tell apart declarations sharing the same name (i.e. property setters).
+        :type firstLine: int
+        :return: The entry, or None if not found. If there're several, and no line
+        is given, the last one, as it does at runtime.
+        :rtype: pythoneda.sandbox.poc.cac.AstIndexEntry
+        """
+        result = None
+        for candidate in self._entries.get(qualname, []):
+            if firstLine is None or candidate.first_line == firstLine:
+                result = candidate
+
+        return result
+
+    def node_of(self, qualname: str, firstLine: int = None) -> ast.AST:
+        """
+        Retrieves the declaration node for given qualified name, parsing the source
+        if the index was restored.
+        :param qualname: The qualified name, i.e. `Class.method`.
+        :type qualname: str
+        :param firstLine: The first line of the declaration, including decorators.
+        :type firstLine: int
+        :return: The node, or None if not found.
+        :rtype: Union[ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef]
+        """
+        result = None
+        entry = self.entry(qualname, firstLine)
+        if entry is not None and entry.node is None:
+            self._index()
+            entry = self.entry(qualname, firstLine)
+        if entry is not None:
+            result = entry.node
+
+        return result
+
+    @classmethod
+    def _to_imports(
+        cls, specs: List[Tuple[str, str, int, str]]
+    ) -> List[PythonImport]:
+        """
+        Builds new PythonImport instances.
+        :param specs: The (package, asset, level, guard) tuples.
+        :type specs: List[Tuple[str, str, int, str]]
+        :return: Such instances.
+        :rtype: List[pythoneda.sandbox.poc.cac.PythonImport]
+        """
+        return [PythonImport(*spec) for spec in specs]
+
+    def _qualname_of(self, name: str) -> str:
+        """
+        Builds the qualified name of a declaration within the current scope.
+        :param name: The declaration name.
+        :type name: str
+        :return: The qualified name, following Python's own rules.
+        :rtype: str
+        """
+        result = name
+        if self._scopes:
+            parent = self._scopes[-1]
+            if parent.is_class:
+                result = f"{parent.qualname}.{name}"
+            else:
+                result = f"{parent.qualname}.<locals>.{name}"
+
+        return result
+
+    def _visit_declaration(self, node: ast.AST):
+        """
+        Visits a class or function declaration.
+        :param node: The node to visit.
+        :type node: Union[ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef]
+        """
+        first_line = node.lineno
+        if node.decorator_list:
+            first_line = node.decorator_list[0].lineno
+        entry = AstIndexEntry(
+            self._qualname_of(node.name),
+            node,
+            first_line,
+            node.end_lineno,
+            self._lines,
+        )
+        self._entries.setdefault(entry.qualname, []).append(entry)
+        if entry.is_class and not self._scopes:
+            self._classes.append(entry)
+        self._scopes.append(entry)
+        # guards are relative to the innermost declaration
+        guards = self._guards
+        self._guards = []
+        self.generic_visit(node)
+        self._guards = guards
+        self._scopes.pop()
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        """
+        Visits a `ClassDef` node.
+        :param node: The node to visit.
+        :type node: ast.ClassDef
+        """
+        self._visit_declaration(node)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        """
+        Visits a `FunctionDef` node.
+        :param node: The node to visit.
+        :type node: ast.FunctionDef
+        """
+        self._visit_declaration(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
+        """
+        Visits an `AsyncFunctionDef` node.
+        :param node: The node to visit.
+        :type node: ast.AsyncFunctionDef
+        """
+        self._visit_declaration(node)
+
+    def visit_If(self, node: ast.If):
+        """
+        Visits an `if` node, so that the imports within know their condition.
+        :param node: The node to visit.
+        :type node: ast.If
+        """
+        self._guards.append(node.test)
+        for child in node.body:
+            self.visit(child)
+        self._guards[-1] = ast.UnaryOp(op=ast.Not(), operand=node.test)
+        for child in node.orelse:
+            self.visit(child)
+        self._guards.pop()
+
+    def _guard(self) -> str:
+        """
+        Retrieves the condition the current statement is declared under.
+        :return: Such condition, or None if there's none.
+        :rtype: str
+        """
+        if not self._guards:
+            return None
+        if len(self._guards) == 1:
+            return ast.unparse(self._guards[0])
+
+        return ast.unparse(ast.BoolOp(op=ast.And(), values=list(self._guards)))
+
+    def _add_import(self, package: str, asset: str = None, level: int = 0):
+        """
+        Records an import, attributing it to the innermost enclosing declaration.
+        Method queries take into account the innermost enclosing function.
+        :param package: The package.
+        :type package: str
+        :param asset: The asset, if any.
+        :type asset: str
+        :param level: The number of leading dots of relative imports.
+        :type level: int
+        """
+        spec = (package, asset, level, self._guard())
+        self._imports.append(spec)
+        if not self._scopes:
+            self._module_imports.append(spec)
+        else:
+            self._scopes[-1].imports.append(spec)
+        function = None
+        for scope in reversed(self._scopes):
+            if function is None:
+                if not scope.is_class:
+                    function = scope
+                    self._function_imports.setdefault(function.name, []).append(
+                        spec
+                    )
+            elif scope.is_class:
+                self._method_imports.setdefault(
+                    (scope.qualname, function.name), []
+                ).append(spec)
+
+    def visit_Import(self, node: ast.Import):
+        """
+        Visits an `import` statement node.
+        :param node: The node to visit.
+        :type node: ast.Import
+        """
+        for alias in node.names:
+            self._add_import(alias.name)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        """
+        Visits a `import from` node.
+        :param node: The node to visit.
+        :type node: ast.ImportFrom
+        """
+        for alias in node.names:
+            self._add_import(node.module or "", alias.name, node.level or 0)
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -19,11 +19,12 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+import ast
 from .dependency_import import DependencyImport
 from .method_def import MethodDef
-from .python_import_find import PythonImportFind
 from .python_method import PythonMethod
 from pythoneda.shared import primary_key_attribute
+from .source_cache import SourceCache
 from typing import Callable, List, Type
 
 
@@ -40,7 +41,13 @@ class OfficialPythonMethod(PythonMethod):
         - None
     """
 
-    def __init__(self, methodDef: MethodDef, method: Callable, enclosingClass: Type):
+    def __init__(
+        self,
+        methodDef: MethodDef,
+        method: Callable,
+        enclosingClass: Type,
+        sourceCache: SourceCache = None,
+    ):
         """
         Creates a new PythonMethod instance.
         :param methodDef: The method definition.
@@ -49,10 +56,13 @@ class OfficialPythonMethod(PythonMethod):
         :type method: Callable
         :param enclosingClass: The class that encloses the method.
         :type enclosingClass: Type
+        :param sourceCache: The cache of already parsed modules.
+        :type sourceCache: pythoneda.sandbox.poc.cac.SourceCache
         """
         super().__init__(methodDef)
         self._method = method
         self._enclosing_class = enclosingClass
+        self._source_cache = sourceCache if sourceCache is not None else SourceCache()
 
     @property
     def method(self) -> Callable:
@@ -79,8 +89,22 @@ class OfficialPythonMethod(PythonMethod):
         :return: The content.
         :rtype: str
         """
-        import inspect
+        actual_method = self.method
+        if isinstance(actual_method, property):
+            actual_method = actual_method.fget
+
+        if isinstance(actual_method, classmethod):
+            actual_method = actual_method.__func__
 
+        return self._source_cache.function_source_of(actual_method)
+
+    @property
+    def node(self) -> ast.AST:
+        """
+        Retrieves the already-parsed declaration of the method, if available.
+        :return: Such node, shared with the module tree.
+        :rtype: Union[ast.FunctionDef, ast.AsyncFunctionDef]
+        """
         actual_method = self.method
         if isinstance(actual_method, property):
             actual_method = actual_method.fget
@@ -88,7 +112,7 @@ class OfficialPythonMethod(PythonMethod):
         if isinstance(actual_method, classmethod):
             actual_method = actual_method.__func__
 
-        return inspect.getsource(actual_method)
+        return self._source_cache.function_node_of(actual_method)
 
     @property
     def imports(self) -> List[DependencyImport]:
@@ -97,8 +121,6 @@ class OfficialPythonMethod(PythonMethod):
         :return: The dependencies.
         :rtype: List[pythoneda.sandbox.poc.cac.DependencyImport]
         """
-        import inspect
-
         actual_method = self.method
         if isinstance(actual_method, property):
             actual_method = actual_method.fget
@@ -106,9 +128,9 @@ class OfficialPythonMethod(PythonMethod):
         if isinstance(actual_method, classmethod):
             actual_method = actual_method.__func__
 
-        return PythonImportFind(
-            inspect.getsource(self.enclosing_class), actual_method.__name__
-        ).imports
+        return self._source_cache.method_imports_of(
+            self.enclosing_class, actual_method.__name__
+        )
 
 
 # vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
@@ -0,0 +1,302 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/package_class_index.py
+
+This file declares the PackageClassIndex class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import ast
+from .instrumentation import Instrumentation
+import json
+import os
+import sys
+from pythoneda.shared import BaseObject
+from typing import Dict, List, Set, Tuple
+
+
+class PackageClassIndex(BaseObject):
+    """
+    Lists the classes of a package by parsing its source files, without importing them.
+
+    Class name: PackageClassIndex
+
+    Responsibilities:
+        - Find the source files of a package.
+        - Parse only the files that changed since the last scan, according to their
+          modification time and size.
+        - Persist the index on disk, if asked to.
+
+    Collaborators:
+        - pythoneda.sandbox.poc.cac.DomainArtifact
+    """
+
+    _format_version = 1
+
+    def __init__(self, indexFile: str = None):
+        """
+        Creates a new PackageClassIndex instance.
+        :param indexFile: The file to persist the index to, if any.
+        :type indexFile: str
+        """
+        super().__init__()
+        self._index_file = indexFile
+        self._entries = None
+        self._parsed_files = 0
+
+    @classmethod
+    def default_index_file(cls, packageName: str) -> str:
+        """
+        Retrieves the file the index of given package is persisted to by default:
+        `class-index/<package>.json`, within the POCCAC_CACHE_DIR folder if such
+        variable is set, or the user cache folder otherwise.
+        :param packageName: The package name.
+        :type packageName: str
+        :return: Such file.
+        :rtype: str
+        """
+        folder = os.environ.get("POCCAC_CACHE_DIR", "")
+        if not folder:
+            folder = os.path.join(
+                os.environ.get("XDG_CACHE_HOME", "")
+                or os.path.join(os.path.expanduser("~"), ".cache"),
+                "pythoneda-poccac",
+            )
+
+        return os.path.join(folder, "class-index", f"{packageName}.json")
+
+    @property
+    def index_file(self) -> str:
+        """
+        Retrieves the file the index is persisted to.
+        :return: Such file, or None if it's kept only in memory.
+        :rtype: str
+        """
+        return self._index_file
+
+    @property
+    def parsed_files(self) -> int:
+        """
+        Retrieves how many files were parsed in the last scan.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._parsed_files
+
+    @classmethod
+    def package_folders_of(cls, packageName: str) -> List[str]:
+        """
+        Finds the folders of given package in `sys.path`, without importing it.
+        As the import system does, the first regular package shadows any other copy,
+        whereas namespace packages can span several folders.
+        :param packageName: The package name.
+        :type packageName: str
+        :return: Such folders.
+        :rtype: List[str]
+        """
+        result = sys.path
+        for part in packageName.split("."):
+            portions = []
+            for entry in result:
+                folder = os.path.abspath(os.path.join(entry or os.curdir, part))
+                if not os.path.isdir(folder) or folder in portions:
+                    continue
+                if os.path.isfile(os.path.join(folder, "__init__.py")):
+                    portions = [folder]
+                    break
+                portions.append(folder)
+            result = portions
+
+        return list(result)
+
+    @classmethod
+    def module_files_of(cls, packageName: str, folder: str) -> List[Tuple[str, str]]:
+        """
+        Lists the source files under given package folder.
+        :param packageName: The package name.
+        :type packageName: str
+        :param folder: The package folder.
+        :type folder: str
+        :return: The (module name, file path) tuples.
+        :rtype: List[Tuple[str, str]]
+        """
+        result = []
+        for root, dirs, files in os.walk(folder):
+            dirs[:] = sorted(d for d in dirs if d.isidentifier())
+            relative = os.path.relpath(root, folder)
+            prefix = packageName
+            if relative != os.curdir:
+                prefix = ".".join([packageName] + relative.split(os.sep))
+            for file in sorted(files):
+                name, extension = os.path.splitext(file)
+                if extension != ".py":
+                    continue
+                if name == "__init__":
+                    result.append((prefix, os.path.join(root, file)))
+                elif name.isidentifier():
+                    result.append((f"{prefix}.{name}", os.path.join(root, file)))
+
+        return result
+
+    @classmethod
+    def classes_declared_in(cls, path: str) -> List[str]:
+        """
+        Parses given file, and retrieves the names of its module-level classes,
+        including those declared conditionally.
+        :param path: The file path.
+        :type path: str
+        :return: Such names, or an empty list if the file cannot be parsed.
+        :rtype: List[str]
+        """
+        try:
+            with open(path, "rb") as file:
+                source = file.read()
+            with Instrumentation.timed("ast.parse"):
+                tree = ast.parse(source, path)
+        except (OSError, SyntaxError, ValueError) as e:
+            print(f"Error parsing module: {e}")
+            return []
+
+        result = []
+        for name in cls._class_names_in(tree.body):
+            if name not in result:
+                result.append(name)
+
+        return result
+
+    @classmethod
+    def _class_names_in(cls, statements: List[ast.stmt]) -> List[str]:
+        """
+        Retrieves the names of the classes declared in given statements, looking
+        into `if`, `try` and `with` blocks, but not into functions or classes.
+        :param statements: The statements.
+        :type statements: List[ast.stmt]
+        :return: Such names.
+        :rtype: List[str]
+        """
+        result = []
+        for node in statements:
+            if isinstance(node, ast.ClassDef):
+                result.append(node.name)
+            elif isinstance(node, ast.If):
+                result.extend(cls._class_names_in(node.body))
+                result.extend(cls._class_names_in(node.orelse))
+            elif isinstance(node, (ast.With, ast.AsyncWith)):
+                result.extend(cls._class_names_in(node.body))
+            elif isinstance(node, (ast.Try, getattr(ast, "TryStar", ast.Try))):
+                result.extend(cls._class_names_in(node.body))
+                for handler in node.handlers:
+                    result.extend(cls._class_names_in(handler.body))
+                result.extend(cls._class_names_in(node.orelse))
+                result.extend(cls._class_names_in(node.finalbody))
+
+        return result
+
+    def _load(self) -> Dict[str, Dict]:
+        """
+        Retrieves the entries of the index, reading them from disk the first time.
+        :return: The entries, by file path.
+        :rtype: Dict[str, Dict]
+        """
+        if self._entries is None:
+            self._entries = {}
+            if self.index_file and os.path.exists(self.index_file):
+                try:
+                    with open(self.index_file, "r", encoding="utf-8") as file:
+                        contents = json.load(file)
+                    if contents.get("version", None) == self.__class__._format_version:
+                        self._entries = contents.get("files", {})
+                except (OSError, ValueError):
+                    # a corrupt index is just rebuilt
+                    self._entries = {}
+
+        return self._entries
+
+    def _save(self):
+        """
+        Writes the index to disk, atomically.
+        """
+        from .artifact_emitter import ArtifactEmitter
+
+        if not self.index_file:
+            return
+        contents = {"version": self.__class__._format_version, "files": self._entries}
+        ArtifactEmitter.write_atomically(
+            self.index_file, json.dumps(contents).encode("utf-8")
+        )
+
+    def classes_of(self, packageName: str) -> Set[Tuple[str, str]]:
+        """
+        Recursively enumerates all classes defined in given package.
+        Only the files whose modification time or size changed are parsed again.
+        :param packageName: The package name.
+        :type packageName: str
+        :return: The (module name, class name) tuples.
+        :rtype: Set[Tuple[str, str]]
+        """
+        entries = self._load()
+        self._parsed_files = 0
+        result = set()
+        changed = False
+        folders = self.__class__.package_folders_of(packageName)
+        # entries of folders no longer providing the package are stale
+        prefixes = tuple(folder + os.sep for folder in folders)
+        for path in [p for p in entries if not p.startswith(prefixes)]:
+            del entries[path]
+            changed = True
+        for folder in folders:
+            seen = set()
+            for module_name, path in self.__class__.module_files_of(
+                packageName, folder
+            ):
+                seen.add(path)
+                stat = os.stat(path)
+                entry = entries.get(path, None)
+                if (
+                    entry is None
+                    or entry["mtime"] != stat.st_mtime_ns
+                    or entry["size"] != stat.st_size
+                    or entry["module"] != module_name
+                ):
+                    entry = {
+                        "mtime": stat.st_mtime_ns,
+                        "size": stat.st_size,
+                        "module": module_name,
+                        "classes": self.__class__.classes_declared_in(path),
+                    }
+                    entries[path] = entry
+                    self._parsed_files += 1
+                    changed = True
+                result.update((module_name, name) for name in entry["classes"])
+            prefix = folder + os.sep
+            for path in [p for p in entries if p.startswith(prefix) and p not in seen]:
+                del entries[path]
+                changed = True
+
+        if changed:
+            self._save()
+
+        return result
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
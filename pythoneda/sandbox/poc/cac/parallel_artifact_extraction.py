@@ -0,0 +1,189 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/parallel_artifact_extraction.py
+
+This file declares the ParallelArtifactExtraction class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .class_artifact import ClassArtifact
+from .class_artifact_description import ClassArtifactDescription
+from concurrent.futures import ProcessPoolExecutor
+from pythoneda.shared import BaseObject
+from typing import Dict, List, Tuple
+
+
+class ParallelArtifactExtraction(BaseObject):
+    """
+    Extracts the artifacts of a package, spreading its modules across processes.
+
+    Class name: ParallelArtifactExtraction
+
+    Responsibilities:
+        - List the modules of a package.
+        - Extract (and optionally render) the classes of each module in a worker process.
+        - Merge the results, in module order.
+        - Report the modules that couldn't be extracted, without aborting.
+
+    Collaborators:
+        - pythoneda.sandbox.poc.cac.ClassArtifact
+        - pythoneda.sandbox.poc.cac.ClassArtifactDescription
+    """
+
+    def __init__(self, maxWorkers: int = None, render: bool = True):
+        """
+        Creates a new ParallelArtifactExtraction instance.
+        :param maxWorkers: The maximum number of worker processes. Defaults to the number of CPUs.
+        :type maxWorkers: int
+        :param render: Whether the workers render the content of each class.
+        :type render: bool
+        """
+        super().__init__()
+        self._max_workers = maxWorkers
+        self._render = render
+        self._errors: Dict[str, str] = {}
+
+    @property
+    def max_workers(self) -> int:
+        """
+        Retrieves the maximum number of worker processes.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._max_workers
+
+    @property
+    def render(self) -> bool:
+        """
+        Checks whether the workers render the content of each class.
+        :return: Such flag.
+        :rtype: bool
+        """
+        return self._render
+
+    @property
+    def errors(self) -> Dict[str, str]:
+        """
+        Retrieves the errors of the last extraction.
+        :return: The error message, by module name.
+        :rtype: Dict[str, str]
+        """
+        return self._errors
+
+    @classmethod
+    def module_names_of(cls, packageName: str) -> List[str]:
+        """
+        Retrieves the names of the package and all its submodules, recursively.
+        :param packageName: The package name.
+        :type packageName: str
+        :return: Such names.
+        :rtype: List[str]
+        """
+        import importlib
+        import pkgutil
+
+        result = [packageName]
+        package = importlib.import_module(packageName)
+        if hasattr(package, "__path__"):
+            result.extend(
+                name
+                for _, name, _ in pkgutil.walk_packages(
+                    # subpackages failing to import get reported when extracted
+                    package.__path__,
+                    f"{packageName}.",
+                    onerror=lambda name: None,
+                )
+            )
+
+        return result
+
+    @classmethod
+    def extract_module(
+        cls, moduleName: str, render: bool = True
+    ) -> List[ClassArtifactDescription]:
+        """
+        Extracts the classes of given module. Meant to run in a worker process.
+        :param moduleName: The module name.
+        :type moduleName: str
+        :param render: Whether to render the content of each class.
+        :type render: bool
+        :return: The descriptions of such classes.
+        :rtype: List[pythoneda.sandbox.poc.cac.ClassArtifactDescription]
+        """
+        import importlib
+
+        module = importlib.import_module(moduleName)
+        return [
+            ClassArtifactDescription.from_artifact(artifact, render)
+            for artifact in ClassArtifact.for_module(module)
+        ]
+
+    @classmethod
+    def try_extract_module(
+        cls, moduleName: str, render: bool = True
+    ) -> Tuple[List[ClassArtifactDescription], str]:
+        """
+        Extracts the classes of given module, catching any error, so a single
+        module cannot abort the whole extraction. Meant to run in a worker process.
+        :param moduleName: The module name.
+        :type moduleName: str
+        :param render: Whether to render the content of each class.
+        :type render: bool
+        :return: The descriptions of such classes, and the error message, if any.
+        :rtype: Tuple[List[pythoneda.sandbox.poc.cac.ClassArtifactDescription], str]
+        """
+        try:
+            return cls.extract_module(moduleName, render), None
+        except Exception as e:
+            return [], f"{e.__class__.__name__}: {e}"
+
+    def extract(self, packageName: str) -> List[ClassArtifactDescription]:
+        """
+        Extracts the classes of given package and all its submodules. Modules that
+        fail are reported, and available in `errors`.
+        :param packageName: The package name.
+        :type packageName: str
+        :return: The descriptions of such classes, in module order.
+        :rtype: List[pythoneda.sandbox.poc.cac.ClassArtifactDescription]
+        """
+        module_names = self.__class__.module_names_of(packageName)
+        result = []
+        self._errors = {}
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            for module_name, (descriptions, error) in zip(
+                module_names,
+                executor.map(
+                    self.__class__.try_extract_module,
+                    module_names,
+                    [self.render] * len(module_names),
+                ),
+            ):
+                if error is not None:
+                    print(f"Error extracting module {module_name}: {error}")
+                    self._errors[module_name] = error
+                result.extend(descriptions)
+
+        return result
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,208 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/persistent_ast_index_cache.py
+
+This file declares the PersistentAstIndexCache class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import hashlib
+from .instrumentation import Instrumentation
+import marshal
+from .module_ast_index import ModuleAstIndex
+import os
+from pythoneda.shared import BaseObject
+import sys
+from typing import Any
+
+
+class PersistentAstIndexCache(BaseObject):
+    """
+    On-disk cache of module indexes, so unchanged modules are not parsed again
+    in later processes.
+
+    Each index is stored as a `marshal` blob, named after the hash of the source
+    code, in a folder per Python version. It keeps the imports, and the line
+    span and local imports of each class and function; the source code of each
+    declaration is sliced from the module source using such spans.
+
+    Class name: PersistentAstIndexCache
+
+    Responsibilities:
+        - Store the state of module indexes, keyed by content hash and Python version.
+        - Restore indexes without parsing, when the source is unchanged.
+        - Keep track of hits and misses.
+
+    Collaborators:
+        - pythoneda.sandbox.poc.cac.ModuleAstIndex
+        - pythoneda.sandbox.poc.cac.SourceCache
+    """
+
+    _format = 2
+
+    _default: "PersistentAstIndexCache" = None
+
+    def __init__(self, folder: str):
+        """
+        Creates a new PersistentAstIndexCache instance.
+        :param folder: The cache folder.
+        :type folder: str
+        """
+        super().__init__()
+        self._folder = folder
+        self._hits = 0
+        self._misses = 0
+
+    @classmethod
+    def default(cls) -> "PersistentAstIndexCache":
+        """
+        Retrieves the cache used by default, if any: the one set with `use`, or
+        else the one in the POCCAC_CACHE_DIR folder, if such variable is set.
+        :return: Such cache, or None.
+        :rtype: pythoneda.sandbox.poc.cac.PersistentAstIndexCache
+        """
+        if cls._default is None:
+            folder = os.environ.get("POCCAC_CACHE_DIR", "")
+            if folder:
+                cls._default = cls(folder)
+
+        return cls._default
+
+    @classmethod
+    def use(cls, cache: "PersistentAstIndexCache"):
+        """
+        Sets the cache used by default.
+        :param cache: The cache.
+        :type cache: pythoneda.sandbox.poc.cac.PersistentAstIndexCache
+        """
+        cls._default = cache
+
+    @property
+    def folder(self) -> str:
+        """
+        Retrieves the cache folder.
+        :return: Such folder.
+        :rtype: str
+        """
+        return self._folder
+
+    @classmethod
+    def key_of(cls, source: str) -> str:
+        """
+        Builds the key for given source code.
+        :param source: The source code.
+        :type source: str
+        :return: The hex digest of its content.
+        :rtype: str
+        """
+        return hashlib.sha256(source.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def path_of(self, key: str) -> str:
+        """
+        Builds the path of the entry for given key, for the running Python version.
+        :param key: The key.
+        :type key: str
+        :return: Such path.
+        :rtype: str
+        """
+        return os.path.join(
+            self.folder, sys.implementation.cache_tag, f"{key}.marshal"
+        )
+
+    def index_for(self, source: str) -> ModuleAstIndex:
+        """
+        Retrieves the index of given source code, restoring it if it's cached,
+        or else building and storing it.
+        :param source: The source code.
+        :type source: str
+        :return: Such index.
+        :rtype: pythoneda.sandbox.poc.cac.ModuleAstIndex
+        """
+        path = self.path_of(self.__class__.key_of(source))
+        state = self._load(path)
+        if state is None:
+            self._misses += 1
+            result = ModuleAstIndex(source)
+            self._store(path, result.state)
+        else:
+            self._hits += 1
+            result = ModuleAstIndex(source, state=state)
+
+        return result
+
+    def _load(self, path: str) -> Any:
+        """
+        Reads an entry. Missing, stale or corrupt entries are ignored.
+        :param path: The entry path.
+        :type path: str
+        :return: The state of the index, or None.
+        :rtype: Any
+        """
+        result = None
+        with Instrumentation.timed("cache.load"):
+            try:
+                with open(path, "rb") as file:
+                    data = marshal.load(file)
+                if isinstance(data, tuple) and data[0] == self.__class__._format:
+                    result = data[1]
+            except (OSError, EOFError, ValueError, TypeError, IndexError):
+                result = None
+
+        return result
+
+    def _store(self, path: str, state: Any):
+        """
+        Writes an entry. Errors are ignored, since the cache is optional.
+        :param path: The entry path.
+        :type path: str
+        :param state: The state of the index.
+        :type state: Any
+        """
+        from .artifact_emitter import ArtifactEmitter
+
+        with Instrumentation.timed("cache.store"):
+            try:
+                ArtifactEmitter.write_atomically(
+                    path, marshal.dumps((self.__class__._format, state))
+                )
+            except OSError:
+                pass
+
+    def hits(self) -> int:
+        """
+        Retrieves how many indexes were restored from disk.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._hits
+
+    def misses(self) -> int:
+        """
+        Retrieves how many indexes had to be built.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._misses
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -19,8 +19,10 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+import asyncio
 from .dependency_import import DependencyImport
 from pythoneda.shared import primary_key_attribute
+from typing import List, Tuple
 
 
 class PythonImport(DependencyImport):
@@ -36,16 +38,26 @@ class PythonImport(DependencyImport):
         - None
     """
 
-    def __init__(self, package: str, asset: str = None):
+    def __init__(
+        self, package: str, asset: str = None, level: int = 0, guard: str = None
+    ):
         """
         Creates a new PythonImport instance.
-        :param package: The import package.
+        :param package: The import package, relative to the importing package if
+        the level is not zero. It's empty for imports such as `from . import x`.
         :type package: str
         :param asset: The name of the asset.
         :type asset: str
+        :param level: The number of leading dots of relative imports.
+        :type level: int
+        :param guard: The condition the import is declared under, if any
+        (i.e. TYPE_CHECKING).
+        :type guard: str
         """
         super().__init__(package)
         self._asset = asset
+        self._level = level
+        self._guard = guard
 
     @property
     @primary_key_attribute
@@ -57,6 +69,45 @@ class PythonImport(DependencyImport):
         """
         return self._asset
 
+    @property
+    @primary_key_attribute
+    def level(self) -> int:
+        """
+        Retrieves the level.
+        :return: The number of leading dots, or zero for absolute imports.
+        :rtype: int
+        """
+        return self._level
+
+    @property
+    @primary_key_attribute
+    def guard(self) -> str:
+        """
+        Retrieves the guard.
+        :return: The condition the import is declared under, or None.
+        :rtype: str
+        """
+        return self._guard
+
+    @property
+    def module(self) -> str:
+        """
+        Retrieves the module as written in the `from` clause.
+        :return: The package, with as many leading dots as the level.
+        :rtype: str
+        """
+        return "." * self._level + self._package
+
+    @property
+    def key(self) -> Tuple[str, str, int, str]:
+        """
+        Retrieves the key identifying this import: its package, asset, level and
+        guard. Cheaper to hash and compare than the import itself.
+        :return: Such key.
+        :rtype: Tuple[str, str, int, str]
+        """
+        return (self._package, self._asset, self._level, self._guard)
+
     async def rename(
         self,
         oldPackage: str,
@@ -80,6 +131,48 @@ class PythonImport(DependencyImport):
             if oldAsset and self._asset == oldAsset:
                 self._asset = newAsset
 
+    @classmethod
+    async def rename_all(
+        cls,
+        imports: List["PythonImport"],
+        oldPackage: str,
+        newPackage: str,
+        oldAsset: str = None,
+        newAsset: str = None,
+        maxConcurrency: int = None,
+    ):
+        """
+        Renames given imports concurrently.
+        :param imports: The imports to rename.
+        :type imports: List[pythoneda.sandbox.poc.cac.PythonImport]
+        :param oldPackage: The old package.
+        :type oldPackage: str
+        :param newPackage: The new package.
+        :type newPackage: str
+        :param oldAsset: The old asset.
+        :type oldAsset: str
+        :param newAsset: The new asset.
+        :type newAsset: str
+        :param maxConcurrency: The maximum number of renames in progress at any time.
+        If omitted, all of them run at once.
+        :type maxConcurrency: int
+        """
+        if maxConcurrency:
+            semaphore = asyncio.Semaphore(maxConcurrency)
+
+            async def bounded_rename(imp: "PythonImport"):
+                async with semaphore:
+                    await imp.rename(oldPackage, newPackage, oldAsset, newAsset)
+
+            await asyncio.gather(*[bounded_rename(imp) for imp in imports])
+        else:
+            await asyncio.gather(
+                *[
+                    imp.rename(oldPackage, newPackage, oldAsset, newAsset)
+                    for imp in imports
+                ]
+            )
+
 
 # vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
 # Local Variables:
@@ -20,12 +20,13 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 import ast
+from .module_ast_index import ModuleAstIndex
 from .python_import import PythonImport
 from pythoneda.shared import BaseObject, primary_key_attribute
-from typing import Callable, List
+from typing import List
 
 
-class PythonImportFind(ast.NodeVisitor, BaseObject):
+class PythonImportFind(BaseObject):
     """
     Logic to find imports in Python source code.
 
@@ -35,21 +36,36 @@ class PythonImportFind(ast.NodeVisitor, BaseObject):
         - Parse Python source code looking for `import` statements.
 
     Collaborators:
-        - None
+        - pythoneda.sandbox.poc.cac.ModuleAstIndex
     """
 
-    def __init__(self, source: str, methodName: str = None):
+    def __init__(
+        self,
+        source: str,
+        methodName: str = None,
+        tree: ast.AST = None,
+        index: ModuleAstIndex = None,
+    ):
         """
         Creates a new PythonImportFind instance.
         :param source: The source code.
         :type source: str
+        :param methodName: The method to restrict the search to, if any.
+        :type methodName: str
+        :param tree: The already-parsed source code, if available.
+        :type tree: ast.AST
+        :param index: The already-built index of the source code, if available.
+        :type index: pythoneda.sandbox.poc.cac.ModuleAstIndex
         """
         super().__init__()
         self._source = source
         self._method_name = methodName
-        self._imports = []
-        self._in_target_method = False
-        self._find_imports(source)
+        if index is None:
+            index = ModuleAstIndex(source, tree)
+        if methodName:
+            self._imports = index.imports_of_function(methodName)
+        else:
+            self._imports = index.imports
 
     @property
     @primary_key_attribute
@@ -81,71 +97,6 @@ class PythonImportFind(ast.NodeVisitor, BaseObject):
         """
         return self._imports
 
-    def visit_FunctionDef(self, node):
-        """
-        Visits a `FunctionDef` node.
-        :param node: The node to visit.
-        :type node: ast.FunctionDef
-        """
-        if self.method_name:
-            self.visit_FunctionDef_with_method_name(node)
-        else:
-            self.generic_visit(node)
-
-    def visit_FunctionDef_with_method_name(self, node):
-        """
-        Visits a `FunctionDef` node, looking for the target method.
-        :param node: The node to visit.
-        :type node: ast.FunctionDef
-        """
-        if node.name == self.method_name:
-            self._in_target_method = True
-            self.generic_visit(node)
-            self._in_target_method = False
-        else:
-            # Visit other methods/functions in case of nested definitions but avoid collecting imports.
-            original_in_target_method = self._in_target_method
-            self._in_target_method = False
-            self.generic_visit(node)
-            self._in_target_method = original_in_target_method
-
-    def visit_Import(self, node: ast.Import) -> None:
-        """
-        Visits an `import` statement node.
-        :param node: The node to visit.
-        :type node: ast.Import
-        """
-        if not self.method_name or self._in_target_method:
-            for alias in node.names:
-                self._imports.append(PythonImport(alias.name))
-            self.generic_visit(node)
-
-    def visit_ImportFrom(self, node):
-        """
-        Visits a `import from` node.
-        :param node: The node to visit.
-        :type node: ast.FunctionDef
-        """
-        if not self.method_name or self._in_target_method:
-            module = node.module if node.module else "built-in"
-            for alias in node.names:
-                imported = (
-                    PythonImport(module, alias.name)
-                    if module != "built-in"
-                    else PythonImport(alias.name)
-                )
-                self._imports.append(imported)
-            self.generic_visit(node)
-
-    def _find_imports(self, source: str) -> None:
-        """
-        Finds imports in the given source code.
-        :param source: The source code.
-        :type source: str
-        """
-        tree = ast.parse(source)
-        self.visit(tree)
-
 
 # vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
 # Local Variables:
@@ -0,0 +1,102 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/python_import_pool.py
+
+This file declares the PythonImportPool class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .python_import import PythonImport
+from pythoneda.shared import BaseObject
+from typing import Dict, Tuple
+
+
+class PythonImportPool(BaseObject):
+    """
+    Process-wide pool of interned, shared PythonImport instances.
+
+    Interned imports are shared by everyone asking for the same package and asset,
+    so they must never be renamed in place. Artifacts keep their own instances for
+    that, and use interned ones only for read-only views.
+
+    Class name: PythonImportPool
+
+    Responsibilities:
+        - Keep a single PythonImport for each (package, asset, level, guard).
+
+    Collaborators:
+        - pythoneda.sandbox.poc.cac.PythonImport
+    """
+
+    _imports: Dict[Tuple[str, str, int, str], PythonImport] = {}
+
+    def __init__(self):
+        """
+        Creates a new PythonImportPool instance.
+        """
+        super().__init__()
+
+    @classmethod
+    def intern(
+        cls, package: str, asset: str = None, level: int = 0, guard: str = None
+    ) -> PythonImport:
+        """
+        Retrieves the shared instance for given package and asset,
+        creating it on first use.
+        :param package: The package.
+        :type package: str
+        :param asset: The asset, if any.
+        :type asset: str
+        :param level: The number of leading dots of relative imports.
+        :type level: int
+        :param guard: The condition the import is declared under, if any.
+        :type guard: str
+        :return: The shared instance.
+        :rtype: pythoneda.sandbox.poc.cac.PythonImport
+        """
+        key = (package, asset, level, guard)
+        result = cls._imports.get(key, None)
+        if result is None:
+            result = PythonImport(*key)
+            cls._imports[key] = result
+
+        return result
+
+    @classmethod
+    def clear(cls):
+        """
+        Discards all interned imports.
+        """
+        cls._imports.clear()
+
+    @classmethod
+    def size(cls) -> int:
+        """
+        Retrieves the number of interned imports.
+        :return: Such number.
+        :rtype: int
+        """
+        return len(cls._imports)
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
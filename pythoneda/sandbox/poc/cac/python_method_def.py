@@ -19,12 +19,12 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+from .instrumentation import Instrumentation
 from .method_def import MethodDef
 from .method_parameter import MethodParameter
 from .python_import import PythonImport
 from pythoneda.shared import attribute, BaseObject, primary_key_attribute
-from io import StringIO
-from stringtemplate3 import StringTemplateGroup
+from .template_registry import TemplateRegistry
 from typing import List
 
 
@@ -96,7 +96,7 @@ group Method;
 // parameters template
 // - parameters: The method parameters.
 parameters(parameters) ::= <<
-<parameters: { param | <param.name>:<param.parameter_type><if(param.default_value)> = <param.default_value>}; separator=", " >
+<parameters: { param | <param.name>:<param.parameter_type><if(param.default_value)> = <param.default_value><endif>}; separator=", " >
 >>
 
 // docs
@@ -130,13 +130,8 @@ def <inst.name>(self<if(inst.parameters)>, <parameters(parameters=inst.parameter
         :return: Such content.
         :rtype: str
         """
-        # Create a group from the string content
-        group = StringTemplateGroup(name="Method", file=StringIO(self.template))
-
-        root_template = group.getInstanceOf("root")
-        root_template["inst"] = self
-
-        return str(root_template)
+        with Instrumentation.timed("template.render"):
+            return TemplateRegistry.render("Method", self.template, inst=self)
 
 
 # vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
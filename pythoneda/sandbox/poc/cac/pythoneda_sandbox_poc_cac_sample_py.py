@@ -19,18 +19,19 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
-from io import StringIO
 from .add_int_int_int_python_method import AddIntIntIntPythonMethod
 from .add_int_int_int_python_method_def import AddIntIntIntPythonMethodDef
 from .empty_body_python_method import EmptyBodyPythonMethod
+from .instrumentation import Instrumentation
 from .method_binding_criteria import MethodBindingCriteria
+from .method_implementation_registry import MethodImplementationRegistry
 from .method_parameter import MethodParameter
 from .python_import import PythonImport
 from .python_method_def import PythonMethodDef
 from .python_method import PythonMethod
 from pythoneda.shared import BaseObject
-from stringtemplate3 import StringTemplateGroup
-from typing import List
+from .template_registry import TemplateRegistry
+from typing import List, TextIO, Tuple
 
 
 class PythonedaSandboxPocCacSamplePy(BaseObject):
@@ -46,12 +47,28 @@ class PythonedaSandboxPocCacSamplePy(BaseObject):
         - None
     """
 
-    def __init__(self, methodBindingCriteria: MethodBindingCriteria = None):
+    def __init__(
+        self,
+        methodBindingCriteria: MethodBindingCriteria = None,
+        methodImplementations: MethodImplementationRegistry = None,
+    ):
         """
         Creates a new PythonedaSandboxPocCacSamplePy instance.
+        :param methodBindingCriteria: The criteria for binding methods.
+        :type methodBindingCriteria: pythoneda.sandbox.poc.cac.MethodBindingCriteria
+        :param methodImplementations: The available method implementations.
+        :type methodImplementations: pythoneda.sandbox.poc.cac.MethodImplementationRegistry
         """
         super().__init__()
         self._method_binding_criteria = methodBindingCriteria
+        if methodImplementations is None:
+            methodImplementations = MethodImplementationRegistry(
+                [
+                    AddIntIntIntPythonMethod(),
+                    EmptyBodyPythonMethod(AddIntIntIntPythonMethodDef()),
+                ]
+            )
+        self._method_implementations = methodImplementations
         self._relative_file_path = "pythoneda/sandbox/poc/cac/sample.py"
         self._file_description = "This file defines the Sample class."
         self._copyright_preamble = """Copyright (C) 2024-today rydnr's https://github.com/pythoneda-sandbox/poccac
@@ -75,7 +92,9 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>."""
         self._class_responsibilities = ["Show a sample code."]
         self._class_collaborators = []
         self._constructor = None  # OfficialPythonMethod(self.name)
-        self._method_defs = [AddIntIntIntPythonMethodDef()]
+        self._method_defs = (AddIntIntIntPythonMethodDef(),)
+        self._resolved_methods = None
+        self._resolved_version = None
 
     @property
     def method_binding_criteria(self) -> MethodBindingCriteria:
@@ -86,6 +105,44 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>."""
         """
         return self._method_binding_criteria
 
+    @method_binding_criteria.setter
+    def method_binding_criteria(self, criteria: MethodBindingCriteria):
+        """
+        Specifies the method binding criteria.
+        :param criteria: The new criteria.
+        :type criteria: pythoneda.sandbox.poc.cac.MethodBindingCriteria
+        """
+        self._method_binding_criteria = criteria
+        self._resolved_methods = None
+
+    @property
+    def method_defs(self) -> Tuple[PythonMethodDef, ...]:
+        """
+        Retrieves the method definitions. They can only be changed by setting new ones.
+        :return: Such definitions.
+        :rtype: Tuple[pythoneda.sandbox.poc.cac.PythonMethodDef, ...]
+        """
+        return self._method_defs
+
+    @method_defs.setter
+    def method_defs(self, methodDefs: List[PythonMethodDef]):
+        """
+        Specifies the method definitions.
+        :param methodDefs: The new definitions.
+        :type methodDefs: List[pythoneda.sandbox.poc.cac.PythonMethodDef]
+        """
+        self._method_defs = tuple(methodDefs)
+        self._resolved_methods = None
+
+    @property
+    def method_implementations(self) -> MethodImplementationRegistry:
+        """
+        Retrieves the available method implementations.
+        :return: Such implementations.
+        :rtype: pythoneda.sandbox.poc.cac.MethodImplementationRegistry
+        """
+        return self._method_implementations
+
     @property
     def relative_file_path(self) -> str:
         """
@@ -179,31 +236,29 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>."""
     @property
     def methods(self) -> List[PythonMethod]:
         """
-        Retrieves the methods.
+        Retrieves the methods. They're resolved once, and again only when the
+        criteria, the method definitions or the available implementations change.
         :return: Such methods.
         :rtype: List[pythoneda.sandbox.poc.cac.PythonMethod]
         """
-        return list(map(lambda m: self._resolve(m), self._method_defs))
+        version = self.method_implementations.version
+        if self._resolved_methods is None or self._resolved_version != version:
+            self._resolved_methods = [self._resolve(m) for m in self._method_defs]
+            self._resolved_version = version
+
+        return self._resolved_methods
 
     def _resolve(self, methodDef: PythonMethodDef) -> PythonMethod:
         """
         Resolves given method definition.
         :param methodDef: The method definition.
         :type methodDef: pythoneda.sandbox.poc.cac.PythonMethodDef
+        :return: The implementation.
+        :rtype: pythoneda.sandbox.poc.cac.PythonMethod
         """
-        available_methods = [
-            AddIntIntIntPythonMethod(),
-            EmptyBodyPythonMethod(AddIntIntIntPythonMethodDef()),
-        ]
-
-        result = None
-
-        for method in available_methods:
-            if self.method_binding_criteria.is_satisfied_by(methodDef, method):
-                result = method
-                break
-
-        return result
+        return self.method_implementations.resolve(
+            methodDef, self.method_binding_criteria
+        )
 
     @property
     def template(self) -> str:
@@ -233,17 +288,6 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>."""
 //
 group Sample;
 
-// editor preamble template
-editor_preamble() ::= <<
-# vim: set fileencoding=utf-8
->>
-
-// imports template
-// - deps: The dependencies.
-imports(deps) ::= <<
-<deps: { dep |<import(dep=dep)>}; separator="\n">
->>
-
 // class template
 // - inst: The Sample instance.
 class(inst) ::= <<
@@ -265,32 +309,6 @@ class <inst.name>(<parents(parents=inst.parents)>):
     <methods(methods=inst.methods)><endif>
 >>
 
-collaborators(collaborators) ::= <<
-<if(collaborators)><collaborators: { collaborator |- <collaborator>}; separator="\n"><else>- None<endif>
->>
-
-// parents template
-// - inst: The Sample instance.
-parents(parents) ::= <<
-<parents: { parent |<parent>}; separator=", ">
->>
-
-import(dep) ::= <<
-from <dep.package> import <dep.asset>
->>
-
-// editor settings template
-editor_settings() ::= <<
-# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
-# Local Variables:
-# mode: python
-# python-indent-offset: 4
-# tab-width: 4
-# indent-tabs-mode: nil
-# fill-column: 79
-# End:
->>
-
 // methods template
 // - methods: The methods.
 methods(methods) ::= <<
@@ -327,13 +345,17 @@ root(inst) ::= <<
         :return: Such content.
         :rtype: str
         """
-        # Create a group from the string content
-        group = StringTemplateGroup(name="Sample", file=StringIO(self.template))
-
-        root_template = group.getInstanceOf("root")
-        root_template["inst"] = self
+        with Instrumentation.timed("template.render"):
+            return TemplateRegistry.render("Sample", self.template, inst=self)
 
-        return str(root_template)
+    async def render_to(self, stream: TextIO):
+        """
+        Writes the file content to given stream as it gets rendered.
+        :param stream: The stream to write to.
+        :type stream: TextIO
+        """
+        with Instrumentation.timed("template.render"):
+            TemplateRegistry.render_to(stream, "Sample", self.template, inst=self)
 
 
 # vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
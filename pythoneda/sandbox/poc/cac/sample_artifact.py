@@ -20,9 +20,10 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 from pythoneda.shared import BaseObject
-from pythoneda.shared.git import GitRepo
-from pythoneda.shared.git.github import RepositoryAccess
-from typing import List
+from typing import List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pythoneda.shared.git import GitRepo
 
 
 class Sample(BaseObject):
@@ -57,12 +58,14 @@ class Sample(BaseObject):
         return self._github_token
 
     @property
-    async def git_repository(self) -> GitRepo:
+    async def git_repository(self) -> "GitRepo":
         """
         Retrieves the git repository.
         :return: Such repository.
         :rtype: pythoneda.shared.git.GitRepo
         """
+        from pythoneda.shared.git.github import RepositoryAccess
+
         return await RepositoryAccess(self.github_token).fetch(
             "pythoneda-shared-git", "shared"
         )
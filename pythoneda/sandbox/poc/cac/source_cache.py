@@ -0,0 +1,237 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/source_cache.py
+
+This file declares the SourceCache class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import ast
+from .instrumentation import Instrumentation
+from .module_ast_index import ModuleAstIndex
+import os
+from .persistent_ast_index_cache import PersistentAstIndexCache
+from .python_import import PythonImport
+from .python_import_find import PythonImportFind
+from pythoneda.shared import BaseObject
+from types import ModuleType
+from typing import Callable, List, Type
+
+
+class SourceCache(BaseObject):
+    """
+    Reads and parses the source code of each module only once.
+
+    Class name: SourceCache
+
+    Responsibilities:
+        - Keep the source code and the index of the modules already read.
+        - Extract the source code of classes and functions from those indexes.
+        - Extract the imports of modules and methods from those indexes.
+
+    Collaborators:
+        - pythoneda.sandbox.poc.cac.ModuleAstIndex
+        - pythoneda.sandbox.poc.cac.PersistentAstIndexCache
+    """
+
+    def __init__(self, persistentCache: PersistentAstIndexCache = None):
+        """
+        Creates a new SourceCache instance.
+        :param persistentCache: The on-disk cache of indexes. Defaults to
+        PersistentAstIndexCache.default(), if any.
+        :type persistentCache: pythoneda.sandbox.poc.cac.PersistentAstIndexCache
+        """
+        super().__init__()
+        self._sources = {}
+        self._indexes = {}
+        self._persistent_cache = (
+            persistentCache
+            if persistentCache is not None
+            else PersistentAstIndexCache.default()
+        )
+
+    @property
+    def persistent_cache(self) -> PersistentAstIndexCache:
+        """
+        Retrieves the on-disk cache of indexes, if any.
+        :return: Such cache.
+        :rtype: pythoneda.sandbox.poc.cac.PersistentAstIndexCache
+        """
+        return self._persistent_cache
+
+    def source_of(self, module: ModuleType) -> str:
+        """
+        Retrieves the source code of given module.
+        :param module: The module.
+        :type module: types.ModuleType
+        :return: Such source code.
+        :rtype: str
+        """
+        result = self._sources.get(module.__name__, None)
+        if result is None:
+            import inspect
+
+            with Instrumentation.timed("inspect.getsource"):
+                try:
+                    result = inspect.getsource(module)
+                except OSError:
+                    # inspect rejects empty files, i.e. most __init__.py
+                    path = inspect.getsourcefile(module)
+                    if path is None or os.path.getsize(path) > 0:
+                        raise
+                    result = ""
+            self._sources[module.__name__] = result
+
+        return result
+
+    def index_of(self, module: ModuleType) -> ModuleAstIndex:
+        """
+        Retrieves the index of given module.
+        :param module: The module.
+        :type module: types.ModuleType
+        :return: Such index.
+        :rtype: pythoneda.sandbox.poc.cac.ModuleAstIndex
+        """
+        result = self._indexes.get(module.__name__, None)
+        if result is None:
+            if self._persistent_cache is None:
+                result = ModuleAstIndex(self.source_of(module))
+            else:
+                result = self._persistent_cache.index_for(self.source_of(module))
+            self._indexes[module.__name__] = result
+
+        return result
+
+    def lines_of(self, module: ModuleType) -> List[str]:
+        """
+        Retrieves the source lines of given module, including line endings.
+        :param module: The module.
+        :type module: types.ModuleType
+        :return: Such lines.
+        :rtype: List[str]
+        """
+        return self.index_of(module).lines
+
+    def tree_of(self, module: ModuleType) -> ast.Module:
+        """
+        Retrieves the syntax tree of given module.
+        :param module: The module.
+        :type module: types.ModuleType
+        :return: Such tree.
+        :rtype: ast.Module
+        """
+        return self.index_of(module).tree
+
+    def imports_of(self, module: ModuleType) -> List[PythonImport]:
+        """
+        Retrieves the module-level imports of given module; those within classes
+        and functions belong to them. Each call returns new instances, since callers
+        are allowed to rename them.
+        :param module: The module.
+        :type module: types.ModuleType
+        :return: Such imports.
+        :rtype: List[pythoneda.sandbox.poc.cac.PythonImport]
+        """
+        return self.index_of(module).module_imports
+
+    def class_source_of(self, target: Type) -> str:
+        """
+        Retrieves the source code of given class.
+        :param target: The class.
+        :type target: Type
+        :return: Such source code.
+        :rtype: str
+        """
+        import inspect
+
+        entry = self.index_of(inspect.getmodule(target)).entry(target.__qualname__)
+        if entry is None:
+            with Instrumentation.timed("inspect.getsource"):
+                return inspect.getsource(target)
+
+        return entry.source
+
+    def function_source_of(self, function: Callable) -> str:
+        """
+        Retrieves the source code of given function.
+        :param function: The function.
+        :type function: Callable
+        :return: Such source code.
+        :rtype: str
+        """
+        import inspect
+
+        module = inspect.getmodule(function)
+        entry = None
+        if module is not None:
+            entry = self.index_of(module).entry(
+                function.__qualname__, function.__code__.co_firstlineno
+            )
+        if entry is None:
+            with Instrumentation.timed("inspect.getsource"):
+                return inspect.getsource(function)
+
+        return entry.source
+
+    def function_node_of(self, function: Callable) -> ast.AST:
+        """
+        Retrieves the already-parsed declaration of given function.
+        The node is shared with the module tree, so it must not be modified.
+        :param function: The function.
+        :type function: Callable
+        :return: Such node, or None if the function is not found in its module.
+        :rtype: Union[ast.FunctionDef, ast.AsyncFunctionDef]
+        """
+        import inspect
+
+        result = None
+        module = inspect.getmodule(function)
+        if module is not None:
+            result = self.index_of(module).node_of(
+                function.__qualname__, function.__code__.co_firstlineno
+            )
+
+        return result
+
+    def method_imports_of(self, target: Type, methodName: str) -> List[PythonImport]:
+        """
+        Retrieves the imports declared within a method of given class.
+        :param target: The class.
+        :type target: Type
+        :param methodName: The method name.
+        :type methodName: str
+        :return: Such imports.
+        :rtype: List[pythoneda.sandbox.poc.cac.PythonImport]
+        """
+        import inspect
+
+        index = self.index_of(inspect.getmodule(target))
+        if index.entry(target.__qualname__) is None:
+            with Instrumentation.timed("inspect.getsource"):
+                source = inspect.getsource(target)
+            return PythonImportFind(source, methodName).imports
+
+        return index.imports_of_method(target.__qualname__, methodName)
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
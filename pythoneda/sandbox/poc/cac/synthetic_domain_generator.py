@@ -0,0 +1,336 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/synthetic_domain_generator.py
+
+This file declares the SyntheticDomainGenerator class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+from pythoneda.shared import BaseObject
+from typing import List, Tuple
+
+
+class SyntheticDomainGenerator(BaseObject):
+    """
+    Builds synthetic domain packages, to measure how artifacts scale.
+
+    Class name: SyntheticDomainGenerator
+
+    Responsibilities:
+        - Write a package with the requested number of modules, classes, methods,
+          properties, classmethods and imports.
+        - Know which modules and classes it wrote.
+
+    Collaborators:
+        - pythoneda.sandbox.poc.cac.ArtifactBenchmark
+    """
+
+    def __init__(
+        self,
+        packageName: str,
+        moduleCount: int = 10,
+        classesPerModule: int = 1,
+        methodsPerClass: int = 2,
+        importFanOut: int = 2,
+        propertiesPerClass: int = 1,
+        classmethodsPerClass: int = 1,
+    ):
+        """
+        Creates a new SyntheticDomainGenerator instance.
+        :param packageName: The name of the package.
+        :type packageName: str
+        :param moduleCount: The number of modules.
+        :type moduleCount: int
+        :param classesPerModule: The number of classes in each module.
+        :type classesPerModule: int
+        :param methodsPerClass: The number of regular methods in each class.
+        Each one declares a local import.
+        :type methodsPerClass: int
+        :param importFanOut: The number of sibling modules each module imports
+        from. Only previous modules are imported, to avoid cycles.
+        :type importFanOut: int
+        :param propertiesPerClass: The number of properties in each class.
+        :type propertiesPerClass: int
+        :param classmethodsPerClass: The number of classmethods in each class.
+        :type classmethodsPerClass: int
+        """
+        super().__init__()
+        self._package_name = packageName
+        self._module_count = moduleCount
+        self._classes_per_module = classesPerModule
+        self._methods_per_class = methodsPerClass
+        self._import_fan_out = importFanOut
+        self._properties_per_class = propertiesPerClass
+        self._classmethods_per_class = classmethodsPerClass
+
+    @property
+    def package_name(self) -> str:
+        """
+        Retrieves the name of the package.
+        :return: Such name.
+        :rtype: str
+        """
+        return self._package_name
+
+    @property
+    def module_count(self) -> int:
+        """
+        Retrieves the number of modules.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._module_count
+
+    @property
+    def classes_per_module(self) -> int:
+        """
+        Retrieves the number of classes in each module.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._classes_per_module
+
+    @property
+    def methods_per_class(self) -> int:
+        """
+        Retrieves the number of regular methods in each class.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._methods_per_class
+
+    @property
+    def import_fan_out(self) -> int:
+        """
+        Retrieves the number of sibling modules each module imports from.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._import_fan_out
+
+    @property
+    def properties_per_class(self) -> int:
+        """
+        Retrieves the number of properties in each class.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._properties_per_class
+
+    @property
+    def classmethods_per_class(self) -> int:
+        """
+        Retrieves the number of classmethods in each class.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._classmethods_per_class
+
+    @property
+    def module_names(self) -> List[str]:
+        """
+        Retrieves the qualified names of the modules.
+        :return: Such names.
+        :rtype: List[str]
+        """
+        return [
+            f"{self.package_name}.{self.__class__.module_name_of(m)}"
+            for m in range(self.module_count)
+        ]
+
+    @property
+    def classes(self) -> List[Tuple[str, str]]:
+        """
+        Retrieves the classes, in declaration order.
+        :return: The (module name, class name) tuples.
+        :rtype: List[Tuple[str, str]]
+        """
+        return [
+            (module_name, self.__class__.class_name_of(m, c))
+            for m, module_name in enumerate(self.module_names)
+            for c in range(self.classes_per_module)
+        ]
+
+    @classmethod
+    def module_name_of(cls, module: int) -> str:
+        """
+        Retrieves the name of the module at given position.
+        :param module: The position of the module.
+        :type module: int
+        :return: Such name.
+        :rtype: str
+        """
+        return f"module{module}"
+
+    @classmethod
+    def class_name_of(cls, module: int, index: int) -> str:
+        """
+        Retrieves the name of a class.
+        :param module: The position of the module.
+        :type module: int
+        :param index: The position of the class within the module.
+        :type index: int
+        :return: Such name.
+        :rtype: str
+        """
+        return f"Module{module}Entity{index}"
+
+    @classmethod
+    def method_name_of(cls, index: int) -> str:
+        """
+        Retrieves the name of a regular method.
+        :param index: The position of the method.
+        :type index: int
+        :return: Such name.
+        :rtype: str
+        """
+        return f"operation{index}"
+
+    def _imports_of(self, module: int) -> List[str]:
+        """
+        Builds the import statements of given module.
+        :param module: The position of the module.
+        :type module: int
+        :return: Such statements.
+        :rtype: List[str]
+        """
+        result = ["from pythoneda.shared import BaseObject"]
+        for sibling in range(max(0, module - self.import_fan_out), module):
+            result.append(
+                f"from {self.package_name}.{self.__class__.module_name_of(sibling)} "
+                f"import {self.__class__.class_name_of(sibling, 0)}"
+            )
+
+        return result
+
+    def _class_source(self, module: int, index: int) -> str:
+        """
+        Builds the source code of a class.
+        :param module: The position of the module.
+        :type module: int
+        :param index: The position of the class within the module.
+        :type index: int
+        :return: Such source code.
+        :rtype: str
+        """
+        name = self.__class__.class_name_of(module, index)
+        result = [
+            f"class {name}(BaseObject):",
+            '    """',
+            f"    Synthetic class #{index} of module #{module}.",
+            '    """',
+            "",
+            "    def __init__(self, value: int):",
+            '        """',
+            f"        Creates a new {name} instance.",
+            "        :param value: The value.",
+            "        :type value: int",
+            '        """',
+            "        super().__init__()",
+            "        self._value = value",
+        ]
+        for p in range(self.properties_per_class):
+            result.extend(
+                [
+                    "",
+                    "    @property",
+                    f"    def attribute{p}(self) -> int:",
+                    '        """',
+                    f"        Retrieves attribute #{p}.",
+                    "        :return: Such attribute.",
+                    "        :rtype: int",
+                    '        """',
+                    f"        return self._value + {p}",
+                ]
+            )
+        for m in range(self.methods_per_class):
+            method_name = self.__class__.method_name_of(m)
+            result.extend(
+                [
+                    "",
+                    f"    def {method_name}(self, count: int) -> int:",
+                    '        """',
+                    f"        Performs operation #{m}.",
+                    "        :param count: How many times.",
+                    "        :type count: int",
+                    "        :return: The result.",
+                    "        :rtype: int",
+                    '        """',
+                    "        import itertools",
+                    "",
+                    f"        return sum(itertools.repeat(self._value + {m}, count))",
+                ]
+            )
+        for c in range(self.classmethods_per_class):
+            result.extend(
+                [
+                    "",
+                    "    @classmethod",
+                    f'    def create{c}(cls) -> "{name}":',
+                    '        """',
+                    f"        Creates an instance with value {c}.",
+                    "        :return: Such instance.",
+                    f"        :rtype: {name}",
+                    '        """',
+                    f"        return cls({c})",
+                ]
+            )
+
+        return "\n".join(result) + "\n"
+
+    def module_source(self, module: int) -> str:
+        """
+        Builds the source code of given module.
+        :param module: The position of the module.
+        :type module: int
+        :return: Such source code.
+        :rtype: str
+        """
+        parts = ["\n".join(self._imports_of(module)) + "\n"]
+        for index in range(self.classes_per_module):
+            parts.append(self._class_source(module, index))
+
+        return "\n\n".join(parts)
+
+    def generate(self, folder: str) -> str:
+        """
+        Writes the package into given folder.
+        :param folder: The folder, usually one in `sys.path`.
+        :type folder: str
+        :return: The folder of the package.
+        :rtype: str
+        """
+        result = os.path.join(folder, *self.package_name.split("."))
+        os.makedirs(result, exist_ok=True)
+        with open(os.path.join(result, "__init__.py"), "w") as file:
+            file.write("")
+        for module in range(self.module_count):
+            path = os.path.join(result, f"{self.__class__.module_name_of(module)}.py")
+            with open(path, "w") as file:
+                file.write(self.module_source(module))
+
+        return result
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,967 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/template_compiler.py
+
+This file declares the TemplateCompiler class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .compiled_template_group import CompiledTemplateGroup
+from .instrumentation import Instrumentation
+from pythoneda.shared import BaseObject
+import re
+from .template_writer import TemplateWriter
+from typing import Any, Dict, List, Set, Tuple
+
+
+class TemplateCompiler(BaseObject):
+    """
+    Compiles StringTemplate groups into plain Python functions.
+
+    It supports the subset of StringTemplate the artifact templates use: attribute
+    references and properties, string literals, template includes with named or
+    single arguments, anonymous templates applied to lists, the separator option,
+    and <if>/<else>/<endif>. Whitespace, indentation and newline rules
+    follow StringTemplate's lexer, so the output is the same. Names are resolved
+    lexically, not dynamically, and anything else is rejected with a ValueError.
+
+    Class name: TemplateCompiler
+
+    Responsibilities:
+        - Parse template groups, templates and template expressions.
+        - Generate Python source rendering each template, and compile it.
+
+    Collaborators:
+        - pythoneda.sandbox.poc.cac.CompiledTemplateGroup
+        - pythoneda.sandbox.poc.cac.TemplateWriter
+    """
+
+    _action_token = re.compile(
+        r'\s+|(?P<id>[A-Za-z_][A-Za-z0-9_/]*)|(?P<str>"(?:\\.|[^"\\])*")'
+        r"|(?P<punct>[().,=:;!+\[\]])",
+        re.DOTALL,
+    )
+
+    _template_arguments = re.compile(
+        r"(?:\r\n|[ \t\r\n])?([A-Za-z_][A-Za-z0-9_/]*)"
+        r"((?:(?:\r\n|[ \t\r\n])?,(?:\r\n|[ \t\r\n])?[A-Za-z_][A-Za-z0-9_/]*)*)"
+        r"(?:\r\n|[ \t\r\n])?\|(?:\r\n|[ \t\r\n])?"
+    )
+
+    _escaped_chars = re.compile(r"<((?:\\(?:[nrt ]|u[0-9a-fA-F]{4}))+)>")
+
+    _functions = ("first", "rest", "last", "length", "strip", "trunc", "super")
+
+    def __init__(
+        self, name: str, template: str, superGroup: CompiledTemplateGroup = None
+    ):
+        """
+        Creates a new TemplateCompiler instance.
+        :param name: The group name.
+        :type name: str
+        :param template: The group text.
+        :type template: str
+        :param superGroup: The group to take missing templates from, if any.
+        :type superGroup: pythoneda.sandbox.poc.cac.CompiledTemplateGroup
+        """
+        super().__init__()
+        self._name = name
+        self._template = template
+        self._super_group = superGroup
+        self._arguments: Dict[str, List[str]] = {}
+        self._lines: List[str] = []
+        self._counter = 0
+
+    @classmethod
+    def compile(
+        cls, name: str, template: str, superGroup: CompiledTemplateGroup = None
+    ) -> CompiledTemplateGroup:
+        """
+        Compiles given group.
+        :param name: The group name.
+        :type name: str
+        :param template: The group text.
+        :type template: str
+        :param superGroup: The group to take missing templates from, if any.
+        :type superGroup: pythoneda.sandbox.poc.cac.CompiledTemplateGroup
+        :return: The compiled group.
+        :rtype: pythoneda.sandbox.poc.cac.CompiledTemplateGroup
+        """
+        with Instrumentation.timed("template.compile"):
+            return cls(name, template, superGroup).build()
+
+    def build(self) -> CompiledTemplateGroup:
+        """
+        Generates the source of every template in the group, and compiles it.
+        :return: The compiled group.
+        :rtype: pythoneda.sandbox.poc.cac.CompiledTemplateGroup
+        """
+        templates = self.__class__.templates_of(self._template)
+        inherited = {}
+        if self._super_group is not None:
+            self._arguments.update(self._super_group.arguments)
+            inherited = self._super_group.functions
+        for name, (arguments, _) in templates.items():
+            self._arguments[name] = arguments
+
+        self._lines = [f"# Template group {self._name}", ""]
+        for name, (arguments, body) in templates.items():
+            self._compile_template(name, arguments, body)
+        source = "\n".join(self._lines)
+
+        namespace: Dict[str, Any] = {"_property": TemplateWriter.property_of}
+        for name, function in inherited.items():
+            namespace[self.__class__._function_name(name)] = function
+        exec(compile(source, f"<template group {self._name}>", "exec"), namespace)
+
+        functions = dict(inherited)
+        for name in templates:
+            functions[name] = namespace[self.__class__._function_name(name)]
+
+        return CompiledTemplateGroup(
+            self._name, functions, dict(self._arguments), source, self._super_group
+        )
+
+    @classmethod
+    def _function_name(cls, templateName: str) -> str:
+        """
+        Builds the name of the function rendering a template.
+        :param templateName: The template name.
+        :type templateName: str
+        :return: The function name.
+        :rtype: str
+        """
+        return "t_" + templateName.replace("/", "__")
+
+    @classmethod
+    def templates_of(cls, group: str) -> Dict[str, Tuple[List[str], str]]:
+        """
+        Parses a group, as StringTemplate's group lexer does.
+        :param group: The group text.
+        :type group: str
+        :return: The formal arguments and the text of each template, by name.
+        :rtype: Dict[str, Tuple[List[str], str]]
+        """
+        result = {}
+        declaration = re.compile(r"\s*([A-Za-z_][A-Za-z0-9_/]*)\s*\(([^)]*)\)\s*::=\s*")
+        header = re.compile(r"\s*group\s+[A-Za-z_][A-Za-z0-9_]*[^;]*;")
+        position = cls._skip_comments(group, 0)
+        match = header.match(group, position)
+        if match is None:
+            raise ValueError(f"Missing group declaration in {group[:40]!r}")
+        position = cls._skip_comments(group, match.end())
+        while position < len(group):
+            match = declaration.match(group, position)
+            if match is None:
+                raise ValueError(f"Unsupported group syntax: {group[position:][:40]!r}")
+            arguments = [a.strip() for a in match.group(2).split(",") if a.strip()]
+            for argument in arguments:
+                if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_/]*", argument):
+                    raise ValueError(f"Unsupported argument {argument!r}")
+            position = match.end()
+            if group.startswith("<<", position):
+                body, position = cls._big_string_at(group, position + 2)
+            elif group.startswith('"', position):
+                body, position = cls._string_at(group, position + 1)
+            else:
+                raise ValueError(f"Unsupported template {match.group(1)}")
+            result[match.group(1)] = (arguments, body)
+            position = cls._skip_comments(group, position)
+
+        return result
+
+    @classmethod
+    def _skip_comments(cls, text: str, position: int) -> int:
+        """
+        Skips whitespace and comments in a group.
+        :param text: The group text.
+        :type text: str
+        :param position: The current position.
+        :type position: int
+        :return: The position of the next token.
+        :rtype: int
+        """
+        while True:
+            while position < len(text) and text[position].isspace():
+                position += 1
+            if text.startswith("//", position):
+                end = text.find("\n", position)
+                position = len(text) if end < 0 else end + 1
+            elif text.startswith("/*", position):
+                end = text.find("*/", position + 2)
+                if end < 0:
+                    raise ValueError("Unterminated comment")
+                position = end + 2
+            else:
+                return position
+
+    @classmethod
+    def _big_string_at(cls, text: str, position: int) -> Tuple[str, int]:
+        """
+        Reads a `<<...>>` template, dropping the newlines right after `<<` and
+        right before `>>`.
+        :param text: The group text.
+        :type text: str
+        :param position: The position after `<<`.
+        :type position: int
+        :return: The template text, and the position after `>>`.
+        :rtype: Tuple[str, int]
+        """
+        if text.startswith("\r\n", position):
+            position += 2
+        elif text.startswith("\n", position) or text.startswith("\r", position):
+            position += 1
+        chars = []
+        while not text.startswith(">>", position):
+            if position >= len(text):
+                raise ValueError("Unterminated template")
+            if text.startswith("\\>", position):
+                chars.append(">")
+                position += 2
+            else:
+                chars.append(text[position])
+                position += 1
+        result = "".join(chars)
+        for newline in ("\r\n", "\n", "\r"):
+            if result.endswith(newline):
+                result = result[: -len(newline)]
+                break
+
+        return result, position + 2
+
+    @classmethod
+    def _string_at(cls, text: str, position: int) -> Tuple[str, int]:
+        """
+        Reads a `"..."` template.
+        :param text: The group text.
+        :type text: str
+        :param position: The position after the opening quote.
+        :type position: int
+        :return: The template text, and the position after the closing quote.
+        :rtype: Tuple[str, int]
+        """
+        chars = []
+        while position < len(text) and text[position] != '"':
+            if text.startswith('\\"', position):
+                chars.append('"')
+                position += 2
+            elif text[position] == "\\" and position + 1 < len(text):
+                chars.append(text[position : position + 2])
+                position += 2
+            else:
+                chars.append(text[position])
+                position += 1
+        if position >= len(text):
+            raise ValueError("Unterminated template")
+
+        return "".join(chars), position + 1
+
+    @classmethod
+    def tokens_of(cls, body: str) -> List[Tuple]:
+        """
+        Splits a template into tokens, as StringTemplate's angle-bracket lexer does:
+        the whitespace before an expression at the start of a line becomes its
+        indentation, and the newlines after `<if(...)>`, `<else>`, and `<endif>`
+        on a line by itself, are dropped.
+        :param body: The template text.
+        :type body: str
+        :return: The ("literal", text), ("newline",), ("action", text, indentation),
+        ("if", condition), ("elseif", condition), ("else",) and ("endif",) tokens.
+        :rtype: List[Tuple]
+        """
+        result = []
+        position = 0
+        column = 1
+        indentation = None
+        size = len(body)
+        while position < size:
+            char = body[position]
+            if char in "\r\n":
+                position += 2 if body.startswith("\r\n", position) else 1
+                result.append(("newline",))
+                column = 1
+                indentation = None
+            elif char == "<":
+                token, end = cls._action_at(body, position, column, indentation)
+                column = cls._column_after(body[position:end], column)
+                position = end
+                if token is not None:
+                    result.append(token)
+            else:
+                chars = []
+                while position < size and body[position] not in "<\r\n":
+                    char = body[position]
+                    if char == "\\" and position + 1 < size:
+                        following = body[position + 1]
+                        if following in "<>\\":
+                            chars.append(following)
+                            position += 2
+                            column += 2
+                            continue
+                        if following not in "\r\n":
+                            chars.append(body[position : position + 2])
+                            position += 2
+                            column += 2
+                            continue
+                    if char in " \t":
+                        start = position
+                        while position < size and body[position] in " \t":
+                            position += 1
+                        if column == 1 and body.startswith("<", position):
+                            indentation = body[start:position]
+                        else:
+                            indentation = None
+                            chars.append(body[start:position])
+                        column += position - start
+                        continue
+                    chars.append(char)
+                    position += 1
+                    column += 1
+                if chars:
+                    result.append(("literal", "".join(chars)))
+
+        return result
+
+    @classmethod
+    def _column_after(cls, text: str, column: int) -> int:
+        """
+        Computes the column after given text.
+        :param text: The text.
+        :type text: str
+        :param column: The column before it, starting at 1.
+        :type column: int
+        :return: The column after it.
+        :rtype: int
+        """
+        newline = max(text.rfind("\n"), text.rfind("\r"))
+        if newline < 0:
+            return column + len(text)
+
+        return len(text) - newline
+
+    @classmethod
+    def _action_at(
+        cls, body: str, position: int, column: int, indentation: str
+    ) -> Tuple[Tuple, int]:
+        """
+        Reads the expression starting at given position.
+        :param body: The template text.
+        :type body: str
+        :param position: The position of `<`.
+        :type position: int
+        :param column: The column of `<`.
+        :type column: int
+        :param indentation: The indentation for the expression, if any.
+        :type indentation: str
+        :return: The token, if any, and the position after it.
+        :rtype: Tuple[Tuple, int]
+        """
+        if body.startswith("<!", position):
+            end = body.find("!>", position + 2)
+            if end < 0:
+                raise ValueError("Unterminated comment")
+            end += 2
+            if column == 1:
+                end = cls._newline_after(body, end)
+            return None, end
+
+        match = cls._escaped_chars.match(body, position)
+        if match is not None:
+            text = re.sub(
+                r"\\(u[0-9a-fA-F]{4}|.)",
+                lambda m: (
+                    chr(int(m.group(1)[1:], 16))
+                    if len(m.group(1)) > 1
+                    else {"n": "\n", "r": "\r", "t": "\t", " ": " "}[m.group(1)]
+                ),
+                match.group(1),
+            )
+            return ("literal", text), match.end()
+
+        match = re.compile(r"<(if|elseif) *\(").match(body, position)
+        if match is not None:
+            end = cls._closing_at(body, match.end(), "(", ")")
+            if not body.startswith(">", end + 1):
+                raise ValueError(f"Missing '>' after <{match.group(1)}(...)")
+            return (
+                (match.group(1), body[match.end() : end]),
+                cls._newline_after(body, end + 2),
+            )
+        if body.startswith("<else>", position):
+            return ("else",), cls._newline_after(body, position + 6)
+        if body.startswith("<endif>", position):
+            end = position + 7
+            if column == 1:
+                end = cls._newline_after(body, end)
+            return ("endif",), end
+
+        end = position + 1
+        size = len(body)
+        while end < size and body[end] != ">":
+            char = body[end]
+            if char == "\\":
+                end += 2
+            elif char == "{":
+                end = cls._closing_at(body, end + 1, "{", "}") + 1
+            elif char in "=+" and body.startswith('"', end + 1):
+                end = cls._closing_at(body, end + 2, None, '"') + 1
+            elif char in "=+" and body.startswith("<<", end + 1):
+                end = body.find(">>", end + 3)
+                if end < 0:
+                    raise ValueError("Unterminated template")
+                end += 2
+            else:
+                end += 1
+        if end >= size:
+            raise ValueError(f"Unterminated expression {body[position:][:40]!r}")
+
+        return ("action", body[position + 1 : end], indentation), end + 1
+
+    @classmethod
+    def _newline_after(cls, body: str, position: int) -> int:
+        """
+        Skips a newline at given position, if any.
+        :param body: The template text.
+        :type body: str
+        :param position: The position.
+        :type position: int
+        :return: The position after the newline.
+        :rtype: int
+        """
+        if body.startswith("\r\n", position):
+            return position + 2
+        if body.startswith("\n", position) or body.startswith("\r", position):
+            return position + 1
+
+        return position
+
+    @classmethod
+    def _closing_at(cls, text: str, position: int, opening: str, closing: str) -> int:
+        """
+        Finds the closing delimiter, skipping escapes and nested delimiters.
+        :param text: The text.
+        :type text: str
+        :param position: The position after the opening delimiter.
+        :type position: int
+        :param opening: The opening delimiter, if it can be nested.
+        :type opening: str
+        :param closing: The closing delimiter.
+        :type closing: str
+        :return: The position of the closing delimiter.
+        :rtype: int
+        """
+        depth = 0
+        while position < len(text):
+            char = text[position]
+            if char == "\\":
+                position += 2
+                continue
+            if char == closing:
+                if depth == 0:
+                    return position
+                depth -= 1
+            elif char == opening:
+                depth += 1
+            position += 1
+
+        raise ValueError(f"Missing {closing!r}")
+
+    @classmethod
+    def chunks_of(cls, tokens: List[Tuple]) -> List[Tuple]:
+        """
+        Groups the tokens of a template, nesting conditionals. As StringTemplate
+        does, newlines right before `<else>` and `<endif>` are dropped.
+        :param tokens: The tokens.
+        :type tokens: List[Tuple]
+        :return: The ("text", text), ("newline",), ("action", text, indentation)
+        and ("if", [(condition, chunks)], elseChunks) chunks.
+        :rtype: List[Tuple]
+        """
+        position = 0
+
+        def template(stop: Tuple[str, ...]) -> List[Tuple]:
+            nonlocal position
+            result = []
+            while position < len(tokens):
+                token = tokens[position]
+                if token[0] in stop:
+                    return result
+                position += 1
+                if token[0] == "literal":
+                    result.append(("text", token[1]))
+                elif token[0] == "newline":
+                    following = tokens[position][0] if position < len(tokens) else None
+                    if following not in ("else", "endif"):
+                        result.append(("newline",))
+                elif token[0] == "action":
+                    result.append(token)
+                elif token[0] == "if":
+                    branches = [(token[1], template(("elseif", "else", "endif")))]
+                    otherwise = None
+                    if tokens[position][0] == "elseif":
+                        raise ValueError("Unsupported <elseif>")
+                    if tokens[position][0] == "else":
+                        position += 1
+                        otherwise = template(("endif",))
+                    position += 1
+                    result.append(("if", branches, otherwise))
+                else:
+                    raise ValueError(f"Unexpected <{token[0]}>")
+            if stop:
+                raise ValueError("Missing <endif>")
+
+            return result
+
+        return template(())
+
+    @classmethod
+    def parse_action(cls, text: str) -> Tuple[Tuple, Dict[str, Tuple]]:
+        """
+        Parses a template expression.
+        :param text: The expression, without the angle brackets.
+        :type text: str
+        :return: The expression tree, and its options. Nodes are
+        ("attribute", name, [properties]), ("string", value),
+        ("include", name, arguments), ("map", expression, template),
+        ("anonymous", [arguments], body) and ("not", expression).
+        :rtype: Tuple[Tuple, Dict[str, Tuple]]
+        """
+        tokens = cls._action_tokens_of(text)
+        position = 0
+
+        def peek(offset: int = 0) -> Tuple[str, str]:
+            index = position + offset
+            return tokens[index] if index < len(tokens) else ("end", "")
+
+        def take(kind: str = None, value: str = None) -> Tuple[str, str]:
+            nonlocal position
+            token = peek()
+            if (kind and token[0] != kind) or (value and token[1] != value):
+                raise ValueError(f"Unsupported expression <{text}>")
+            position += 1
+            return token
+
+        def primary() -> Tuple:
+            token = take()
+            if token[0] == "string":
+                return ("string", token[1])
+            if token[0] == "id" and token[1] not in cls._functions:
+                if peek()[1] == "(":
+                    return ("include", token[1], arguments())
+                properties = []
+                while peek()[1] == ".":
+                    take()
+                    properties.append(take("id")[1])
+                return ("attribute", token[1], properties)
+            raise ValueError(f"Unsupported expression <{text}>")
+
+        def templates() -> Tuple:
+            result = primary()
+            while peek()[1] == ":":
+                take()
+                token = take()
+                if token[0] == "anonymous":
+                    template = cls._anonymous_template_of(token[1])
+                elif token[0] == "id" and peek()[1] == "(":
+                    template = ("include", token[1], arguments())
+                else:
+                    raise ValueError(f"Unsupported expression <{text}>")
+                if peek()[1] == ",":
+                    raise ValueError(f"Unsupported alternating templates <{text}>")
+                result = ("map", result, template)
+            if peek()[1] == "+":
+                raise ValueError(f"Unsupported concatenation <{text}>")
+            return result
+
+        def arguments() -> Tuple:
+            take("punct", "(")
+            if peek()[1] == ")":
+                take()
+                return ("none",)
+            if peek()[0] == "id" and peek(1)[1] == "=":
+                named = []
+                while True:
+                    name = take("id")[1]
+                    take("punct", "=")
+                    named.append((name, templates()))
+                    if peek()[1] != ",":
+                        break
+                    take()
+                take("punct", ")")
+                return ("named", named)
+            result = ("single", templates())
+            take("punct", ")")
+            return result
+
+        negated = peek()[1] == "!"
+        if negated:
+            take()
+        expression = templates()
+        if negated:
+            expression = ("not", expression)
+        options = {}
+        if peek()[1] == ";":
+            take()
+            while True:
+                name = take("id")[1]
+                options[name] = None
+                if peek()[1] == "=":
+                    take()
+                    options[name] = primary()
+                if peek()[1] != ",":
+                    break
+                take()
+        take("end")
+
+        return expression, options
+
+    @classmethod
+    def _action_tokens_of(cls, text: str) -> List[Tuple[str, str]]:
+        """
+        Splits a template expression into tokens.
+        :param text: The expression.
+        :type text: str
+        :return: The ("id", name), ("string", value), ("anonymous", text),
+        ("punct", char) and ("end", "") tokens.
+        :rtype: List[Tuple[str, str]]
+        """
+        result = []
+        escapes = {"n": "\n", "r": "\r", "t": "\t", "b": "\b", "f": "\f"}
+        position = 0
+        while position < len(text):
+            if text[position] == "{":
+                end = cls._closing_at(text, position + 1, "{", "}")
+                result.append(("anonymous", text[position + 1 : end]))
+                position = end + 1
+                continue
+            match = cls._action_token.match(text, position)
+            if match is None:
+                raise ValueError(f"Unsupported expression <{text}>")
+            if match.group("id"):
+                result.append(("id", match.group("id")))
+            elif match.group("str"):
+                result.append(
+                    (
+                        "string",
+                        re.sub(
+                            r"\\(.)",
+                            lambda m: escapes.get(m.group(1), m.group(1)),
+                            match.group("str")[1:-1],
+                            flags=re.DOTALL,
+                        ),
+                    )
+                )
+            elif match.group("punct"):
+                result.append(("punct", match.group("punct")))
+            position = match.end()
+
+        return result
+
+    @classmethod
+    def _anonymous_template_of(cls, text: str) -> Tuple:
+        """
+        Parses an anonymous template: its arguments, and its body. Only one
+        whitespace character after `|` is dropped, as StringTemplate does.
+        :param text: The template, without the braces.
+        :type text: str
+        :return: The ("anonymous", [arguments], body) node.
+        :rtype: Tuple
+        """
+        match = cls._template_arguments.match(text)
+        if match is None:
+            raise ValueError(f"Unsupported anonymous template {text!r}")
+        arguments = [match.group(1)] + [
+            a.strip() for a in match.group(2).split(",") if a.strip()
+        ]
+        body = re.sub(r"\\([{}])", r"\1", text[match.end() :])
+
+        return ("anonymous", arguments, body)
+
+    def _emit(self, level: int, line: str):
+        """
+        Adds a line of generated code.
+        :param level: The indentation level.
+        :type level: int
+        :param line: The line.
+        :type line: str
+        """
+        self._lines.append("    " * level + line)
+
+    def _compile_template(self, name: str, arguments: List[str], body: str):
+        """
+        Generates the function rendering a template.
+        :param name: The template name.
+        :type name: str
+        :param arguments: The formal arguments.
+        :type arguments: List[str]
+        :param body: The template text.
+        :type body: str
+        """
+        parameters = "".join(
+            f", {CompiledTemplateGroup.variable_name(a)}=None" for a in arguments
+        )
+        self._emit(0, f"def {self.__class__._function_name(name)}(out{parameters}):")
+        self._emit(1, "w = out.write")
+        self._compile_body(body, set(arguments), 1)
+        self._emit(0, "")
+
+    def _compile_body(self, body: str, scope: Set[str], level: int):
+        """
+        Generates the code writing a template body.
+        :param body: The template text.
+        :type body: str
+        :param scope: The attributes available.
+        :type scope: Set[str]
+        :param level: The indentation level.
+        :type level: int
+        """
+        cls = self.__class__
+        self._compile_chunks(cls.chunks_of(cls.tokens_of(body)), scope, level)
+
+    def _compile_chunks(self, chunks: List[Tuple], scope: Set[str], level: int):
+        """
+        Generates the code writing given chunks. As StringTemplate does, the
+        newline after an expression is skipped if the expression writes nothing,
+        and it's the first chunk, or the only one in its line.
+        :param chunks: The chunks.
+        :type chunks: List[Tuple]
+        :param scope: The attributes available.
+        :type scope: Set[str]
+        :param level: The indentation level.
+        :type level: int
+        """
+        text = []
+        index = 0
+        while index <= len(chunks):
+            chunk = chunks[index] if index < len(chunks) else ("end",)
+            if chunk[0] in ("text", "newline"):
+                text.append(chunk[1] if chunk[0] == "text" else "\n")
+                index += 1
+                continue
+            if text:
+                self._emit(level, f"w({''.join(text)!r})")
+                text = []
+            if chunk[0] == "end":
+                break
+            skippable = (
+                index + 1 < len(chunks)
+                and chunks[index + 1][0] == "newline"
+                and (index == 0 or chunks[index - 1][0] == "newline")
+            )
+            if skippable:
+                self._counter += 1
+                mark = f"n_{self._counter}"
+                self._emit(level, f"{mark} = out.written")
+            if chunk[0] == "action":
+                self._compile_action(chunk[1], chunk[2], scope, level)
+            else:
+                self._compile_conditional(chunk[1], chunk[2], scope, level)
+            if skippable:
+                self._emit(level, f"if out.written != {mark}:")
+                self._emit(level + 1, "w('\\n')")
+                index += 1
+            index += 1
+
+    def _compile_conditional(
+        self,
+        branches: List[Tuple[str, List[Tuple]]],
+        otherwise: List[Tuple],
+        scope: Set[str],
+        level: int,
+    ):
+        """
+        Generates the code of a conditional. Conditions are true unless their
+        value is None, empty, or False.
+        :param branches: Each condition, and its chunks.
+        :type branches: List[Tuple[str, List[Tuple]]]
+        :param otherwise: The chunks of the `<else>` clause, if any.
+        :type otherwise: List[Tuple]
+        :param scope: The attributes available.
+        :type scope: Set[str]
+        :param level: The indentation level.
+        :type level: int
+        """
+        for index, (condition, chunks) in enumerate(branches):
+            expression, options = self.__class__.parse_action(condition)
+            if options:
+                raise ValueError(f"Unsupported condition ({condition})")
+            if expression[0] == "not":
+                test = f"not {self._value_of(expression[1], scope)}"
+            else:
+                test = self._value_of(expression, scope)
+            self._emit(level, f"{'elif' if index else 'if'} {test}:")
+            self._compile_block(chunks, scope, level + 1)
+        if otherwise is not None:
+            self._emit(level, "else:")
+            self._compile_block(otherwise, scope, level + 1)
+
+    def _compile_block(self, chunks: List[Tuple], scope: Set[str], level: int):
+        """
+        Generates the code of a block, which can't be empty.
+        :param chunks: The chunks.
+        :type chunks: List[Tuple]
+        :param scope: The attributes available.
+        :type scope: Set[str]
+        :param level: The indentation level.
+        :type level: int
+        """
+        start = len(self._lines)
+        self._compile_chunks(chunks, scope, level)
+        if len(self._lines) == start:
+            self._emit(level, "pass")
+
+    def _compile_action(
+        self, text: str, indentation: str, scope: Set[str], level: int
+    ):
+        """
+        Generates the code writing an expression.
+        :param text: The expression.
+        :type text: str
+        :param indentation: Its indentation, if any.
+        :type indentation: str
+        :param scope: The attributes available.
+        :type scope: Set[str]
+        :param level: The indentation level.
+        :type level: int
+        """
+        expression, options = self.__class__.parse_action(text)
+        separator = options.pop("separator", None)
+        if options or (separator is not None and separator[0] != "string"):
+            raise ValueError(f"Unsupported options in <{text}>")
+        separator = None if separator is None else repr(separator[1])
+
+        if indentation:
+            self._emit(level, f"out.push({indentation!r})")
+        if expression[0] == "include":
+            self._emit(level, self._call_of(expression, scope))
+        elif expression[0] == "map":
+            value = self._value_of(expression[1], scope)
+            template = expression[2]
+            if template[0] == "anonymous":
+                function = self._compile_anonymous(template, scope, level)
+            else:
+                arguments = self._arguments_of(template[1])
+                if template[2] != ("none",) or len(arguments) != 1:
+                    raise ValueError(f"Unsupported template application <{text}>")
+                function = self.__class__._function_name(template[1])
+            self._emit(level, f"out.apply({value}, {function}, {separator})")
+        else:
+            self._emit(
+                level, f"out.value({self._value_of(expression, scope)}, {separator})"
+            )
+        if indentation:
+            self._emit(level, "out.pop()")
+
+    def _compile_anonymous(self, template: Tuple, scope: Set[str], level: int) -> str:
+        """
+        Generates the nested function rendering an anonymous template.
+        :param template: The ("anonymous", [arguments], body) node.
+        :type template: Tuple
+        :param scope: The attributes available.
+        :type scope: Set[str]
+        :param level: The indentation level.
+        :type level: int
+        :return: The function name.
+        :rtype: str
+        """
+        _, arguments, body = template
+        if len(arguments) != 1:
+            raise ValueError(f"Unsupported anonymous template arguments {arguments}")
+        self._counter += 1
+        result = f"f_{self._counter}"
+        self._emit(
+            level,
+            f"def {result}(out, {CompiledTemplateGroup.variable_name(arguments[0])}):",
+        )
+        self._emit(level + 1, "w = out.write")
+        self._compile_body(body, scope | {arguments[0]}, level + 1)
+
+        return result
+
+    def _arguments_of(self, templateName: str) -> List[str]:
+        """
+        Retrieves the formal arguments of a template.
+        :param templateName: The template name.
+        :type templateName: str
+        :return: Such arguments.
+        :rtype: List[str]
+        """
+        result = self._arguments.get(templateName, None)
+        if result is None:
+            raise ValueError(f"No template {templateName} in group {self._name}")
+
+        return result
+
+    def _call_of(self, include: Tuple, scope: Set[str]) -> str:
+        """
+        Generates the call rendering an included template.
+        :param include: The ("include", name, arguments) node.
+        :type include: Tuple
+        :param scope: The attributes available.
+        :type scope: Set[str]
+        :return: The call.
+        :rtype: str
+        """
+        _, name, arguments = include
+        formal = self._arguments_of(name)
+        values = ""
+        if arguments[0] == "single":
+            if len(formal) != 1:
+                raise ValueError(f"{name} doesn't have a single argument")
+            values = f", {self._value_of(arguments[1], scope)}"
+        elif arguments[0] == "named":
+            for argument, value in arguments[1]:
+                if argument not in formal:
+                    raise ValueError(f"No argument {argument} in template {name}")
+                values += (
+                    f", {CompiledTemplateGroup.variable_name(argument)}="
+                    f"{self._value_of(value, scope)}"
+                )
+
+        return f"{self.__class__._function_name(name)}(out{values})"
+
+    def _value_of(self, expression: Tuple, scope: Set[str]) -> str:
+        """
+        Generates the Python expression retrieving the value of an expression.
+        :param expression: The expression.
+        :type expression: Tuple
+        :param scope: The attributes available.
+        :type scope: Set[str]
+        :return: The Python expression.
+        :rtype: str
+        """
+        if expression[0] == "string":
+            return repr(expression[1])
+        if expression[0] != "attribute":
+            raise ValueError(f"Unsupported value {expression}")
+        _, name, properties = expression
+        if name not in scope:
+            raise ValueError(f"Unknown attribute {name} in group {self._name}")
+        result = CompiledTemplateGroup.variable_name(name)
+        for property_name in properties:
+            result = f"_property({result}, {property_name!r})"
+
+        return result
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
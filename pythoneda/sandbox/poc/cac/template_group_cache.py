@@ -0,0 +1,124 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/template_group_cache.py
+
+This file declares the TemplateGroupCache class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from io import StringIO
+from .instrumentation import Instrumentation
+from pythoneda.shared import BaseObject
+from typing import Dict, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from stringtemplate3 import StringTemplateGroup
+
+
+class TemplateGroupCache(BaseObject):
+    """
+    Process-wide cache of compiled StringTemplate groups.
+
+    Class name: TemplateGroupCache
+
+    Responsibilities:
+        - Parse each distinct template group text only once.
+        - Share the compiled groups among all renderers.
+
+    Collaborators:
+        - stringtemplate3.StringTemplateGroup
+    """
+
+    _groups: Dict[Tuple[str, str, str], "StringTemplateGroup"] = {}
+
+    def __init__(self):
+        """
+        Creates a new TemplateGroupCache instance.
+        """
+        super().__init__()
+
+    @classmethod
+    def group_for(
+        cls, name: str, template: str, superGroup: "StringTemplateGroup" = None
+    ) -> "StringTemplateGroup":
+        """
+        Retrieves the compiled group for given template text, parsing it on first use.
+        Templates must not embed per-artifact values: those are meant to be passed
+        as attributes, so that a single compiled group serves every artifact.
+        :param name: The group name.
+        :type name: str
+        :param template: The group text.
+        :type template: str
+        :param superGroup: The group to look up missing templates in, if any.
+        :type superGroup: stringtemplate3.StringTemplateGroup
+        :return: The compiled group.
+        :rtype: stringtemplate3.StringTemplateGroup
+        """
+        super_group_name = superGroup.name if superGroup else None
+        result = cls.lookup(name, template, super_group_name)
+        if result is None:
+            from stringtemplate3 import StringTemplateGroup
+
+            with Instrumentation.timed("template.parse"):
+                result = StringTemplateGroup(
+                    name=name, file=StringIO(template), superGroup=superGroup
+                )
+            cls._groups[(name, template, super_group_name)] = result
+
+        return result
+
+    @classmethod
+    def lookup(
+        cls, name: str, template: str, superGroupName: str = None
+    ) -> "StringTemplateGroup":
+        """
+        Retrieves the compiled group for given template text, if it's already parsed.
+        :param name: The group name.
+        :type name: str
+        :param template: The group text.
+        :type template: str
+        :param superGroupName: The name of the super group, if any.
+        :type superGroupName: str
+        :return: The compiled group, or None if it's not parsed yet.
+        :rtype: stringtemplate3.StringTemplateGroup
+        """
+        return cls._groups.get((name, template, superGroupName), None)
+
+    @classmethod
+    def clear(cls):
+        """
+        Discards all compiled groups.
+        """
+        cls._groups.clear()
+
+    @classmethod
+    def size(cls) -> int:
+        """
+        Retrieves the number of compiled groups.
+        :return: Such number.
+        :rtype: int
+        """
+        return len(cls._groups)
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
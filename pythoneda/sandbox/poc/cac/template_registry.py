@@ -0,0 +1,392 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/template_registry.py
+
+This file declares the TemplateRegistry class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .compiled_template_group import CompiledTemplateGroup
+import os
+from pythoneda.shared import BaseObject
+from .template_compiler import TemplateCompiler
+from .template_group_cache import TemplateGroupCache
+from typing import Any, Dict, TextIO, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # stringtemplate3 gets loaded on first use, by TemplateGroupCache
+    from stringtemplate3 import StringTemplate, StringTemplateGroup
+
+
+class TemplateRegistry(BaseObject):
+    """
+    Registry of the template groups used to render artifacts.
+
+    Templates are interpreted by StringTemplate, unless compiled templates are
+    enabled (see use_compiled_templates, or the POCCAC_COMPILED_TEMPLATES
+    environment variable). In that case, `render` and `render_to` use groups
+    compiled into Python functions, which produce the same text.
+
+    Class name: TemplateRegistry
+
+    Responsibilities:
+        - Load each template group only once.
+        - Provide the sub-templates shared by all groups.
+        - Hand out template instances.
+        - Keep track of hits and misses.
+        - Render templates, either interpreted or compiled.
+
+    Collaborators:
+        - pythoneda.sandbox.poc.cac.TemplateCompiler
+        - pythoneda.sandbox.poc.cac.TemplateGroupCache
+    """
+
+    compiled: bool = os.environ.get("POCCAC_COMPILED_TEMPLATES", "") not in ("", "0")
+
+    _compiled_groups: Dict[Tuple[str, str, bool], CompiledTemplateGroup] = {}
+    _hits = 0
+    _misses = 0
+
+    def __init__(self):
+        """
+        Creates a new TemplateRegistry instance.
+        """
+        super().__init__()
+
+    @classmethod
+    def common_template(cls) -> str:
+        """
+        Retrieves the template with the sub-templates shared by all groups.
+        :return: Such template.
+        :rtype: str
+        """
+        return '''
+//
+// This file defines the templates shared by all artifact templates.
+//
+// Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+//
+// This program is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// This program is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with this program.  If not, see <https://www.gnu.org/licenses/>.
+//
+group Common;
+
+// editor preamble template
+editor_preamble() ::= <<
+# vim: set fileencoding=utf-8
+>>
+
+// imports template
+// - deps: The dependencies.
+imports(deps) ::= <<
+<deps: { dep |<import(dep=dep)>}; separator="\\n">
+>>
+
+// - dep: The import, guarded by its condition, if any.
+import(dep) ::= <<
+<if(dep.guard)><guarded_import(dep=dep)><else><import_statement(dep=dep)><endif>
+>>
+
+guarded_import(dep) ::= <<
+if <dep.guard>:
+    <import_statement(dep=dep)>
+>>
+
+import_statement(dep) ::= <<
+<if(dep.asset)>from <dep.module> import <dep.asset><else>import <dep.package><endif>
+>>
+
+collaborators(collaborators) ::= <<
+<if(collaborators)><collaborators: { collaborator |- <collaborator>}; separator="\\n"><else>- None<endif>
+>>
+
+// parents template
+// - parents: The names of the parent classes.
+parents(parents) ::= <<
+<parents: { parent |<parent>}; separator=", ">
+>>
+
+// editor settings template
+editor_settings() ::= <<
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
+>>
+'''
+
+    @classmethod
+    def common_group(cls) -> "StringTemplateGroup":
+        """
+        Retrieves the group with the shared sub-templates.
+        :return: Such group.
+        :rtype: stringtemplate3.StringTemplateGroup
+        """
+        return cls.group("Common", cls.common_template(), False)
+
+    @classmethod
+    def group(
+        cls, name: str, template: str, inheritCommon: bool = True
+    ) -> "StringTemplateGroup":
+        """
+        Retrieves the group for given template, loading it on first use.
+        :param name: The group name.
+        :type name: str
+        :param template: The group text.
+        :type template: str
+        :param inheritCommon: Whether the group can use the shared sub-templates.
+        :type inheritCommon: bool
+        :return: The group.
+        :rtype: stringtemplate3.StringTemplateGroup
+        """
+        result = TemplateGroupCache.lookup(
+            name, template, "Common" if inheritCommon else None
+        )
+        if result is None:
+            cls._misses += 1
+            result = cls._load_group(name, template, inheritCommon)
+        else:
+            cls._hits += 1
+
+        return result
+
+    @classmethod
+    def _load_group(
+        cls, name: str, template: str, inheritCommon: bool
+    ) -> "StringTemplateGroup":
+        """
+        Retrieves the group for given template from the TemplateGroupCache, without
+        counting the lookup of the shared sub-templates.
+        :param name: The group name.
+        :type name: str
+        :param template: The group text.
+        :type template: str
+        :param inheritCommon: Whether the group can use the shared sub-templates.
+        :type inheritCommon: bool
+        :return: The group.
+        :rtype: stringtemplate3.StringTemplateGroup
+        """
+        super_group = None
+        if inheritCommon:
+            super_group = TemplateGroupCache.group_for("Common", cls.common_template())
+
+        return TemplateGroupCache.group_for(name, template, super_group)
+
+    @classmethod
+    def instance_of(
+        cls, name: str, template: str, templateName: str = "root"
+    ) -> "StringTemplate":
+        """
+        Retrieves a new instance of a template within given group.
+        :param name: The group name.
+        :type name: str
+        :param template: The group text.
+        :type template: str
+        :param templateName: The name of the template within the group.
+        :type templateName: str
+        :return: A fresh template instance.
+        :rtype: stringtemplate3.StringTemplate
+        """
+        return cls.group(name, template).getInstanceOf(templateName)
+
+    @classmethod
+    def use_compiled_templates(cls, enabled: bool = True):
+        """
+        Chooses whether `render` and `render_to` use compiled templates.
+        :param enabled: True to use compiled templates; False to interpret them.
+        :type enabled: bool
+        """
+        cls.compiled = enabled
+
+    @classmethod
+    def compiled_group(
+        cls, name: str, template: str, inheritCommon: bool = True
+    ) -> CompiledTemplateGroup:
+        """
+        Retrieves the compiled group for given template, compiling it on first use.
+        :param name: The group name.
+        :type name: str
+        :param template: The group text.
+        :type template: str
+        :param inheritCommon: Whether the group can use the shared sub-templates.
+        :type inheritCommon: bool
+        :return: The compiled group.
+        :rtype: pythoneda.sandbox.poc.cac.CompiledTemplateGroup
+        """
+        result = cls._compiled_groups.get((name, template, inheritCommon), None)
+        if result is None:
+            cls._misses += 1
+            result = cls._compile_group(name, template, inheritCommon)
+        else:
+            cls._hits += 1
+
+        return result
+
+    @classmethod
+    def _compile_group(
+        cls, name: str, template: str, inheritCommon: bool
+    ) -> CompiledTemplateGroup:
+        """
+        Retrieves the compiled group for given template, compiling it on first use,
+        without counting the lookup of the shared sub-templates.
+        :param name: The group name.
+        :type name: str
+        :param template: The group text.
+        :type template: str
+        :param inheritCommon: Whether the group can use the shared sub-templates.
+        :type inheritCommon: bool
+        :return: The compiled group.
+        :rtype: pythoneda.sandbox.poc.cac.CompiledTemplateGroup
+        """
+        key = (name, template, inheritCommon)
+        result = cls._compiled_groups.get(key, None)
+        if result is None:
+            super_group = None
+            if inheritCommon:
+                super_group = cls._compile_group("Common", cls.common_template(), False)
+            result = TemplateCompiler.compile(name, template, super_group)
+            cls._compiled_groups[key] = result
+
+        return result
+
+    @classmethod
+    def render(
+        cls, name: str, template: str, templateName: str = "root", **attributes: Any
+    ) -> str:
+        """
+        Renders a template within given group.
+        :param name: The group name.
+        :type name: str
+        :param template: The group text.
+        :type template: str
+        :param templateName: The name of the template within the group.
+        :type templateName: str
+        :param attributes: The template attributes.
+        :type attributes: Dict[str, Any]
+        :return: The rendered text.
+        :rtype: str
+        """
+        if cls.compiled:
+            return cls.compiled_group(name, template).render(templateName, **attributes)
+
+        instance = cls.instance_of(name, template, templateName)
+        for key, value in attributes.items():
+            instance[key] = value
+
+        return str(instance)
+
+    @classmethod
+    def render_to(
+        cls,
+        stream: TextIO,
+        name: str,
+        template: str,
+        templateName: str = "root",
+        **attributes: Any,
+    ):
+        """
+        Renders a template within given group to a stream, as it goes.
+        :param stream: The stream to write to.
+        :type stream: TextIO
+        :param name: The group name.
+        :type name: str
+        :param template: The group text.
+        :type template: str
+        :param templateName: The name of the template within the group.
+        :type templateName: str
+        :param attributes: The template attributes.
+        :type attributes: Dict[str, Any]
+        """
+        if cls.compiled:
+            cls.compiled_group(name, template).render_to(
+                stream, templateName, **attributes
+            )
+        else:
+            instance = cls.instance_of(name, template, templateName)
+            for key, value in attributes.items():
+                instance[key] = value
+            cls.write_to(instance, stream)
+
+    @classmethod
+    def write_to(cls, template: "StringTemplate", stream: TextIO):
+        """
+        Writes given template to a stream as it gets rendered, without building
+        the whole text in memory first.
+        :param template: The template instance, with its attributes already set.
+        :type template: stringtemplate3.StringTemplate
+        :param stream: The stream to write to.
+        :type stream: TextIO
+        """
+        template.write(template.group.getStringTemplateWriter(stream))
+
+    @classmethod
+    def hits(cls) -> int:
+        """
+        Retrieves how many times an already-loaded group was reused.
+        :return: Such number.
+        :rtype: int
+        """
+        return cls._hits
+
+    @classmethod
+    def misses(cls) -> int:
+        """
+        Retrieves how many times a group had to be loaded.
+        :return: Such number.
+        :rtype: int
+        """
+        return cls._misses
+
+    @classmethod
+    def reset_counters(cls):
+        """
+        Resets the hit and miss counters.
+        """
+        cls._hits = 0
+        cls._misses = 0
+
+    @classmethod
+    def clear(cls):
+        """
+        Forgets all loaded and compiled groups, and resets the counters.
+        """
+        TemplateGroupCache.clear()
+        cls._compiled_groups.clear()
+        cls.reset_counters()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,250 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/template_writer.py
+
+This file declares the TemplateWriter class.
+
+Copyright (C) 2024-today rydnr's pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+from pythoneda.shared import BaseObject
+from typing import Any, Callable, Dict, List, TextIO, Tuple
+
+
+class TemplateWriter(BaseObject):
+    """
+    Output of the compiled templates, indenting it the way StringTemplate does.
+
+    Class name: TemplateWriter
+
+    Responsibilities:
+        - Keep the stack of indentations of the expressions being written.
+        - Indent every line once it gets its first character, as StringTemplate's
+          AutoIndentWriter does, so the output is the same.
+        - Write attribute values, and apply templates to them, following
+          StringTemplate rules.
+
+    Collaborators:
+        - pythoneda.sandbox.poc.cac.CompiledTemplateGroup
+    """
+
+    _accessors: Dict[Tuple[type, str], Callable[[Any], Any]] = {}
+
+    def __init__(self, stream: TextIO = None):
+        """
+        Creates a new TemplateWriter instance.
+        :param stream: The stream to write to. If None, the text is kept in memory.
+        :type stream: TextIO
+        """
+        super().__init__()
+        self._parts: List[str] = []
+        self._emit = stream.write if stream is not None else self._parts.append
+        self._indent = ""
+        self._indents: List[str] = []
+        self._at_start_of_line = True
+        self._written = 0
+
+    @property
+    def written(self) -> int:
+        """
+        Retrieves how many characters have been written, so far.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._written
+
+    def __str__(self) -> str:
+        """
+        Retrieves the text written so far, if it's kept in memory.
+        :return: Such text.
+        :rtype: str
+        """
+        return "".join(self._parts)
+
+    def push(self, indentation: str):
+        """
+        Indents the lines written from now on.
+        :param indentation: The additional indentation.
+        :type indentation: str
+        """
+        self._indents.append(self._indent)
+        self._indent += indentation
+
+    def pop(self):
+        """
+        Restores the previous indentation.
+        """
+        self._indent = self._indents.pop()
+
+    def write(self, text: str):
+        """
+        Writes given text. Carriage returns are discarded, and newlines become
+        the platform's line separator.
+        :param text: The text.
+        :type text: str
+        """
+        if "\r" in text:
+            text = text.replace("\r", "")
+        if not text:
+            return
+        self._written += len(text)
+        if not self._indent:
+            self._at_start_of_line = text[-1] == "\n"
+            if os.linesep != "\n":
+                text = text.replace("\n", os.linesep)
+            self._emit(text)
+            return
+        emit = self._emit
+        at_start_of_line = self._at_start_of_line
+        for index, line in enumerate(text.split("\n")):
+            if index:
+                emit(os.linesep)
+                at_start_of_line = True
+            if line:
+                if at_start_of_line:
+                    emit(self._indent)
+                    at_start_of_line = False
+                emit(line)
+        self._at_start_of_line = at_start_of_line
+
+    @classmethod
+    def is_multivalued(cls, value: Any) -> bool:
+        """
+        Checks whether StringTemplate would treat given value as a list.
+        :param value: The value.
+        :type value: Any
+        :return: True if it's iterable, and not a string.
+        :rtype: bool
+        """
+        if isinstance(value, str):
+            return False
+        try:
+            iter(value)
+        except TypeError:
+            return False
+
+        return True
+
+    def value(self, value: Any, separator: str = None):
+        """
+        Writes an attribute value. Missing values are skipped, and the items of
+        lists are written one after another, with the separator in between.
+        :param value: The value.
+        :type value: Any
+        :param separator: The separator, if any.
+        :type separator: str
+        """
+        if value is None:
+            return
+        if isinstance(value, str):
+            self.write(value)
+        elif self.__class__.is_multivalued(value):
+            if isinstance(value, dict):
+                value = value.values()
+            first = True
+            for item in value:
+                if item is not None:
+                    if not first and separator is not None:
+                        self.write(separator)
+                    first = False
+                    self.value(item, separator)
+        else:
+            self.write(str(value))
+
+    def apply(
+        self,
+        value: Any,
+        template: Callable[["TemplateWriter", Any], None],
+        separator: str = None,
+    ):
+        """
+        Applies a template to a value, or to each item if it's a list.
+        :param value: The value.
+        :type value: Any
+        :param template: The compiled template, taking the writer and the item.
+        :type template: Callable[[pythoneda.sandbox.poc.cac.TemplateWriter, Any], None]
+        :param separator: The separator, if any.
+        :type separator: str
+        """
+        if not value:
+            return
+        if self.__class__.is_multivalued(value):
+            first = True
+            for item in value:
+                if item is not None:
+                    if not first and separator is not None:
+                        self.write(separator)
+                    first = False
+                    template(self, item)
+        else:
+            template(self, value)
+
+    @classmethod
+    def property_of(cls, target: Any, name: str) -> Any:
+        """
+        Retrieves a property the way StringTemplate does: dictionaries by key,
+        then `get<Name>()` or `is<Name>()` methods, then plain attributes.
+        :param target: The object.
+        :type target: Any
+        :param name: The property name.
+        :type name: str
+        :return: The property value, or None if it's missing.
+        :rtype: Any
+        """
+        if target is None:
+            return None
+        if isinstance(target, dict):
+            if name == "keys":
+                return list(target.keys())
+            if name == "values":
+                return list(target.values())
+            return target.get(name, None)
+        key = (target.__class__, name)
+        accessor = cls._accessors.get(key, None)
+        if accessor is None:
+            accessor = cls._accessor_for(target.__class__, name)
+            cls._accessors[key] = accessor
+
+        return accessor(target)
+
+    @classmethod
+    def _accessor_for(cls, targetClass: type, name: str) -> Callable[[Any], Any]:
+        """
+        Builds the function retrieving a property of the instances of a class.
+        :param targetClass: The class.
+        :type targetClass: type
+        :param name: The property name.
+        :type name: str
+        :return: Such function.
+        :rtype: Callable[[Any], Any]
+        """
+        suffix = name[0].upper() + name[1:]
+        for prefix in ("get", "is"):
+            method = f"{prefix}{suffix}"
+            if callable(getattr(targetClass, method, None)):
+                return lambda target: getattr(target, method)()
+
+        return lambda target: getattr(target, name, None)
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
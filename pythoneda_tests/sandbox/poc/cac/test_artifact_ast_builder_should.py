@@ -0,0 +1,211 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/test_artifact_ast_builder_should.py
+
+This file defines tests for ArtifactAstBuilder.
+
+Copyright (C) 2024-today rydnr's https://github.com/pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import ast
+import importlib
+import pytest
+from typing import List, Optional
+from pythoneda.shared import BaseObject
+from pythoneda.sandbox.poc.cac import (
+    ArtifactAstBuilder,
+    ClassArtifact,
+    EmptyBodyPythonMethod,
+    MethodDef,
+    MethodParameter,
+    PythonMethodDef,
+    SourceCache,
+)
+from pythoneda.sandbox.poc.cac.add_int_int_int_python_method_def import (
+    AddIntIntIntPythonMethodDef,
+)
+
+
+class Greeter(BaseObject):
+    """
+    A class used by the tests.
+    """
+
+    def __init__(self, name: str):
+        """
+        Creates a new Greeter instance.
+        :param name: The name.
+        :type name: str
+        """
+        super().__init__()
+        self._name = name
+
+    def greet(self) -> str:
+        """
+        Greets.
+        :return: The greeting.
+        :rtype: str
+        """
+        return f"Hello, {self._name}"
+
+    def greet_all(self, names: List[str], times: int = 1) -> Optional[str]:
+        """
+        Greets several people.
+        """
+        return None
+
+
+def test_reuse_the_parsed_method_declarations():
+    # given
+    cache = SourceCache()
+    artifact = ClassArtifact.for_class(Greeter, cache)
+
+    # when
+    module = ArtifactAstBuilder(artifact).module()
+
+    # then
+    methods = module.body[-1].body[1:]
+    assert [m.name for m in methods] == ["__init__", "greet", "greet_all"]
+    assert methods[1] is cache.function_node_of(Greeter.greet)
+
+
+def test_unparse_valid_source_code():
+    # given
+    sut = ArtifactAstBuilder(ClassArtifact.for_class(Greeter))
+
+    # when
+    source = sut.unparse()
+
+    # then
+    tree = ast.parse(source)
+    assert ast.get_docstring(tree).startswith(sut.artifact.relative_file_path)
+    assert "class Greeter(BaseObject):" in source
+
+
+def test_build_methods_without_source_from_their_definition():
+    # given
+    method = EmptyBodyPythonMethod(AddIntIntIntPythonMethodDef())
+
+    # when
+    node = ArtifactAstBuilder.method_node_of(method)
+
+    # then
+    assert ast.unparse(node).startswith("def add(self, x: int, y: int) -> int:")
+    assert isinstance(node.body[-1], ast.Pass)
+
+
+def test_take_the_signature_of_definitions_from_their_source():
+    # given
+    method = EmptyBodyPythonMethod(MethodDef.from_method(Greeter.greet_all))
+
+    # when
+    node = ArtifactAstBuilder.method_node_of(method)
+
+    # then
+    assert ast.unparse(node).startswith(
+        "def greet_all(self, names: List[str], times: int=1) -> Optional[str]:"
+    )
+
+
+def test_align_default_values_to_the_last_parameters():
+    # given
+    definition = PythonMethodDef(
+        "add",
+        "int",
+        "Adds two numbers.",
+        [
+            MethodParameter("x", "int", "The first number."),
+            MethodParameter("y", "int", "The second number.", "0"),
+        ],
+    )
+    invalid = PythonMethodDef(
+        "add",
+        "int",
+        "Adds two numbers.",
+        [
+            MethodParameter("x", "int", "The first number.", "0"),
+            MethodParameter("y", "int", "The second number."),
+        ],
+    )
+
+    # when
+    node = ArtifactAstBuilder.method_node_of(EmptyBodyPythonMethod(definition))
+
+    # then
+    assert ast.unparse(node).startswith("def add(self, x: int, y: int=0) -> int:")
+    with pytest.raises(ValueError):
+        ArtifactAstBuilder.method_node_of(EmptyBodyPythonMethod(invalid))
+
+
+@pytest.mark.asyncio
+async def test_rename_by_compiling_the_tree():
+    # given
+    artifact = ClassArtifact.for_class(Greeter)
+    sut = ClassArtifact(
+        artifact.name,
+        artifact.parents,
+        artifact.constructor,
+        artifact.methods,
+        artifact.metadata,
+    )
+
+    # when
+    await sut.rename("Welcomer")
+
+    # then
+    assert sut.target.__name__ == "Welcomer"
+    assert sut.target("Rydnr").greet() == "Hello, Rydnr"
+
+
+def test_keep_relative_guarded_and_local_imports_in_place(tmp_path, monkeypatch):
+    # given
+    package = tmp_path / "relative_imports_domain"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "base.py").write_text("class Base:\n    pass\n")
+    (package / "child.py").write_text(
+        "from typing import TYPE_CHECKING\n"
+        "from . import base\n"
+        "from .base import Base\n\n"
+        "if TYPE_CHECKING:\n"
+        "    from typing import List\n\n\n"
+        "class Child(Base):\n"
+        "    def names(self) -> 'List[str]':\n"
+        "        import json\n\n"
+        "        return [json.dumps(base.__name__)]\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module("relative_imports_domain.child")
+
+    # when
+    code = ArtifactAstBuilder(ClassArtifact.for_class(module.Child)).unparse()
+
+    # then
+    header = code[: code.index("class Child")]
+    assert "from . import base\n" in header
+    assert "from .base import Base\n" in header
+    assert "if TYPE_CHECKING:\n    from typing import List\n" in header
+    assert "json" not in header
+    assert "        import json\n" in code
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
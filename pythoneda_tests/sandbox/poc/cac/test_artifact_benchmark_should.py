@@ -0,0 +1,53 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/test_artifact_benchmark_should.py
+
+This file defines tests for ArtifactBenchmark.
+
+Copyright (C) 2024-today rydnr's https://github.com/pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import json
+from pythoneda.sandbox.poc.cac.artifact_benchmark import ArtifactBenchmark
+
+
+def test_report_every_benchmark_as_json(tmp_path):
+    # given
+    sut = ArtifactBenchmark([3], 1, str(tmp_path))
+
+    # when
+    sut.run()
+    report = json.loads(sut.to_json())
+
+    # then
+    assert [r["benchmark"] for r in report["results"]] == [
+        "ClassArtifact.for_class",
+        "ClassArtifact.content",
+        "PythonMethodDef.content",
+        "PythonImportFind",
+        "DomainArtifact.find_classes (cold)",
+        "DomainArtifact.find_classes (warm)",
+    ]
+    assert all(r["size"] == 3 and r["items"] == 3 for r in report["results"])
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,118 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/test_artifact_emitter_should.py
+
+This file defines tests for ArtifactEmitter.
+
+Copyright (C) 2024-today rydnr's https://github.com/pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+import pytest
+from pythoneda.sandbox.poc.cac import ArtifactEmitter, ClassArtifact
+
+
+def test_write_new_files(tmp_path):
+    # given
+    sut = ArtifactEmitter(str(tmp_path))
+
+    # when
+    written = sut.emit(os.path.join("pkg", "greeter.py"), "class Greeter:\n    pass\n")
+
+    # then
+    assert written
+    assert (tmp_path / "pkg" / "greeter.py").read_text() == "class Greeter:\n    pass\n"
+    assert sut.written == 1
+    assert sut.skipped == 0
+
+
+def test_skip_unchanged_files(tmp_path):
+    # given
+    sut = ArtifactEmitter(str(tmp_path))
+    sut.emit("greeter.py", "class Greeter:\n    pass\n")
+    path = tmp_path / "greeter.py"
+    os.utime(path, ns=(0, 0))
+
+    # when
+    written = sut.emit("greeter.py", "class Greeter:\n    pass\n")
+
+    # then
+    assert not written
+    assert os.stat(path).st_mtime_ns == 0
+    assert sut.written == 1
+    assert sut.skipped == 1
+
+
+def test_replace_changed_files(tmp_path):
+    # given
+    sut = ArtifactEmitter(str(tmp_path))
+    sut.emit("greeter.py", "class Greeter:\n    pass\n")
+
+    # when
+    written = sut.emit("greeter.py", "class Welcomer:\n    pass\n")
+
+    # then
+    assert written
+    assert (tmp_path / "greeter.py").read_text() == "class Welcomer:\n    pass\n"
+    assert os.listdir(tmp_path) == ["greeter.py"]
+    assert sut.written == 2
+
+
+def test_create_new_files_with_the_default_mode(tmp_path):
+    # given
+    sut = ArtifactEmitter(str(tmp_path / "out"))
+    (tmp_path / "reference.py").write_text("")
+
+    # when
+    sut.emit("greeter.py", "class Greeter:\n    pass\n")
+
+    # then
+    mode = os.stat(tmp_path / "out" / "greeter.py").st_mode & 0o777
+    assert mode == os.stat(tmp_path / "reference.py").st_mode & 0o777
+
+
+def test_emit_artifacts_within_the_output_folder(tmp_path):
+    # given
+    sut = ArtifactEmitter(str(tmp_path))
+    artifact = ClassArtifact.for_class(ArtifactEmitter)
+
+    # when
+    sut.emit_artifact(artifact)
+
+    # then
+    path = tmp_path / "pythoneda" / "sandbox" / "poc" / "cac" / "artifact_emitter.py"
+    assert path.read_text() == artifact.content
+
+
+def test_reject_paths_outside_the_output_folder(tmp_path):
+    # given
+    sut = ArtifactEmitter(str(tmp_path / "out"))
+
+    # when / then
+    with pytest.raises(ValueError):
+        sut.emit(str(tmp_path / "greeter.py"), "class Greeter:\n    pass\n")
+    with pytest.raises(ValueError):
+        sut.emit(os.path.join(os.pardir, "greeter.py"), "class Greeter:\n    pass\n")
+    assert not (tmp_path / "greeter.py").exists()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,106 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/test_artifact_metadata_should.py
+
+This file defines tests for ArtifactMetadata.
+
+Copyright (C) 2024-today rydnr's https://github.com/pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythoneda.sandbox.poc.cac.artifact_metadata import ArtifactMetadata
+
+
+def test_not_share_defaults_between_callers():
+    # given
+    sut = ArtifactMetadata.from_dict({})
+
+    # when
+    first = sut.get("license", lambda: "GPL")
+    second = sut.get("license", lambda: "MIT")
+
+    # then
+    assert first == "GPL"
+    assert second == "MIT"
+
+
+def test_keep_derived_values_apart_from_entries():
+    # given
+    sut = ArtifactMetadata.from_dict({})
+    sut.derived("author", lambda: "[derived]")
+
+    # when
+    author = sut.get("author", lambda: "[default]")
+
+    # then
+    assert author == "[default]"
+
+
+def test_reuse_derived_fields():
+    # given
+    sut = ArtifactMetadata.from_dict({"author": "rydnr", "start_year": "2024"})
+
+    # when
+    first = sut.copyright_preamble_for_st
+    second = sut.copyright_preamble_for_st
+
+    # then
+    assert first is second
+
+
+def test_discard_derived_fields_when_an_entry_is_set():
+    # given
+    sut = ArtifactMetadata.from_dict({"author": "rydnr", "start_year": "2024"})
+    first = sut.copyright_preamble_for_st
+
+    # when
+    sut.set("author", "someone else")
+
+    # then
+    assert "someone else" in sut.copyright_preamble_for_st
+    assert "rydnr" in first
+
+
+def test_convert_entries_to_their_types():
+    # given
+    sut = ArtifactMetadata.from_dict({"start_year": "2024", "author": None})
+
+    # when
+    start_year = sut.start_year
+
+    # then
+    assert start_year == 2024
+    assert sut.author == "[unknown author]"
+    assert sut.get_int("missing", lambda: None) is None
+
+
+def test_fall_back_to_the_default_for_non_numeric_entries():
+    # given
+    sut = ArtifactMetadata.from_dict({"start_year": "this year"})
+
+    # when
+    start_year = sut.get_int("start_year", lambda: 2024)
+
+    # then
+    assert start_year == 2024
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
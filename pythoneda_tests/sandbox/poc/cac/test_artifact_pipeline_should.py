@@ -0,0 +1,139 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/test_artifact_pipeline_should.py
+
+This file defines tests for ArtifactPipeline.
+
+Copyright (C) 2024-today rydnr's https://github.com/pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+from pythoneda.sandbox.poc.cac import ArtifactPipeline, ClassArtifact
+
+
+def domain(folder, name: str) -> str:
+    package = folder / name
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "first_thing.py").write_text(
+        "class FirstThing:\n"
+        '    """\n    The first thing.\n    """\n\n'
+        "    def value(self) -> int:\n"
+        '        """\n        Retrieves the value.\n        :return: The value.\n'
+        '        :rtype: int\n        """\n'
+        "        return 1\n"
+    )
+    (package / "second_thing.py").write_text(
+        "class SecondThing:\n"
+        '    """\n    The second thing.\n    """\n\n'
+        "    pass\n"
+    )
+    return name
+
+
+def test_write_one_file_per_class(tmp_path, monkeypatch):
+    # given
+    monkeypatch.syspath_prepend(str(tmp_path / "src"))
+    (tmp_path / "src").mkdir()
+    package = domain(tmp_path / "src", "pipeline_domain_write")
+    sut = ArtifactPipeline(str(tmp_path / "out"))
+
+    # when
+    written = sut.run(package)
+
+    # then
+    assert written == 2
+    from pipeline_domain_write.first_thing import FirstThing
+
+    path = tmp_path / "out" / "pipeline_domain_write" / "first_thing.py"
+    assert path.read_text() == ClassArtifact.for_class(FirstThing).content
+    assert (tmp_path / "out" / "pipeline_domain_write" / "second_thing.py").exists()
+
+
+def test_leave_unchanged_files_untouched(tmp_path, monkeypatch):
+    # given
+    monkeypatch.syspath_prepend(str(tmp_path / "src"))
+    (tmp_path / "src").mkdir()
+    package = domain(tmp_path / "src", "pipeline_domain_rerun")
+    ArtifactPipeline(str(tmp_path / "out")).run(package)
+    sut = ArtifactPipeline(str(tmp_path / "out"))
+
+    # when
+    written = sut.run(package)
+
+    # then
+    assert written == 0
+    assert sut.emitter.skipped == 2
+
+
+def test_build_artifacts_only_on_demand(tmp_path, monkeypatch):
+    # given
+    monkeypatch.syspath_prepend(str(tmp_path / "src"))
+    (tmp_path / "src").mkdir()
+    package = domain(tmp_path / "src", "pipeline_domain_lazy")
+    sut = ArtifactPipeline(str(tmp_path / "out"))
+    pulled = []
+
+    def discovered():
+        for item in sut.discover(package):
+            pulled.append(item)
+            yield item
+
+    # when
+    files = sut.render(sut.build(discovered()))
+    path, _ = next(files)
+
+    # then
+    assert path == os.path.join("pipeline_domain_lazy", "first_thing.py")
+    assert pulled == [("pipeline_domain_lazy.first_thing", "FirstThing")]
+
+
+def test_skip_modules_that_fail_to_load(tmp_path, monkeypatch):
+    # given
+    monkeypatch.syspath_prepend(str(tmp_path / "src"))
+    (tmp_path / "src").mkdir()
+    package = domain(tmp_path / "src", "pipeline_domain_errors")
+    folder = tmp_path / "src" / package
+    (folder / "bad_syntax.py").write_text("def broken(:\n")
+    (folder / "a_syntax_error.py").write_text(
+        "from .bad_syntax import broken\n\nclass SyntaxVictim:\n    pass\n"
+    )
+    (folder / "an_attribute_error.py").write_text(
+        "import os\n\nos.missing\n\nclass AttributeVictim:\n    pass\n"
+    )
+    sut = ArtifactPipeline(str(tmp_path / "out"))
+
+    # when
+    written = sut.run(package)
+
+    # then
+    assert written == 2
+    assert sorted(sut.errors) == [
+        "pipeline_domain_errors.a_syntax_error",
+        "pipeline_domain_errors.an_attribute_error",
+    ]
+    assert sut.errors["pipeline_domain_errors.a_syntax_error"].startswith(
+        "SyntaxError"
+    )
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,274 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/test_class_artifact_should.py
+
+This file defines tests for ClassArtifact.
+
+Copyright (C) 2024-today rydnr's https://github.com/pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import functools
+import importlib
+import io
+import pytest
+from pythoneda.shared import BaseObject
+from pythoneda.sandbox.poc.cac import ClassArtifact, SourceCache
+import sys
+
+
+class Greeter(BaseObject):
+    """
+    A class used by the tests.
+    """
+
+    def __init__(self, name: str):
+        """
+        Creates a new Greeter instance.
+        :param name: The name.
+        :type name: str
+        """
+        super().__init__()
+        self._name = name
+
+    def greet(self) -> str:
+        """
+        Greets.
+        :return: The greeting.
+        :rtype: str
+        """
+        return f"Hello, {self._name}"
+
+    def greet_to(self, stream) -> None:
+        """
+        Greets, writing to given stream.
+        :param stream: The stream.
+        :type stream: TextIO
+        """
+        import io
+
+        if isinstance(stream, io.TextIOBase):
+            stream.write(self.greet())
+
+
+def traced(function):
+    """
+    A decorator used by the tests.
+    """
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        return function(*args, **kwargs)
+
+    return wrapper
+
+
+class Shouter(Greeter):
+    """
+    A class with a decorated method using zero-argument super().
+    """
+
+    @traced
+    def greet(self) -> str:
+        """
+        Shouts.
+        :return: The greeting.
+        :rtype: str
+        """
+        return super().greet().upper()
+
+
+def test_reuse_the_rendered_content():
+    # given
+    sut = ClassArtifact.for_class(Greeter)
+
+    # when
+    first = sut.content
+    second = sut.content
+
+    # then
+    assert first is second
+
+
+def test_render_again_when_metadata_changes():
+    # given
+    sut = ClassArtifact.for_class(Greeter)
+    first = sut.content
+
+    # when
+    sut.metadata.set("class_description", "Greets people.")
+
+    # then
+    assert sut.content is not first
+    assert "Greets people." in sut.content
+
+
+def test_stream_the_same_content():
+    # given
+    sut = ClassArtifact.for_class(Greeter)
+    stream = io.StringIO()
+
+    # when
+    sut.render_to(stream)
+
+    # then
+    assert stream.getvalue() == ClassArtifact.for_class(Greeter).content
+
+
+def test_render_each_import_once():
+    # given
+    sut = ClassArtifact.for_class(Greeter)
+    imports = sut.class_imports
+    sut.metadata.set("class_imports", imports + imports)
+
+    # when
+    content = sut.content
+
+    # then
+    assert len(sut.imports) == len(imports)
+    assert content.count("\nimport io\n") == 1
+
+
+@pytest.mark.asyncio
+async def test_render_again_when_imports_are_renamed():
+    # given
+    sut = ClassArtifact.for_class(Greeter)
+    first = sut.content
+
+    # when
+    await sut.rename_imports("pythoneda.shared", "pythoneda.shared.renamed")
+
+    # then
+    assert sut.content != first
+    assert "from pythoneda.shared.renamed import BaseObject" in sut.content
+
+
+@pytest.mark.asyncio
+async def test_rename_imports_with_bounded_concurrency():
+    # given
+    sut = ClassArtifact.for_class(Greeter)
+    imports = len(sut.class_imports)
+
+    # when
+    await sut.rename_imports("pytest", "pytest_renamed", maxConcurrency=2)
+
+    # then
+    assert len(sut.class_imports) == imports
+    assert "pytest_renamed" in [i.package for i in sut.class_imports]
+
+
+@pytest.mark.asyncio
+async def test_rename_without_generating_code():
+    # given
+    sut = ClassArtifact.for_class(Greeter)
+
+    # when
+    await sut.rename("Welcomer")
+
+    # then
+    welcomer = sut.target("Rydnr")
+    assert sut.target.__name__ == "Welcomer"
+    assert sut.target is not Greeter
+    assert welcomer.greet() == "Hello, Rydnr"
+    assert isinstance(welcomer, BaseObject)
+    assert Greeter.__name__ == "Greeter"
+    assert "class Welcomer(" in sut.content
+
+
+@pytest.mark.asyncio
+async def test_regenerate_classes_whose_wrapped_methods_capture_the_class():
+    # given
+    sut = ClassArtifact.for_class(Shouter)
+
+    # when
+    await sut.rename("Yeller")
+
+    # then
+    assert sut.target.__name__ == "Yeller"
+    assert sut.target.__qualname__ == "Yeller"
+    assert sut.target("Rydnr").greet() == "HELLO, RYDNR"
+    assert Shouter("Rydnr").greet() == "HELLO, RYDNR"
+
+
+@pytest.mark.asyncio
+async def test_regenerate_classes_from_modules_with_relative_imports(
+    tmp_path, monkeypatch
+):
+    # given
+    package = tmp_path / "relative_rename_domain"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "helpers.py").write_text(
+        "import functools\n\n\n"
+        "def traced(function):\n"
+        "    @functools.wraps(function)\n"
+        "    def wrapper(*args, **kwargs):\n"
+        "        return function(*args, **kwargs)\n\n"
+        "    return wrapper\n\n\n"
+        "class Base:\n"
+        "    def greet(self) -> str:\n"
+        "        return 'hello'\n"
+    )
+    (package / "shouter.py").write_text(
+        "from .helpers import Base, traced\n\n\n"
+        "class Shouter(Base):\n"
+        "    @traced\n"
+        "    def greet(self) -> str:\n"
+        "        return super().greet().upper()\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module("relative_rename_domain.shouter")
+    sut = ClassArtifact.for_class(module.Shouter)
+
+    # when
+    await sut.rename("Yeller")
+
+    # then
+    assert sut.target.__name__ == "Yeller"
+    assert sut.target().greet() == "HELLO"
+
+
+def test_build_artifacts_for_all_classes_in_a_module():
+    # given
+    module = sys.modules[__name__]
+
+    # when
+    artifacts = ClassArtifact.for_module(module)
+
+    # then
+    assert [a.name for a in artifacts] == ["Greeter", "Shouter"]
+    assert artifacts[0].content == ClassArtifact.for_class(Greeter).content
+
+
+def test_parse_each_module_once():
+    # given
+    cache = SourceCache()
+    module = sys.modules[__name__]
+
+    # when
+    ClassArtifact.for_module(module, cache)
+
+    # then
+    assert cache.tree_of(module) is cache.tree_of(module)
+    assert cache.class_source_of(Greeter).startswith("class Greeter(BaseObject):")
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
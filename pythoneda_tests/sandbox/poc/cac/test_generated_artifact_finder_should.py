@@ -0,0 +1,193 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/test_generated_artifact_finder_should.py
+
+This file defines tests for GeneratedArtifactFinder.
+
+Copyright (C) 2024-today rydnr's https://github.com/pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import importlib
+import pytest
+from pythoneda.shared import BaseObject
+from pythoneda.sandbox.poc.cac import (
+    ClassArtifact,
+    GeneratedArtifactFinder,
+    ImportSet,
+    PythonImport,
+)
+import sys
+
+
+class Greeter(BaseObject):
+    """
+    A class used by the tests.
+    """
+
+    def __init__(self, name: str):
+        """
+        Creates a new Greeter instance.
+        :param name: The name.
+        :type name: str
+        """
+        super().__init__()
+        self._name = name
+
+    def greet(self) -> str:
+        """
+        Greets.
+        :return: The greeting.
+        :rtype: str
+        """
+        return f"Hello, {self._name}"
+
+
+@pytest.fixture
+def finder():
+    result = GeneratedArtifactFinder()
+    result.install()
+    yield result
+    result.uninstall()
+    for name in list(sys.modules):
+        if name.startswith("generated_domain"):
+            del sys.modules[name]
+
+
+def test_import_generated_modules_and_their_packages(finder):
+    # given
+    finder.add_source("generated_domain.things.thing", "VALUE = 42\n")
+
+    # when
+    module = importlib.import_module("generated_domain.things.thing")
+
+    # then
+    assert module.VALUE == 42
+    assert sys.modules["generated_domain.things"].__path__ == []
+
+
+def test_reuse_the_compiled_code_when_reloading(finder):
+    # given
+    finder.add_source("generated_domain.counter", "VALUE = 1\n")
+    module = importlib.import_module("generated_domain.counter")
+    misses = finder.misses()
+
+    # when
+    importlib.reload(module)
+    finder.add_source("generated_domain.counter", "VALUE = 2\n")
+    importlib.reload(module)
+
+    # then
+    assert module.VALUE == 2
+    assert finder.hits() == 1
+    assert finder.misses() == misses + 1
+
+
+class CountingFinder:
+    """
+    A finder that finds nothing, counting how many times it's asked.
+    """
+
+    def __init__(self):
+        self.lookups = []
+
+    def find_spec(self, fullname, path=None, target=None):
+        self.lookups.append(fullname)
+        return None
+
+
+def test_not_keep_the_packages_it_provides(finder):
+    # given
+    finder.add_source("generated_domain.things.thing", "VALUE = 42\n")
+    importlib.import_module("generated_domain.things.thing")
+
+    # when
+    finder.remove("generated_domain.things.thing")
+
+    # then
+    assert finder.module_names == []
+    assert finder.find_spec("generated_domain") is None
+    assert finder.find_spec("generated_domain.things") is None
+
+
+def test_keep_the_packages_of_the_remaining_modules(finder):
+    # given
+    finder.add_source("generated_domain.things.thing", "VALUE = 1\n")
+    finder.add_source("generated_domain.other", "VALUE = 2\n")
+
+    # when
+    finder.remove("generated_domain.things.thing")
+
+    # then
+    assert finder.find_spec("generated_domain") is not None
+    assert finder.find_spec("generated_domain.things") is None
+
+
+def test_ask_other_finders_once_per_package(finder):
+    # given
+    other = CountingFinder()
+    sys.meta_path.append(other)
+    finder.add_source("generated_domain.first", "VALUE = 1\n")
+    finder.add_source("generated_domain.second", "VALUE = 2\n")
+
+    # when
+    try:
+        for _ in range(3):
+            finder.find_spec("generated_domain")
+    finally:
+        sys.meta_path.remove(other)
+
+    # then
+    assert other.lookups == ["generated_domain"]
+
+
+@pytest.mark.asyncio
+async def test_import_renamed_artifacts(finder):
+    # given
+    artifact = ClassArtifact.for_class(Greeter)
+    await artifact.rename("Welcomer")
+
+    # when
+    name = finder.add_artifact(artifact, "generated_domain.welcomer")
+    module = importlib.import_module(name)
+
+    # then
+    assert module.Welcomer("Rydnr").greet() == "Hello, Rydnr"
+    assert "class Welcomer(BaseObject):" in finder.get_source(name)
+
+
+def test_import_artifacts_whose_modules_use_relative_imports(finder):
+    # given
+    artifact = ClassArtifact.for_class(ImportSet)
+
+    # when
+    name = finder.add_artifact(artifact, "generated_domain.import_set_copy")
+    module = importlib.import_module(name)
+
+    # then
+    imports = module.ImportSet([PythonImport("a", "b"), PythonImport("a", "b")])
+    assert len(imports) == 1
+    assert "from pythoneda.sandbox.poc.cac.python_import import" in (
+        finder.get_source(name)
+    )
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
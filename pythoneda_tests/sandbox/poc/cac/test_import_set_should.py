@@ -0,0 +1,76 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/test_import_set_should.py
+
+This file defines tests for ImportSet.
+
+Copyright (C) 2024-today rydnr's https://github.com/pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythoneda.sandbox.poc.cac import (
+    DependencyImport,
+    ImportSet,
+    PythonImport,
+    PythonImportPool,
+)
+
+
+def test_keep_first_seen_order_without_duplicates():
+    # given
+    imports = [
+        PythonImport("pythoneda.shared", "BaseObject"),
+        PythonImport("typing", "List"),
+        PythonImport("pythoneda.shared", "BaseObject"),
+        DependencyImport("os"),
+        PythonImport("os"),
+        PythonImport("typing", "List"),
+    ]
+
+    # when
+    sut = ImportSet(imports)
+
+    # then
+    assert [i.key for i in sut] == [
+        ("pythoneda.shared", "BaseObject", 0, None),
+        ("typing", "List", 0, None),
+        ("os", None, 0, None),
+    ]
+    assert PythonImport("typing", "List") in sut
+    assert PythonImport("typing", "Dict") not in sut
+    assert PythonImport("typing", "List", 1) not in sut
+
+
+def test_share_interned_imports():
+    # given
+    first = ImportSet([PythonImport("pythoneda.shared", "BaseObject")])
+
+    # when
+    second = ImportSet([PythonImport("pythoneda.shared", "BaseObject")])
+
+    # then
+    assert first.to_list()[0] is second.to_list()[0]
+    assert first.to_list()[0] is PythonImportPool.intern(
+        "pythoneda.shared", "BaseObject"
+    )
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
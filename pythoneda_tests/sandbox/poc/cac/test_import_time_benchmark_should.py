@@ -0,0 +1,84 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/test_import_time_benchmark_should.py
+
+This file defines tests for ImportTimeBenchmark.
+
+Copyright (C) 2024-today rydnr's https://github.com/pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythoneda.sandbox.poc.cac.import_time_benchmark import ImportTimeBenchmark
+
+
+def test_import_the_package_without_loading_its_modules():
+    # given
+    sut = ImportTimeBenchmark(
+        "import pythoneda.sandbox.poc.cac",
+        1,
+        budgetMs=500,
+        forbidden=["stringtemplate3", "pythoneda.shared", "ast", "asyncio"],
+    )
+
+    # when
+    report = sut.run()
+
+    # then
+    assert report["forbidden"] == []
+    assert report["best_ms"] <= 500
+    assert report["within_budget"]
+    assert "pythoneda.sandbox.poc.cac" in report["modules"]
+    assert not [
+        module
+        for module in report["modules"]
+        if module.startswith("pythoneda.sandbox.poc.cac.")
+    ]
+
+
+def test_defer_heavy_dependencies_to_first_use():
+    # given
+    sut = ImportTimeBenchmark(
+        "from pythoneda.sandbox.poc.cac import PythonImportFind, Sample", 1
+    )
+
+    # when
+    report = sut.run()
+
+    # then
+    assert report["forbidden"] == []
+    assert report["best_ms"] > 0
+
+
+def test_parse_importtime_output():
+    # given
+    output = """import time: self [us] | cumulative | imported package
+import time:       319 |        319 |   _typing
+import time:      4232 |      10598 | typing
+"""
+
+    # when
+    entries = ImportTimeBenchmark.parse(output)
+
+    # then
+    assert entries == [("_typing", 1, 319, 319), ("typing", 0, 4232, 10598)]
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,87 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/test_instrumentation_should.py
+
+This file defines tests for Instrumentation.
+
+Copyright (C) 2024-today rydnr's https://github.com/pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythoneda.sandbox.poc.cac import (
+    DefaultMethodBindingCriteria,
+    Instrumentation,
+    PythonedaSandboxPocCacSamplePy,
+)
+import time
+
+
+def test_collect_nothing_by_default():
+    # given
+    Instrumentation.reset()
+    sut = PythonedaSandboxPocCacSamplePy(DefaultMethodBindingCriteria())
+
+    # when
+    sut.methods
+
+    # then
+    assert Instrumentation.summary() == {"counters": {}, "timers": {}}
+
+
+def test_summarize_a_run():
+    # given
+    sut = PythonedaSandboxPocCacSamplePy(DefaultMethodBindingCriteria())
+
+    # when
+    with Instrumentation.run():
+        sut.methods
+        with Instrumentation.timed("custom"):
+            pass
+
+    # then
+    summary = Instrumentation.summary()
+    assert summary["counters"]["binding.is_satisfied_by"] >= 1
+    assert summary["timers"]["binding.is_satisfied_by"]["calls"] == 1
+    assert summary["timers"]["custom"]["calls"] == 1
+    assert not Instrumentation.enabled
+
+
+def test_not_count_nested_timings_twice():
+    # given
+    sleep = 0.05
+
+    # when
+    with Instrumentation.run():
+        with Instrumentation.timed("template.render"):
+            with Instrumentation.timed("template.render"):
+                with Instrumentation.timed("custom"):
+                    time.sleep(sleep)
+
+    # then
+    timers = Instrumentation.summary()["timers"]
+    render = timers["template.render"]
+    assert render["calls"] == 2
+    assert sleep <= render["total"] < 2 * sleep
+    assert render["self"] < sleep
+    assert timers["custom"]["self"] >= sleep
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
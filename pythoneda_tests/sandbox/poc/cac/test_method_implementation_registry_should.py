@@ -0,0 +1,175 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/test_method_implementation_registry_should.py
+
+This file defines tests for MethodImplementationRegistry.
+
+Copyright (C) 2024-today rydnr's https://github.com/pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythoneda.sandbox.poc.cac import (
+    DefaultMethodBindingCriteria,
+    EmptyBodyPythonMethod,
+    EmptyBodyPythonMethodBindingCriteria,
+    MethodBindingCriteria,
+    MethodImplementationRegistry,
+    MethodParameter,
+    PythonMethodDef,
+)
+from pythoneda.sandbox.poc.cac.add_int_int_int_python_method import (
+    AddIntIntIntPythonMethod,
+)
+from pythoneda.sandbox.poc.cac.add_int_int_int_python_method_def import (
+    AddIntIntIntPythonMethodDef,
+)
+
+
+class CountingCriteria(MethodBindingCriteria):
+    """
+    Criteria without index key, counting how many candidates it checks.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.checks = 0
+
+    def is_satisfied_by(self, methodDef, method) -> bool:
+        self.checks += 1
+        return method.method_def == methodDef
+
+
+class AttributeCriteria(MethodBindingCriteria):
+    """
+    Criteria matching a single attribute of the definitions, given at creation.
+    """
+
+    def __init__(self, attribute: str):
+        super().__init__()
+        self.attribute = attribute
+
+    def is_satisfied_by(self, methodDef, method) -> bool:
+        return self.definition_key(method.method_def) == self.definition_key(
+            methodDef
+        )
+
+    def definition_key(self, methodDef):
+        return getattr(methodDef, self.attribute)
+
+
+def registry() -> MethodImplementationRegistry:
+    result = MethodImplementationRegistry(
+        [
+            EmptyBodyPythonMethod(
+                PythonMethodDef(
+                    "sub",
+                    "int",
+                    "Subtracts two numbers.",
+                    [MethodParameter("x", "int", "The first number.")],
+                )
+            )
+            for _ in range(10)
+        ]
+    )
+    result.register(AddIntIntIntPythonMethod())
+    result.register(EmptyBodyPythonMethod(AddIntIntIntPythonMethodDef()))
+    return result
+
+
+def test_resolve_by_signature():
+    # given
+    sut = registry()
+
+    # when
+    method = sut.resolve(AddIntIntIntPythonMethodDef(), DefaultMethodBindingCriteria())
+
+    # then
+    assert isinstance(method, AddIntIntIntPythonMethod)
+
+
+def test_resolve_with_custom_index_keys():
+    # given
+    sut = registry()
+
+    # when
+    method = sut.resolve(
+        AddIntIntIntPythonMethodDef(), EmptyBodyPythonMethodBindingCriteria()
+    )
+
+    # then
+    assert isinstance(method, EmptyBodyPythonMethod)
+
+
+def test_scan_all_candidates_for_criteria_without_index_key():
+    # given
+    sut = registry()
+    criteria = CountingCriteria()
+
+    # when
+    method = sut.resolve(AddIntIntIntPythonMethodDef(), criteria)
+
+    # then
+    assert isinstance(method, AddIntIntIntPythonMethod)
+    assert criteria.checks == 11
+
+
+def test_keep_separate_indexes_for_differently_parameterized_criteria():
+    # given
+    sut = registry()
+    definition = PythonMethodDef("mul", "int", "Multiplies two numbers.", [])
+
+    # when
+    by_name = sut.resolve(definition, AttributeCriteria("name"))
+    by_return_type = sut.resolve(definition, AttributeCriteria("return_type"))
+
+    # then
+    assert by_name is None
+    assert by_return_type is sut.methods[0]
+
+
+def test_resolve_the_same_way_with_and_without_index():
+    # given
+    sut = MethodImplementationRegistry(
+        [
+            EmptyBodyPythonMethod(
+                PythonMethodDef(
+                    "add",
+                    "int",
+                    "Adds a number.",
+                    [MethodParameter("x", "int", "The number.")],
+                )
+            )
+        ]
+    )
+    definition = PythonMethodDef(
+        "add", "int", "Adds a number.", [MethodParameter("a", "int", "The number.")]
+    )
+
+    # when
+    indexed = sut.resolve(definition, DefaultMethodBindingCriteria())
+    scanned = sut.resolve(definition, CountingCriteria())
+
+    # then
+    assert scanned is sut.methods[0]
+    assert indexed is scanned
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,123 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/test_module_ast_index_should.py
+
+This file defines tests for ModuleAstIndex.
+
+Copyright (C) 2024-today rydnr's https://github.com/pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythoneda.sandbox.poc.cac import ModuleAstIndex, PythonImportFind
+
+SOURCE = '''from pythoneda.shared import BaseObject
+
+
+class Sample(BaseObject):
+    @property
+    def name(self) -> str:
+        from typing import Dict
+
+        return "name"
+
+    @name.setter
+    def name(self, value: str):
+        from typing import List
+
+        pass
+
+    async def fetch(self):
+        import os
+
+        def helper():
+            from json import dumps
+
+        return os.getcwd()
+'''
+
+
+def test_index_all_imports():
+    # given
+    sut = ModuleAstIndex(SOURCE)
+
+    # when
+    imports = [(i.package, i.asset) for i in sut.imports]
+
+    # then
+    assert imports == [
+        ("pythoneda.shared", "BaseObject"),
+        ("typing", "Dict"),
+        ("typing", "List"),
+        ("os", None),
+        ("json", "dumps"),
+    ]
+
+
+def test_index_method_imports():
+    # given
+    sut = ModuleAstIndex(SOURCE)
+
+    # when
+    name_imports = [i.asset for i in sut.imports_of_method("Sample", "name")]
+    fetch_imports = [i.package for i in sut.imports_of_method("Sample", "fetch")]
+
+    # then
+    assert name_imports == ["Dict", "List"]
+    assert fetch_imports == ["os"]
+
+
+def test_index_declarations():
+    # given
+    sut = ModuleAstIndex(SOURCE)
+
+    # when
+    getter = sut.entry("Sample.name", 5)
+    setter = sut.entry("Sample.name")
+    helper = sut.entry("Sample.fetch.<locals>.helper")
+
+    # then
+    assert [c.qualname for c in sut.classes] == ["Sample"]
+    assert getter.source.startswith("    @property\n    def name(self) -> str:")
+    assert setter.first_line == 11
+    assert [i[1] for i in helper.imports] == ["dumps"]
+
+
+def test_count_lines_as_ast_does():
+    # given
+    source = "class A:\n    x = '\x0c'\n\x0c\n    def g(self):\n        return 1\n"
+
+    # when
+    sut = ModuleAstIndex(source)
+
+    # then
+    assert sut.entry("A.g").source == "    def g(self):\n        return 1\n"
+    assert sut.entry("A").source == source
+
+
+def test_answer_python_import_find_queries():
+    # when
+    sut = PythonImportFind(SOURCE, "name")
+
+    # then
+    assert [i.asset for i in sut.imports] == ["Dict", "List"]
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
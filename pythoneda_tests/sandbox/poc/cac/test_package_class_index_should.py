@@ -0,0 +1,184 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/test_package_class_index_should.py
+
+This file defines tests for PackageClassIndex.
+
+Copyright (C) 2024-today rydnr's https://github.com/pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+from pythoneda.sandbox.poc.cac import PackageClassIndex
+import subprocess
+import sys
+
+
+def domain(folder) -> str:
+    package = folder / "sample_domain"
+    (package / "sub").mkdir(parents=True)
+    (package / "__init__.py").write_text("class Root:\n    pass\n")
+    (package / "things.py").write_text(
+        "import sys\n\n"
+        "class Thing:\n    class Inner:\n        pass\n\n"
+        "class Other(Thing):\n    pass\n"
+    )
+    (package / "sub" / "__init__.py").write_text("")
+    (package / "sub" / "more.py").write_text(
+        "raise ImportError('not importable')\n\nclass More:\n    pass\n"
+    )
+    return "sample_domain"
+
+
+def test_list_classes_without_importing(tmp_path, monkeypatch):
+    # given
+    monkeypatch.syspath_prepend(str(tmp_path))
+    package = domain(tmp_path)
+    sut = PackageClassIndex()
+
+    # when
+    classes = sut.classes_of(package)
+
+    # then
+    assert classes == {
+        ("sample_domain", "Root"),
+        ("sample_domain.things", "Thing"),
+        ("sample_domain.things", "Other"),
+        ("sample_domain.sub.more", "More"),
+    }
+    assert sut.parsed_files == 4
+
+
+def test_parse_only_changed_files(tmp_path, monkeypatch):
+    # given
+    monkeypatch.syspath_prepend(str(tmp_path / "src"))
+    package = domain(tmp_path / "src")
+    index_file = str(tmp_path / "index.json")
+    PackageClassIndex(index_file).classes_of(package)
+    things = tmp_path / "src" / "sample_domain" / "things.py"
+    things.write_text("class Renamed:\n    pass\n")
+    stat = os.stat(things)
+    os.utime(things, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    (tmp_path / "src" / "sample_domain" / "sub" / "more.py").unlink()
+
+    # when
+    sut = PackageClassIndex(index_file)
+    classes = sut.classes_of(package)
+
+    # then
+    assert sut.parsed_files == 1
+    assert classes == {
+        ("sample_domain", "Root"),
+        ("sample_domain.things", "Renamed"),
+    }
+
+
+def test_skip_parsing_an_unchanged_tree(tmp_path, monkeypatch):
+    # given
+    monkeypatch.syspath_prepend(str(tmp_path / "src"))
+    package = domain(tmp_path / "src")
+    index_file = str(tmp_path / "index.json")
+    expected = PackageClassIndex(index_file).classes_of(package)
+
+    # when
+    sut = PackageClassIndex(index_file)
+    classes = sut.classes_of(package)
+
+    # then
+    assert sut.parsed_files == 0
+    assert classes == expected
+
+
+def test_reuse_the_index_saved_by_another_process(tmp_path, monkeypatch):
+    # given
+    monkeypatch.syspath_prepend(str(tmp_path / "src"))
+    monkeypatch.setenv("POCCAC_CACHE_DIR", str(tmp_path / "cache"))
+    package = domain(tmp_path / "src")
+    script = (
+        "import asyncio\n"
+        "from pythoneda.sandbox.poc.cac.artifact_metadata import ArtifactMetadata\n"
+        "from pythoneda.sandbox.poc.cac.domain_artifact import DomainArtifact\n"
+        f"metadata = ArtifactMetadata.from_dict({{'package_name': {package!r}}})\n"
+        f"domain = DomainArtifact({package!r}, metadata)\n"
+        "print(len(asyncio.run(domain.find_classes())))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    # when
+    sut = PackageClassIndex(PackageClassIndex.default_index_file(package))
+    classes = sut.classes_of(package)
+
+    # then
+    assert output.strip() == "4"
+    assert sut.parsed_files == 0
+    assert len(classes) == 4
+
+
+def test_skip_shadowed_copies_of_a_package(tmp_path, monkeypatch):
+    # given
+    monkeypatch.syspath_prepend(str(tmp_path / "shadowed"))
+    monkeypatch.syspath_prepend(str(tmp_path / "src"))
+    package = domain(tmp_path / "src")
+    shadowed = tmp_path / "shadowed" / "sample_domain"
+    shadowed.mkdir(parents=True)
+    (shadowed / "__init__.py").write_text("")
+    (shadowed / "stale.py").write_text("class Stale:\n    pass\n")
+
+    # when
+    classes = PackageClassIndex().classes_of(package)
+
+    # then
+    assert ("sample_domain.stale", "Stale") not in classes
+    assert ("sample_domain.things", "Thing") in classes
+
+
+def test_list_classes_declared_conditionally(tmp_path):
+    # given
+    module = tmp_path / "conditional.py"
+    module.write_text(
+        "import sys\n\n"
+        "if sys.platform == 'win32':\n"
+        "    class Paths:\n        pass\n"
+        "else:\n"
+        "    class Paths:\n        pass\n\n"
+        "try:\n"
+        "    from fast import Parser\n"
+        "except ImportError:\n"
+        "    class Parser:\n        pass\n\n"
+        "def factory():\n"
+        "    class Local:\n        pass\n"
+    )
+
+    # when
+    classes = PackageClassIndex.classes_declared_in(str(module))
+
+    # then
+    assert classes == ["Paths", "Parser"]
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,112 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/test_parallel_artifact_extraction_should.py
+
+This file defines tests for ParallelArtifactExtraction.
+
+Copyright (C) 2024-today rydnr's https://github.com/pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythoneda.sandbox.poc.cac import (
+    ClassArtifact,
+    ClassArtifactDescription,
+    ParallelArtifactExtraction,
+)
+import importlib
+import pytest
+
+MODULES = {
+    "__init__.py": "",
+    "greeter.py": '''from pythoneda.shared import BaseObject
+
+
+class Greeter(BaseObject):
+    def __init__(self, name: str):
+        super().__init__()
+        self._name = name
+
+    def greet(self) -> str:
+        return f"Hello, {self._name}"
+''',
+    "welcomer.py": '''from .greeter import Greeter
+
+
+class Welcomer(Greeter):
+    def welcome(self) -> str:
+        return f"Welcome, {self._name}"
+''',
+    "broken.py": "import a_module_that_does_not_exist\n",
+}
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    folder = tmp_path / "extracted_domain"
+    folder.mkdir()
+    for name, source in MODULES.items():
+        (folder / name).write_text(source)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return "extracted_domain"
+
+
+def describe(descriptions):
+    return [
+        (d.module_name, d.name, d.parents, d.method_names, d.content)
+        for d in descriptions
+    ]
+
+
+def test_extract_the_same_as_a_sequential_extraction(package):
+    # given
+    sut = ParallelArtifactExtraction(maxWorkers=2)
+    expected = []
+    for module_name in ParallelArtifactExtraction.module_names_of(package):
+        if not module_name.endswith("broken"):
+            expected.extend(
+                ClassArtifactDescription.from_artifact(artifact)
+                for artifact in ClassArtifact.for_module(
+                    importlib.import_module(module_name)
+                )
+            )
+
+    # when
+    descriptions = sut.extract(package)
+
+    # then
+    assert describe(descriptions) == describe(expected)
+    assert [d.name for d in descriptions] == ["Greeter", "Welcomer"]
+
+
+def test_report_failing_modules_and_continue(package):
+    # given
+    sut = ParallelArtifactExtraction(maxWorkers=2, render=False)
+
+    # when
+    descriptions = sut.extract(package)
+
+    # then
+    assert list(sut.errors) == [f"{package}.broken"]
+    assert "a_module_that_does_not_exist" in sut.errors[f"{package}.broken"]
+    assert len(descriptions) == 2
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,107 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/test_persistent_ast_index_cache_should.py
+
+This file defines tests for PersistentAstIndexCache.
+
+Copyright (C) 2024-today rydnr's https://github.com/pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+from pythoneda.sandbox.poc.cac import (
+    ClassArtifact,
+    ModuleAstIndex,
+    PersistentAstIndexCache,
+    SourceCache,
+)
+import sys
+
+SOURCE = '''from pythoneda.shared import BaseObject
+
+
+class Sample(BaseObject):
+    def name(self) -> str:
+        from typing import Dict
+
+        return "name"
+'''
+
+
+def test_store_indexes_by_content_hash(tmp_path):
+    # given
+    sut = PersistentAstIndexCache(str(tmp_path))
+
+    # when
+    sut.index_for(SOURCE)
+
+    # then
+    assert sut.misses() == 1
+    assert os.path.exists(sut.path_of(PersistentAstIndexCache.key_of(SOURCE)))
+
+
+def test_restore_indexes_without_parsing(tmp_path):
+    # given
+    PersistentAstIndexCache(str(tmp_path)).index_for(SOURCE)
+    sut = PersistentAstIndexCache(str(tmp_path))
+
+    # when
+    index = sut.index_for(SOURCE)
+
+    # then
+    assert sut.hits() == 1
+    assert index.state == ModuleAstIndex(SOURCE).state
+    assert index.entry("Sample.name").node is None
+    assert [i.asset for i in index.imports_of_method("Sample", "name")] == ["Dict"]
+    assert index.node_of("Sample.name").name == "name"
+
+
+def test_ignore_changed_and_corrupt_sources(tmp_path):
+    # given
+    sut = PersistentAstIndexCache(str(tmp_path))
+    sut.index_for(SOURCE)
+    with open(sut.path_of(PersistentAstIndexCache.key_of(SOURCE)), "wb") as file:
+        file.write(b"corrupt")
+
+    # when
+    sut.index_for(SOURCE)
+    sut.index_for(SOURCE + "\n")
+
+    # then
+    assert sut.misses() == 3
+    assert sut.hits() == 0
+
+
+def test_extract_the_same_artifacts_from_cached_indexes(tmp_path):
+    # given
+    module = sys.modules[ClassArtifact.__module__]
+    PersistentAstIndexCache(str(tmp_path)).index_for(SourceCache().source_of(module))
+    cache = PersistentAstIndexCache(str(tmp_path))
+
+    # when
+    artifact = ClassArtifact.for_class(ClassArtifact, SourceCache(cache))
+
+    # then
+    assert cache.hits() == 1
+    assert artifact.content == ClassArtifact.for_class(ClassArtifact).content
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
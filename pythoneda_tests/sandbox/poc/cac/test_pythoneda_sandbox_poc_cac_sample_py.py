@@ -50,6 +50,44 @@ async def test_wip():
     assert expected == actual, f"Expected:\n{expected!r}\nActual:\n{actual!r}"
 
 
+def test_reuse_resolved_methods_until_criteria_change():
+    # given
+    sut = PythonedaSandboxPocCacSamplePy(DefaultMethodBindingCriteria())
+    first = sut.methods
+
+    # when
+    second = sut.methods
+    sut.method_binding_criteria = EmptyBodyPythonMethodBindingCriteria()
+    third = sut.methods
+
+    # then
+    assert first is second
+    assert third is not first
+    assert third[0].__class__.__name__ == "EmptyBodyPythonMethod"
+
+
+def test_resolve_again_when_method_defs_change():
+    # given
+    sut = PythonedaSandboxPocCacSamplePy(DefaultMethodBindingCriteria())
+    first = sut.methods
+
+    # when
+    sut.method_defs = sut.method_defs + sut.method_defs
+
+    # then
+    assert len(sut.methods) == 2
+    assert len(first) == 1
+
+
+def test_not_allow_changing_method_defs_in_place():
+    # given
+    sut = PythonedaSandboxPocCacSamplePy(DefaultMethodBindingCriteria())
+
+    # when / then
+    with pytest.raises(AttributeError):
+        sut.method_defs.append(sut.method_defs[0])
+
+
 def target_default() -> str:
     return '''
 # vim: set fileencoding=utf-8
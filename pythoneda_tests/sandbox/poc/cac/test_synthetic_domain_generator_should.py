@@ -0,0 +1,104 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/test_synthetic_domain_generator_should.py
+
+This file defines tests for SyntheticDomainGenerator.
+
+Copyright (C) 2024-today rydnr's https://github.com/pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import importlib
+import pytest
+from pythoneda.sandbox.poc.cac import (
+    ClassArtifact,
+    PackageClassIndex,
+    SyntheticDomainGenerator,
+)
+
+
+def generate(tmp_path, monkeypatch, packageName: str) -> SyntheticDomainGenerator:
+    result = SyntheticDomainGenerator(
+        packageName,
+        moduleCount=20,
+        classesPerModule=3,
+        methodsPerClass=4,
+        importFanOut=3,
+        propertiesPerClass=2,
+        classmethodsPerClass=2,
+    )
+    result.generate(str(tmp_path))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return result
+
+
+def test_find_all_generated_classes(tmp_path, monkeypatch):
+    # given
+    generator = generate(tmp_path, monkeypatch, "synthetic_domain_find")
+
+    # when
+    classes = PackageClassIndex().classes_of(generator.package_name)
+
+    # then
+    assert classes == set(generator.classes)
+    assert len(classes) == 60
+
+
+def test_build_artifacts_for_all_generated_classes(tmp_path, monkeypatch):
+    # given
+    generator = generate(tmp_path, monkeypatch, "synthetic_domain_build")
+    targets = [
+        getattr(importlib.import_module(module_name), class_name)
+        for module_name, class_name in generator.classes
+    ]
+
+    # when
+    artifacts = [ClassArtifact.for_class(target) for target in targets]
+
+    # then
+    assert all(artifact.constructor is not None for artifact in artifacts)
+    assert all(len(artifact.methods) == 8 for artifact in artifacts)
+    assert all(artifact.content for artifact in artifacts)
+
+
+@pytest.mark.asyncio
+async def test_rename_imports_across_the_domain(tmp_path, monkeypatch):
+    # given
+    generator = generate(tmp_path, monkeypatch, "synthetic_domain_rename")
+    old_package = f"{generator.package_name}.module0"
+    new_package = f"{generator.package_name}.renamed0"
+    artifacts = [
+        ClassArtifact.for_class(getattr(importlib.import_module(m), c))
+        for m, c in generator.classes
+    ]
+
+    # when
+    for artifact in artifacts:
+        await artifact.rename_imports(old_package, new_package)
+
+    # then
+    importing = [a for a in artifacts if a.module_name in generator.module_names[1:4]]
+    assert len(importing) == 9
+    assert all(f"from {new_package} import" in a.content for a in importing)
+    assert not any(f"from {old_package} import" in a.content for a in artifacts)
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,132 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/test_template_compiler_should.py
+
+This file defines tests for TemplateCompiler.
+
+Copyright (C) 2024-today rydnr's https://github.com/pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythoneda.sandbox.poc.cac import (
+    ClassArtifact,
+    TemplateCompiler,
+    TemplateRegistry,
+    TemplateWriter,
+)
+from pythoneda.sandbox.poc.cac.add_int_int_int_python_method_def import (
+    AddIntIntIntPythonMethodDef,
+)
+import pytest
+
+TEMPLATE = """
+group Sample;
+
+root(inst) ::= <<
+class <inst.name>:
+    <inst.methods:{ m | def <m>(self):
+    pass}; separator="\\n">
+<if(inst.empty)>
+    pass
+<endif>
+<inst.missing>
+done
+>>
+"""
+
+
+@pytest.fixture
+def template_mode():
+    previous = TemplateRegistry.compiled
+    yield TemplateRegistry.use_compiled_templates
+    TemplateRegistry.use_compiled_templates(previous)
+
+
+def test_render_the_same_text_as_stringtemplate(template_mode):
+    # given
+    template_mode(False)
+    expected = AddIntIntIntPythonMethodDef().content
+
+    # when
+    template_mode(True)
+    actual = AddIntIntIntPythonMethodDef().content
+
+    # then
+    assert actual == expected
+
+
+def test_render_the_same_class_artifact_as_stringtemplate(template_mode):
+    # given
+    template_mode(False)
+    expected = ClassArtifact.for_class(ClassArtifact).content
+
+    # when
+    template_mode(True)
+    actual = ClassArtifact.for_class(ClassArtifact).content
+
+    # then
+    assert actual == expected
+
+
+def test_indent_multiline_values_as_stringtemplate_does():
+    # given
+    group = TemplateCompiler.compile("Sample", TEMPLATE)
+
+    # when
+    text = group.render(
+        inst={"name": "Foo", "methods": ["a", "b"], "empty": False, "missing": None}
+    )
+
+    # then
+    assert text == (
+        "class Foo:\n"
+        "    def a(self):\n"
+        "        pass\n"
+        "    def b(self):\n"
+        "        pass\n"
+        "\n"
+        "done"
+    )
+
+
+def test_write_indentation_lazily():
+    # given
+    writer = TemplateWriter()
+
+    # when
+    writer.push("    ")
+    writer.write("a\n\nb")
+    writer.pop()
+
+    # then
+    assert str(writer) == "    a\n\n    b"
+
+
+def test_reject_unsupported_constructs():
+    # given
+    template = "group G;\nroot(a) ::= <<\n<if(a)>x<elseif(a)>y<endif>\n>>\n"
+
+    # when / then
+    with pytest.raises(ValueError):
+        TemplateCompiler.compile("G", template)
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,68 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/test_template_group_cache_should.py
+
+This file defines tests for TemplateGroupCache.
+
+Copyright (C) 2024-today rydnr's https://github.com/pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythoneda.sandbox.poc.cac import TemplateGroupCache
+
+TEMPLATE = """
+group Test;
+
+root(inst) ::= <<
+Hello, <inst>!
+>>
+"""
+
+
+def test_parse_the_same_template_only_once():
+    # given
+    TemplateGroupCache.clear()
+
+    # when
+    first = TemplateGroupCache.group_for("Test", TEMPLATE)
+    second = TemplateGroupCache.group_for("Test", TEMPLATE)
+
+    # then
+    assert first is second
+    assert TemplateGroupCache.size() == 1
+
+
+def test_render_attributes_with_a_shared_group():
+    # given
+    group = TemplateGroupCache.group_for("Test", TEMPLATE)
+
+    # when
+    first = group.getInstanceOf("root")
+    first["inst"] = "first"
+    second = group.getInstanceOf("root")
+    second["inst"] = "second"
+
+    # then
+    assert str(first) == "Hello, first!"
+    assert str(second) == "Hello, second!"
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
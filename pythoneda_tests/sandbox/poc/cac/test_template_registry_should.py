@@ -0,0 +1,96 @@
+# vim: set fileencoding=utf-8
+"""
+pythoneda/sandbox/poc/cac/test_template_registry_should.py
+
+This file defines tests for TemplateRegistry.
+
+Copyright (C) 2024-today rydnr's https://github.com/pythoneda-sandbox/poccac
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythoneda.sandbox.poc.cac import TemplateGroupCache, TemplateRegistry
+from pythoneda.sandbox.poc.cac.add_int_int_int_python_method_def import (
+    AddIntIntIntPythonMethodDef,
+)
+
+TEMPLATE = """
+group Greeting;
+
+root(inst) ::= <<
+<editor_preamble()>
+Hello, <parents(parents=inst)>!
+>>
+"""
+
+
+def test_reuse_loaded_groups():
+    # given
+    TemplateRegistry.clear()
+
+    # when
+    AddIntIntIntPythonMethodDef().content
+    misses = TemplateRegistry.misses()
+    AddIntIntIntPythonMethodDef().content
+    AddIntIntIntPythonMethodDef().content
+
+    # then
+    assert TemplateRegistry.misses() == misses
+    assert TemplateRegistry.hits() >= 2
+
+
+def test_share_common_sub_templates():
+    # given
+    root = TemplateRegistry.instance_of("Greeting", TEMPLATE)
+
+    # when
+    root["inst"] = ["first", "second"]
+
+    # then
+    assert str(root) == "# vim: set fileencoding=utf-8\nHello, first, second!"
+
+
+def test_count_each_lookup_once():
+    # given
+    TemplateRegistry.clear()
+
+    # when
+    TemplateRegistry.group("Greeting", TEMPLATE)
+    TemplateRegistry.group("Greeting", TEMPLATE)
+
+    # then
+    assert TemplateRegistry.misses() == 1
+    assert TemplateRegistry.hits() == 1
+
+
+def test_forget_the_groups_parsed_by_the_cache():
+    # given
+    TemplateRegistry.group("Greeting", TEMPLATE)
+
+    # when
+    TemplateRegistry.clear()
+
+    # then
+    assert TemplateGroupCache.size() == 0
+    TemplateRegistry.group("Greeting", TEMPLATE)
+    assert TemplateRegistry.misses() == 1
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End: